@@ -1,4 +1,4 @@
-from siteswaps_generator import generate_siteswaps
+from siteswaps.siteswaps_generator import generate_siteswaps
 
 if __name__ == "__main__":
     print(generate_siteswaps(6, 7, [8, None, 10, None, 9, None]))
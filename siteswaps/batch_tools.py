@@ -0,0 +1,97 @@
+from typing import NamedTuple
+
+import numpy as np
+
+
+class BatchAnalysis(NamedTuple):
+    """Per-pattern results of `analyze_patterns_batch`, one entry per row of the input."""
+
+    valid: np.ndarray
+    num_balls: np.ndarray
+    excited: np.ndarray
+
+
+def _as_pattern_array(patterns) -> np.ndarray:
+    patterns = np.asarray(patterns)
+    if patterns.ndim != 2:
+        raise ValueError("Patterns must be a 2D array with one pattern of the same period per row.")
+    if patterns.shape[1] == 0:
+        raise ValueError("Patterns must have a positive period.")
+    return patterns
+
+
+def calculate_num_balls_batch(patterns) -> np.ndarray:
+    """
+    Calculate the number of balls of every pattern in a batch, like `tools.calculate_num_balls`.
+
+    Args:
+        patterns (np.ndarray): A 2D array of throws (e.g. uint8), one pattern per row.
+
+    Returns:
+        np.ndarray: The number of balls of every pattern, rounded down.
+    """
+    patterns = _as_pattern_array(patterns)
+    return patterns.sum(axis=1, dtype=np.int64) // patterns.shape[1]
+
+
+def is_valid_batch(patterns, num_of_object: int | None = None) -> np.ndarray:
+    """
+    Check every pattern in a batch for collisions and a whole ball count, like `tools.is_valid`.
+
+    Landing positions `(throw + index) % period` are computed for the whole batch at once, and a
+    pattern is collision free when each of its landing positions is hit exactly once, which is
+    counted with a single `np.bincount` over row-offset positions.
+
+    Args:
+        patterns (np.ndarray): A 2D array of throws (e.g. uint8), one pattern per row.
+        num_of_object (int | None): If given, patterns with another ball count are invalid.
+
+    Returns:
+        np.ndarray: A boolean array, `True` for the valid patterns.
+    """
+    patterns = _as_pattern_array(patterns)
+    num_patterns, period = patterns.shape
+    sums = patterns.sum(axis=1, dtype=np.int64)
+    valid = sums % period == 0
+    if num_of_object:
+        valid &= sums == num_of_object * period
+
+    landing = (patterns.astype(np.int64) + np.arange(period)) % period
+    landing += np.arange(num_patterns)[:, None] * period
+    hits = np.bincount(landing.ravel(), minlength=num_patterns * period)
+    valid &= (hits.reshape(num_patterns, period) == 1).all(axis=1)
+    return valid
+
+
+def is_excited_pattern_batch(patterns) -> np.ndarray:
+    """
+    Check which patterns in a batch are excited, like `tools.is_excited_pattern`.
+
+    Args:
+        patterns (np.ndarray): A 2D array of throws (e.g. uint8), one pattern per row.
+
+    Returns:
+        np.ndarray: A boolean array, `True` for the excited patterns.
+    """
+    patterns = _as_pattern_array(patterns)
+    num_balls = calculate_num_balls_batch(patterns)
+    landing = patterns.astype(np.int64) + np.arange(patterns.shape[1])
+    return (landing < num_balls[:, None]).any(axis=1)
+
+
+def analyze_patterns_batch(patterns) -> BatchAnalysis:
+    """
+    Compute validity, ball count and excitedness of every pattern in a batch.
+
+    Args:
+        patterns (np.ndarray): A 2D array of throws (e.g. uint8), one pattern per row.
+
+    Returns:
+        BatchAnalysis: Boolean `valid` and `excited` arrays and an int `num_balls` array.
+    """
+    patterns = _as_pattern_array(patterns)
+    return BatchAnalysis(
+        valid=is_valid_batch(patterns),
+        num_balls=calculate_num_balls_batch(patterns),
+        excited=is_excited_pattern_batch(patterns),
+    )
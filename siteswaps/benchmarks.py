@@ -0,0 +1,257 @@
+import argparse
+import gc
+import hashlib
+import json
+import sys
+import time
+import tracemalloc
+from functools import partial
+from itertools import product
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from .calc_valid_siteswaps import count_siteswaps, count_valid_siteswaps
+from .pattern_analysis import analyze_patterns
+from .siteswap_ranking import top_siteswaps
+from .siteswaps_generator import generate_siteswaps
+from .tools import decompose_siteswap, find_transition, is_prime_siteswap
+from .transition_matrix import TransitionMatrix
+
+DEFAULT_BASELINE = Path(__file__).with_name("benchmark_baseline.json")
+# Slowdowns smaller than this are timer noise rather than regressions
+MIN_REGRESSION_SECONDS = 0.005
+
+# Ground state 7 club patterns used by the state-based benchmarks
+PASSING_PATTERNS = [
+    [9, 9, 9, 4, 4],
+    [10, 7, 9, 4, 5],
+    [9, 6, 8, 8, 4],
+    [10, 10, 5, 5, 5],
+    [8, 8, 5, 7, 7],
+    [8, 6, 8, 6, 7],
+]
+
+
+def generator_cases() -> List[Tuple[str, Callable[[], Any]]]:
+    """The grid of `generate_siteswaps` queries."""
+    cases = []
+    for period, num_objects, max_throw, (exclude, include) in product(
+        (5, 6, 7),
+        (5, 7),
+        (10, 12),
+        (([1, 3], None), ([], None), ([1, 3], [4])),
+    ):
+        name = (
+            f"generate_siteswaps/p{period}-o{num_objects}-max{max_throw}"
+            f"-ex{''.join(map(str, exclude)) or 'none'}"
+            f"-in{''.join(map(str, include or [])) or 'none'}"
+        )
+        cases.append(
+            (
+                name,
+                partial(
+                    generate_siteswaps,
+                    period,
+                    num_objects,
+                    [None] * period,
+                    2,
+                    max_throw,
+                    exclude,
+                    include,
+                ),
+            )
+        )
+    cases.append(
+        (
+            "generate_siteswaps/partial-pattern",
+            lambda: generate_siteswaps(6, 7, [8, None, 10, None, 9, None]),
+        )
+    )
+    return cases
+
+
+def analysis_cases() -> List[Tuple[str, Callable[[], Any]]]:
+    """Transitions, decomposition, primality and counting on representative inputs."""
+    return [
+        (
+            "find_transition/passing-pairs",
+            lambda: [
+                find_transition(pattern_a, pattern_b)
+                for pattern_a in PASSING_PATTERNS
+                for pattern_b in PASSING_PATTERNS * 10
+            ],
+        ),
+        (
+            "transition_matrix/passing",
+            lambda: TransitionMatrix(PASSING_PATTERNS * 10).transitions,
+        ),
+        (
+            "decompose_siteswap/passing",
+            lambda: [decompose_siteswap(pattern) for pattern in PASSING_PATTERNS * 20],
+        ),
+        (
+            "decompose_siteswap/composite",
+            lambda: [
+                decompose_siteswap([9, 9, 9, 4, 4, 8, 6, 9, 7, 5, 7, 7] * 10) for _ in range(20)
+            ],
+        ),
+        (
+            "analyze_patterns/passing",
+            lambda: list(analyze_patterns(PASSING_PATTERNS * 20)),
+        ),
+        (
+            "is_prime_siteswap/passing",
+            lambda: [is_prime_siteswap(pattern) for pattern in PASSING_PATTERNS * 50],
+        ),
+        (
+            "top_siteswaps/p12-o7",
+            lambda: top_siteswaps(20, 12, 7, [None] * 12, 2, 12, None),
+        ),
+        ("count_valid_siteswaps/p6", lambda: count_valid_siteswaps(6)),
+        ("count_valid_siteswaps/p8", lambda: count_valid_siteswaps(8)),
+        ("count_siteswaps/p8-o7", lambda: count_siteswaps(8, 7)),
+    ]
+
+
+def digest(result: Any) -> str:
+    """A short fingerprint of a benchmark result, to catch engines returning different results."""
+    return hashlib.sha256(json.dumps(result).encode()).hexdigest()[:16]
+
+
+def result_count(result: Any) -> int:
+    return len(result) if isinstance(result, list) else int(result)
+
+
+def run_case(function: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    Time a benchmark case, then run it once more under `tracemalloc` for its peak memory.
+
+    Args:
+        function: The benchmark case.
+        repeat: Number of timed runs; the fastest one is kept.
+
+    Returns:
+        The wall time in seconds, the peak traced memory in bytes, the result count and digest.
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    function()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": min(timings),
+        "peak_bytes": peak_bytes,
+        "count": result_count(result),
+        "digest": digest(result),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> List[str]:
+    """
+    Compare benchmark results with a baseline.
+
+    Args:
+        results: The results of this run.
+        baseline: The stored results.
+        threshold: A case regresses when it takes more than `threshold` times its baseline time.
+
+    Returns:
+        A description of every regression, changed result and case missing from the baseline.
+    """
+    problems = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            problems.append(f"{name}: missing from the baseline")
+            continue
+        if (result["count"], result["digest"]) != (expected["count"], expected["digest"]):
+            problems.append(
+                f"{name}: results changed ({expected['count']} -> {result['count']})"
+            )
+        if (
+            result["seconds"] > expected["seconds"] * threshold
+            and result["seconds"] - expected["seconds"] > MIN_REGRESSION_SECONDS
+        ):
+            problems.append(
+                f"{name}: {result['seconds']:.4f}s vs {expected['seconds']:.4f}s baseline"
+            )
+    return problems
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the generator, transitions, decomposition and counting."
+    )
+    parser.add_argument(
+        "--filter",
+        default="",
+        help="Only run the cases whose name contains this string.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Number of timed runs per case."
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Write the results to this JSON file."
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help="Baseline JSON file to compare with.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Allowed slowdown ratio before a case counts as a regression.",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store the results as the new baseline instead of comparing.",
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    results = {}
+    for name, function in generator_cases() + analysis_cases():
+        if args.filter not in name:
+            continue
+        results[name] = run_case(function, args.repeat)
+        result = results[name]
+        print(
+            f"{name:60} {result['seconds']:9.4f}s {result['peak_bytes'] / 1e6:9.2f}MB"
+            f" {result['count']:>10}"
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        return 0
+    if not args.baseline.exists():
+        return 0
+
+    problems = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,21 @@
+import os
+from pathlib import Path
+
+CACHE_DIR_ENV = "SITESWAPS_CACHE_DIR"
+
+
+def get_cache_dir() -> Path:
+    """
+    Return the directory precomputed data is cached in, creating it if needed.
+
+    The directory is taken from the `SITESWAPS_CACHE_DIR` environment variable, and defaults to
+    `~/.cache/siteswaps`.
+
+    Returns:
+        Path: The cache directory.
+    """
+    cache_dir = Path(
+        os.environ.get(CACHE_DIR_ENV) or Path.home() / ".cache" / "siteswaps"
+    )
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
@@ -0,0 +1,661 @@
+import argparse
+from itertools import combinations
+from math import gcd
+from typing import List, Optional, Set, Union
+
+from .siteswaps_generator import (
+    SymmetryGroup,
+    _matching_shifts,
+    _reduces_symmetry,
+    validate_siteswap_arguments,
+    validate_symmetry,
+)
+from .tools import canonical_rotation
+
+# A slot constraint that allows any of the allowed throws
+ANY_THROW = -1
+
+
+def count_valid_siteswaps(period):
+    """
+    Count the number of valid siteswaps for a given period.
+
+    Every sequence of throws 0-9 is counted, so rotations are counted separately.
+    """
+    return count_siteswap_sequences(period, min_throw=0, max_throw=9)
+
+
+def count_siteswap_sequences(
+    period: int,
+    num_balls: Optional[int] = None,
+    min_throw: int = 0,
+    max_throw: int = 9,
+    exclude_throws: Optional[List[int]] = None,
+) -> int:
+    """
+    Count the valid siteswap sequences of a period without enumerating them.
+
+    Rotations of a pattern are counted as different sequences.
+
+    Args:
+        period: The period of the sequences.
+        num_balls: If given, only sequences with this number of balls are counted.
+        min_throw: Minimum value for a throw.
+        max_throw: Maximum value for a throw.
+        exclude_throws: A list of throws that may not appear.
+
+    Returns:
+        The number of valid sequences.
+    """
+    throws = _allowed_throws(min_throw, max_throw, exclude_throws)
+    counts = count_sequences_by_balls(
+        [throws] * period, max_throw if num_balls is None else num_balls
+    )
+    return sum(counts) if num_balls is None else counts[num_balls]
+
+
+def count_sequences_by_balls(slot_throws: List[List[int]], max_balls: int) -> List[int]:
+    """
+    Count the valid siteswap sequences whose throw at each slot comes from that slot's allowed set.
+
+    A valid sequence is a permutation of the landing slots `(index + throw) % period`, so the count
+    is the permanent of the matrix whose entry `(i, j)` counts the allowed throws of slot `i`
+    landing on slot `j`. Each throw also contributes `(i + throw) // period` to the ball count, so
+    the entries are polynomials in the ball count. Slots with a single allowed throw are taken out
+    first, and the rest of the permanent is evaluated with Ryser's formula over a Gray code of the
+    column subsets, in O(2^n * n * max_balls^2) for `n` slots with more than one allowed throw.
+
+    Args:
+        slot_throws: The allowed throws of every slot.
+        max_balls: Ball counts above this are not tracked.
+
+    Returns:
+        The number of sequences with each ball count from 0 to `max_balls`.
+    """
+    period = len(slot_throws)
+    num_coefficients = max_balls + 1
+    # A slot with a single allowed throw takes its landing slot for itself, so its row and column
+    # drop out of the permanent and only shift the ball count.
+    forced_balls = 0
+    forced_count = 1
+    taken = set()
+    open_slots = []
+    for i, throws in enumerate(slot_throws):
+        if len(set(throws)) != 1:
+            open_slots.append(i)
+            continue
+        landing, balls = divmod(i + throws[0], period)[::-1]
+        if landing in taken:
+            return [0] * num_coefficients
+        taken.add(landing)
+        forced_balls += balls
+        forced_count *= len(throws)
+    if forced_balls >= num_coefficients:
+        return [0] * num_coefficients
+
+    size = len(open_slots)
+    free_columns = {
+        landing: column
+        for column, landing in enumerate(
+            landing for landing in range(period) if landing not in taken
+        )
+    }
+    columns: List[List[tuple[int, List[int]]]] = [[] for _ in range(size)]
+    for row, i in enumerate(open_slots):
+        entries: dict[int, List[int]] = {}
+        for throw in slot_throws[i]:
+            landing, balls = divmod(i + throw, period)[::-1]
+            if landing in free_columns and balls < num_coefficients:
+                entries.setdefault(free_columns[landing], [0] * num_coefficients)[balls] += 1
+        for column, entry in entries.items():
+            columns[column].append((row, entry))
+
+    row_sums = [[0] * num_coefficients for _ in range(size)]
+    total = [1] + [0] * max_balls if size == 0 else [0] * num_coefficients
+    in_subset = [False] * size
+    subset_size = 0
+    for step in range(1, 1 << size):
+        column = (step & -step).bit_length() - 1
+        in_subset[column] = not in_subset[column]
+        sign = 1 if in_subset[column] else -1
+        subset_size += sign
+        for row, entry in columns[column]:
+            row_sum = row_sums[row]
+            for balls, count in enumerate(entry):
+                row_sum[balls] += sign * count
+
+        product = [1] + [0] * max_balls
+        for row_sum in row_sums:
+            product = [
+                sum(product[k] * row_sum[balls - k] for k in range(balls + 1))
+                for balls in range(num_coefficients)
+            ]
+            if not any(product):
+                break
+        if (size - subset_size) % 2:
+            total = [a - b for a, b in zip(total, product)]
+        else:
+            total = [a + b for a, b in zip(total, product)]
+    return [0] * forced_balls + [
+        forced_count * count for count in total[: num_coefficients - forced_balls]
+    ]
+
+
+def count_siteswaps(
+    period_length: int,
+    num_of_objects: int,
+    partial_pattern: Optional[List[Union[int, None]]] = None,
+    min_throw: int = 2,
+    max_throw: int = 14,
+    exclude_throws: Optional[List[int]] = [1, 3],
+    include_throws: Optional[List[int]] = None,
+    symmetry: Optional[SymmetryGroup] = None,
+) -> int:
+    """
+    Count the patterns `generate_siteswaps` returns for the same arguments.
+
+    Without a partial pattern, rotation classes are counted with Burnside's lemma: a sequence fixed
+    by a rotation of `period_length / g` slots is a valid sequence of period `g` repeated. Required
+    throws are handled by inclusion-exclusion over the throws that are left out. With a partial
+    pattern whose prefilled slots make every rotation of a completion a non-completion, the
+    completions are counted directly. A partial pattern that matches one of its own rotations can
+    have several completions in a rotation class, so the classes with at least one are counted
+    with Burnside's lemma and inclusion-exclusion over the alignments of the pattern (see
+    `_count_matching_completions`).
+
+    With a symmetry group the classes are counted with Burnside's lemma over all of its elements:
+    a sequence is fixed by a rotation as above, and by a time reversal followed by a rotation when
+    its throws pair up into throws of the same height (see `count_reversal_fixed_sequences`).
+
+    Args:
+        period_length: Total length of the pattern.
+        num_of_objects: Number of objects in the pattern.
+        partial_pattern: A list representing the partial pattern (e.g., [None, None, 4, None, 6, None]).
+        min_throw: Minimum value for a throw.
+        max_throw: Maximum value for a throw.
+        exclude_throws: A list of throws to exclude from the patterns.
+        include_throws: A list of throws that must appear at least once in every pattern.
+        symmetry: Count a single pattern of every class of patterns that are the same under
+            these symmetries, as `generate_siteswaps` returns them.
+
+    Returns:
+        The number of patterns.
+    """
+    if partial_pattern is None:
+        partial_pattern = [None] * period_length
+    validate_siteswap_arguments(
+        period_length,
+        num_of_objects,
+        partial_pattern,
+        min_throw,
+        max_throw,
+        exclude_throws,
+        include_throws,
+    )
+    reduces_symmetry = _reduces_symmetry(symmetry)
+    if reduces_symmetry:
+        validate_symmetry(symmetry, partial_pattern)
+    pattern = [None if throw in (None, "_") else throw for throw in partial_pattern]
+    throws = _allowed_throws(min_throw, max_throw, exclude_throws)
+    required = sorted(set(include_throws or []))
+    if any(throw is not None for throw in pattern) and _matching_shifts(pattern):
+        count = _count_matching_completions(pattern, num_of_objects, throws, required)
+    else:
+        count = 0
+        for size in range(len(required) + 1):
+            for left_out in combinations(required, size):
+                allowed = [throw for throw in throws if throw not in left_out]
+                if reduces_symmetry:
+                    classes = _count_symmetry_classes(
+                        period_length, num_of_objects, allowed, symmetry
+                    )
+                else:
+                    classes = _count_completions(pattern, num_of_objects, allowed)
+                count += (-1) ** size * classes
+
+    # generate_siteswaps leaves out the pattern that throws the same throw on every beat
+    open_slots = any(throw is None for throw in pattern)
+    if (
+        all(throw in (None, num_of_objects) for throw in pattern)
+        and (num_of_objects in throws or not open_slots)
+        and set(required) <= ({num_of_objects} if open_slots else set())
+    ):
+        count -= 1
+    return count
+
+
+def _count_matching_completions(
+    pattern: List[Union[int, None]], num_of_objects: int, throws: List[int], required: List[int]
+) -> int:
+    """
+    Count the rotation classes that have a completion of a partial pattern among their rotations.
+
+    This is the count for partial patterns that match some of their own rotations, where a class
+    can hold several completions. A sequence fixed by a rotation of `d` slots is a sequence of
+    period `gcd(d, period)` repeated, and Burnside's lemma sums these over all rotations (see
+    `_count_aligned_sequences`).
+
+    Args:
+        pattern: The partial pattern, with None for the open slots.
+        num_of_objects: Number of objects in the pattern.
+        throws: The throws allowed in the open slots.
+        required: Throws that must appear at least once in the open slots.
+
+    Returns:
+        The number of rotation classes.
+    """
+    period = len(pattern)
+    block_counts: dict[int, int] = {}
+    fixed_sequences = 0
+    for shift in range(period):
+        block = gcd(shift, period)
+        if block not in block_counts:
+            block_counts[block] = _count_aligned_sequences(
+                pattern, block, num_of_objects, throws, required
+            )
+        fixed_sequences += block_counts[block]
+    return fixed_sequences // period
+
+
+def _count_aligned_sequences(
+    pattern: List[Union[int, None]],
+    block: int,
+    num_of_objects: int,
+    throws: List[int],
+    required: List[int],
+) -> int:
+    """
+    Count the sequences of period `block` that repeat into a rotation of a completion of a pattern.
+
+    Repeated, the sequence `y` completes the pattern rotated by `s` when every slot `j` of `y` meets
+    the prefilled slots `i` of the pattern with `i + s = j (mod block)`. The union over the
+    alignments `s` is counted by inclusion-exclusion over the sets of alignments, leaving out sets
+    whose prefilled throws clash and the supersets of sets with no sequences. The count of a set
+    only depends on its slot constraints up to rotation, so it is computed once per rotation.
+
+    Args:
+        pattern: The partial pattern, with None for the open slots.
+        block: The period of the counted sequences, a divisor of the pattern's period.
+        num_of_objects: Number of objects in the pattern.
+        throws: The throws allowed in the open slots.
+        required: Throws that must appear at least once in the open slots.
+
+    Returns:
+        The number of sequences.
+    """
+    period = len(pattern)
+    allowed = set(throws)
+    # The constraint of every slot of the period `block` sequence: a throw, or ANY_THROW for one of
+    # the allowed throws.
+    folded = []
+    for start in range(block):
+        slots = pattern[start::block]
+        prefilled = {throw for throw in slots if throw is not None}
+        if len(prefilled) > 1:
+            return 0
+        if not prefilled:
+            folded.append(ANY_THROW)
+            continue
+        throw = prefilled.pop()
+        if None in slots and throw not in allowed:
+            return 0
+        folded.append(throw)
+
+    # A required throw that is prefilled `m` times must appear more than `m` times in the
+    # completion, whatever its alignment.
+    least_occurrences = {
+        throw: -(-(pattern.count(throw) + 1) * block // period) for throw in required
+    }
+    set_counts: dict[tuple[int, ...], int] = {}
+    count = 0
+
+    def add_alignments(constraints: Optional[List[int]], first: int, sign: int) -> None:
+        nonlocal count
+        for shift in range(first, block):
+            merged = _align_constraints(constraints, folded, shift, allowed)
+            if merged is None:
+                continue
+            key = tuple(canonical_rotation(merged))
+            if key not in set_counts:
+                set_counts[key] = _count_constrained_sequences(
+                    merged, num_of_objects, throws, least_occurrences
+                )
+            if set_counts[key]:
+                count += sign * set_counts[key]
+                add_alignments(merged, shift + 1, -sign)
+
+    add_alignments(None, 0, 1)
+    return count
+
+
+def _align_constraints(
+    constraints: Optional[List[int]], folded: List[int], shift: int, allowed: Set[int]
+) -> Optional[List[int]]:
+    """
+    Add the constraints of a folded pattern rotated by `shift` slots to the slot constraints.
+
+    Args:
+        constraints: The constraints so far, or None before the first alignment.
+        folded: The constraint of every slot, a throw or ANY_THROW.
+        shift: The alignment of the folded pattern.
+        allowed: The throws allowed in the open slots.
+
+    Returns:
+        The merged constraints, or None if they clash.
+    """
+    block = len(folded)
+    aligned = [folded[(slot - shift) % block] for slot in range(block)]
+    if constraints is None:
+        return aligned
+    merged = []
+    for current, added in zip(constraints, aligned):
+        if current == ANY_THROW:
+            current, added = added, current
+        if added == ANY_THROW:
+            if current != ANY_THROW and current not in allowed:
+                return None
+        elif current != added:
+            return None
+        merged.append(current)
+    return merged
+
+
+def _count_constrained_sequences(
+    constraints: List[int],
+    num_of_objects: int,
+    throws: List[int],
+    least_occurrences: dict[int, int],
+) -> int:
+    """
+    Count the valid sequences that meet slot constraints and contain enough of some throws.
+
+    A throw that must appear once is handled by inclusion-exclusion over the throws left out, and
+    one that must appear more often by subtracting the sequences with fewer occurrences.
+
+    Args:
+        constraints: The constraint of every slot, a throw or ANY_THROW for one of `throws`.
+        num_of_objects: Number of objects in the sequences.
+        throws: The throws allowed in the unconstrained slots.
+        least_occurrences: The least number of times each of these throws must appear.
+
+    Returns:
+        The number of sequences.
+    """
+    once = [throw for throw, least in least_occurrences.items() if least == 1]
+    repeated = {throw: least for throw, least in least_occurrences.items() if least > 1}
+    count = 0
+    for size in range(len(once) + 1):
+        for left_out in combinations(once, size):
+            if any(constraint in left_out for constraint in constraints):
+                continue
+            allowed = [throw for throw in throws if throw not in left_out]
+            slot_throws = [
+                allowed if constraint == ANY_THROW else [constraint] for constraint in constraints
+            ]
+            count += (-1) ** size * _count_with_occurrences(
+                slot_throws, num_of_objects, list(repeated.items())
+            )
+    return count
+
+
+def _count_with_occurrences(
+    slot_throws: List[List[int]], num_of_objects: int, least_occurrences: List[tuple[int, int]]
+) -> int:
+    """
+    Count the valid sequences over the allowed slot throws with enough occurrences of some throws.
+
+    The sequences with too few occurrences of a throw are subtracted by the slots that hold it.
+
+    Args:
+        slot_throws: The allowed throws of every slot.
+        num_of_objects: Number of objects in the sequences.
+        least_occurrences: Pairs of a throw and the least number of times it must appear.
+
+    Returns:
+        The number of sequences.
+    """
+    if not least_occurrences:
+        return count_sequences_by_balls(slot_throws, num_of_objects)[num_of_objects]
+    (counted, least), rest = least_occurrences[0], least_occurrences[1:]
+    count = _count_with_occurrences(slot_throws, num_of_objects, rest)
+    fixed = {slot for slot, throws in enumerate(slot_throws) if throws == [counted]}
+    optional = [
+        slot
+        for slot, throws in enumerate(slot_throws)
+        if counted in throws and slot not in fixed
+    ]
+    for extra in range(least - len(fixed)):
+        for chosen in combinations(optional, extra):
+            holding = fixed.union(chosen)
+            exact = [
+                [counted] if slot in holding else [throw for throw in throws if throw != counted]
+                for slot, throws in enumerate(slot_throws)
+            ]
+            count -= _count_with_occurrences(exact, num_of_objects, rest)
+    return count
+
+
+def _count_completions(
+    pattern: List[Union[int, None]], num_of_objects: int, throws: List[int]
+) -> int:
+    """
+    Count the rotation classes of valid completions of a partial pattern.
+
+    Args:
+        pattern: The partial pattern, with None for the open slots; either fully open or without
+            a rotation that matches it.
+        num_of_objects: Number of objects in the pattern.
+        throws: The throws allowed in the open slots.
+
+    Returns:
+        The number of completions, counting rotations once.
+    """
+    period = len(pattern)
+    if any(throw is not None for throw in pattern):
+        slot_throws = [throws if throw is None else [throw] for throw in pattern]
+        return count_sequences_by_balls(slot_throws, num_of_objects)[num_of_objects]
+
+    fixed_sequences = 0
+    for shift in range(period):
+        block = gcd(shift, period)
+        fixed_sequences += count_sequences_by_balls([throws] * block, num_of_objects)[
+            num_of_objects
+        ]
+    return fixed_sequences // period
+
+
+def _count_symmetry_classes(
+    period: int, num_of_objects: int, throws: List[int], symmetry: SymmetryGroup
+) -> int:
+    """
+    Count the classes of valid sequences under a symmetry group with Burnside's lemma.
+
+    Args:
+        period: The period of the sequences.
+        num_of_objects: Number of objects in the sequences.
+        throws: The throws allowed in every slot.
+        symmetry: The symmetry group.
+
+    Returns:
+        The number of classes.
+    """
+    step = 1 if symmetry.juggler_relabeling else gcd(symmetry.num_jugglers, period)
+    fixed_sequences = 0
+    for shift in range(0, period, step):
+        block = gcd(shift, period)
+        fixed_sequences += count_sequences_by_balls([throws] * block, num_of_objects)[
+            num_of_objects
+        ]
+        if symmetry.reversal:
+            fixed_sequences += count_reversal_fixed_sequences(
+                period, shift, throws, num_of_objects
+            )
+    group_size = period // step * (2 if symmetry.reversal else 1)
+    return fixed_sequences // group_size
+
+
+def count_reversal_fixed_sequences(
+    period: int, shift: int, throws: List[int], num_of_objects: int
+) -> int:
+    """
+    Count the valid sequences that equal their time reversal rotated by `shift` beats.
+
+    The time reversal moves the throw of height `t` at beat `i` to beat `-(i + t)` (see
+    `tools.time_reversal`), so a fixed sequence pairs every beat `i` with the beat
+    `j = -shift - i - t_i` (mod period) and throws the same height there; a beat can also be its
+    own partner. Every such pairing with heights of the right residues is a valid sequence, so the
+    sequences are counted as pairings of the beats, over the subsets of beats paired so far, in
+    O(2^period * period * len(throws) * num_of_objects * period).
+
+    Args:
+        period: The period of the sequences.
+        shift: The rotation applied after the time reversal.
+        throws: The throws allowed in every slot.
+        num_of_objects: Number of objects in the sequences.
+
+    Returns:
+        The number of fixed sequences.
+    """
+    target = num_of_objects * period
+    throws_by_residue: dict[int, List[int]] = {}
+    for throw in throws:
+        throws_by_residue.setdefault(throw % period, []).append(throw)
+    full = (1 << period) - 1
+    # sums[mask] maps the sum of the throws of the beats in `mask` to the number of ways
+    sums: dict[int, dict[int, int]] = {0: {0: 1}}
+    for mask in range(full):
+        if mask not in sums:
+            continue
+        beat = (~mask & (mask + 1)).bit_length() - 1  # The first beat without a partner
+        for partner in range(beat, period):
+            if mask >> partner & 1:
+                continue
+            residue = (-shift - beat - partner) % period
+            copies = 1 if partner == beat else 2
+            next_mask = mask | 1 << beat | 1 << partner
+            next_sums = sums.setdefault(next_mask, {})
+            for throw in throws_by_residue.get(residue, []):
+                for total, ways in sums[mask].items():
+                    new_total = total + copies * throw
+                    if new_total <= target:
+                        next_sums[new_total] = next_sums.get(new_total, 0) + ways
+        del sums[mask]
+    return sums.get(full, {}).get(target, 0)
+
+
+def _allowed_throws(
+    min_throw: int, max_throw: int, exclude_throws: Optional[List[int]]
+) -> List[int]:
+    excluded = set(exclude_throws or [])
+    return [throw for throw in range(min_throw, max_throw + 1) if throw not in excluded]
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Count valid siteswap patterns without generating them."
+    )
+
+    parser.add_argument(
+        "--period-length",
+        type=int,
+        required=True,
+        help="Length of the siteswap period.",
+    )
+    parser.add_argument(
+        "--num-objects",
+        type=int,
+        default=None,
+        help="Number of objects in the siteswap (all counts when counting sequences).",
+    )
+    parser.add_argument("--min-throw", type=int, default=2, help="Minimum throw value.")
+    parser.add_argument(
+        "--max_throw", type=int, default=14, help="Maximum throw value."
+    )
+    parser.add_argument(
+        "--exclude-throws",
+        type=int,
+        nargs="*",
+        default=[1, 3],
+        help="Throws to exclude.",
+    )
+    parser.add_argument(
+        "--include-throws",
+        type=int,
+        nargs="*",
+        default=None,
+        help="Throws that must appear at least once.",
+    )
+    parser.add_argument(
+        "--partial-pattern",
+        type=int,
+        nargs="*",
+        default=None,
+        help="Partial pattern (use -1 for placeholders).",
+    )
+    parser.add_argument(
+        "--jugglers",
+        type=int,
+        default=1,
+        help="Number of jugglers passing the patterns, for --keep-juggler-labels.",
+    )
+    parser.add_argument(
+        "--reversal",
+        action="store_true",
+        help="Count a pattern and its time reversal once.",
+    )
+    parser.add_argument(
+        "--keep-juggler-labels",
+        action="store_true",
+        help="Count the rotations of a pattern that give every juggler a different part apart.",
+    )
+    parser.add_argument(
+        "--sequences",
+        action="store_true",
+        help="Count every valid sequence, rotations included, instead of generated patterns.",
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    if args.sequences:
+        print(
+            count_siteswap_sequences(
+                args.period_length,
+                args.num_objects,
+                args.min_throw,
+                args.max_throw,
+                args.exclude_throws,
+            )
+        )
+        return
+    if args.num_objects is None:
+        raise SystemExit("--num-objects is required unless --sequences is given.")
+
+    partial_pattern = (
+        [None if x == -1 else x for x in args.partial_pattern]
+        if args.partial_pattern
+        else None
+    )
+    print(
+        count_siteswaps(
+            period_length=args.period_length,
+            num_of_objects=args.num_objects,
+            partial_pattern=partial_pattern,
+            min_throw=args.min_throw,
+            max_throw=args.max_throw,
+            exclude_throws=args.exclude_throws,
+            include_throws=args.include_throws,
+            symmetry=SymmetryGroup(
+                num_jugglers=args.jugglers,
+                juggler_relabeling=not args.keep_juggler_labels,
+                reversal=args.reversal,
+            ),
+        )
+    )
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,161 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from .tools import (
+    calculate_pattern_orbit,
+    count_subpatterns,
+    decompose_siteswap_recursive,
+    ground_state_entry,
+    pattern_state_bits,
+    shift_state_bits,
+)
+
+DEFAULT_CHUNK_SIZE = 1000
+CHUNKS_PER_WORKER = 2  # Chunks queued per worker, so workers never wait for the next chunk
+
+
+class PatternAnalysis(NamedTuple):
+    """
+    The properties of a single siteswap pattern, as computed by `analyze_pattern`.
+
+    Attributes:
+        pattern: The analyzed pattern.
+        num_balls: The number of balls in the pattern.
+        excited: Whether the pattern, as written, does not start in the ground state.
+        entry: The shortest throws leading from the ground state into the pattern; empty for
+            ground state patterns.
+        prime: Whether the pattern never repeats a state within its period.
+        decomposition: The subpatterns of the pattern and their counts, most repeated first.
+        orbits: One copy of the pattern per orbit, with the throws of other orbits set to 0.
+    """
+
+    pattern: Tuple[int, ...]
+    num_balls: int
+    excited: bool
+    entry: Tuple[int, ...]
+    prime: bool
+    decomposition: Tuple[Tuple[Tuple[int, ...], int], ...]
+    orbits: Tuple[Tuple[int, ...], ...]
+
+
+def analyze_pattern(pattern: Sequence[int]) -> PatternAnalysis:
+    """
+    Compute every property of a valid siteswap pattern with a single walk through its states.
+
+    The state before the first throw is read off the pattern itself (see
+    `tools.pattern_state_bits`), so excited patterns are analyzed from the state their entry leads
+    to, and the entry is built from that state like in `tools.find_excited_entry`. The state walk
+    decides the prime flag, and a prime pattern is its own decomposition; only composite patterns
+    walk their states again to split them.
+
+    Args:
+        pattern: The throws of a valid siteswap pattern.
+
+    Returns:
+        The analysis of the pattern.
+    """
+    pattern = list(pattern)
+    period = len(pattern)
+    num_balls = sum(pattern) // period
+    excited = any(throw + i < num_balls for i, throw in enumerate(pattern))
+
+    initial_state = pattern_state_bits(pattern)
+    state = initial_state
+    seen_states = set()
+    for throw in pattern:
+        seen_states.add(state)
+        state = shift_state_bits(state, throw)
+    prime = len(seen_states) == period
+
+    if prime:
+        decomposition = ((tuple(pattern), 1),)
+    else:
+        subpatterns = []
+        decompose_siteswap_recursive(pattern, initial_state, subpatterns)
+        decomposition = tuple(count_subpatterns(subpatterns))
+
+    return PatternAnalysis(
+        pattern=tuple(pattern),
+        num_balls=num_balls,
+        excited=excited,
+        entry=tuple(ground_state_entry(initial_state, num_balls)),
+        prime=prime,
+        decomposition=decomposition,
+        orbits=tuple(calculate_pattern_orbit(pattern)),
+    )
+
+
+def analyze_patterns(
+    patterns: Iterable[Sequence[int]],
+    workers: Optional[int] = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[PatternAnalysis]:
+    """
+    Lazily analyze a stream of patterns, in chunks, optionally in a process pool.
+
+    The patterns are read in chunks of `chunk_size`, so the stream can be larger than memory. With
+    more than one worker the chunks are analyzed in a process pool, with at most
+    `CHUNKS_PER_WORKER` chunks per worker in flight; the analyses are yielded in input order.
+
+    Args:
+        patterns: The valid siteswap patterns to analyze.
+        workers: Number of processes to analyze with; None uses every CPU.
+        chunk_size: Number of patterns sent to a worker at once.
+
+    Returns:
+        An iterator over the analyses of the patterns, in input order.
+    """
+    if workers is not None and workers <= 0:
+        raise ValueError("Number of workers must be positive.")
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive.")
+    if workers == 1:
+        return map(analyze_pattern, patterns)
+    return _iter_parallel_analyses(iter(patterns), workers or os.cpu_count() or 1, chunk_size)
+
+
+def _iter_parallel_analyses(
+    patterns: Iterator[Sequence[int]], workers: int, chunk_size: int
+) -> Iterator[PatternAnalysis]:
+    """
+    Analyze chunks of patterns in a process pool and yield the results in input order.
+
+    Args:
+        patterns: The valid siteswap patterns to analyze.
+        workers: Number of processes to analyze with.
+        chunk_size: Number of patterns sent to a worker at once.
+
+    Returns:
+        An iterator over the analyses of the patterns, in input order.
+    """
+    executor = ProcessPoolExecutor(max_workers=workers)
+    max_pending = workers * CHUNKS_PER_WORKER
+    pending = deque()
+    try:
+        while True:
+            while len(pending) < max_pending:
+                chunk = [list(pattern) for pattern in islice(patterns, chunk_size)]
+                if not chunk:
+                    break
+                pending.append(executor.submit(_analyze_chunk, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _analyze_chunk(patterns: List[List[int]]) -> List[PatternAnalysis]:
+    """
+    Analyze a chunk of patterns; this is the unit of work of the process pool.
+
+    Args:
+        patterns: The patterns of the chunk.
+
+    Returns:
+        The analyses of the patterns, in order.
+    """
+    return [analyze_pattern(pattern) for pattern in patterns]
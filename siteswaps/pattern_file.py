@@ -0,0 +1,218 @@
+import mmap
+import struct
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, List, NamedTuple, Union
+
+MAGIC = b"SSWP"
+VERSION = 1
+# magic, version, period, number of objects, min throw, max throw, padding, number of records
+HEADER = struct.Struct("<4sHHHHH10xQ")
+# Records are buffered and written in blocks of about this many bytes
+WRITE_BUFFER_SIZE = 1 << 20
+
+
+class PatternFileHeader(NamedTuple):
+    """The header of a packed pattern file."""
+
+    period: int
+    num_objects: int
+    min_throw: int
+    max_throw: int
+    count: int
+
+
+class PatternWriter:
+    """
+    Stream patterns of the same period into a packed binary pattern file.
+
+    The file starts with a fixed-size header (see `HEADER`) holding the period, the number of
+    objects and the throw bounds, followed by one `period`-byte uint8 record per pattern. The
+    number of records is filled in when the writer is closed.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        period: int,
+        num_objects: int,
+        min_throw: int = 0,
+        max_throw: int = 255,
+    ):
+        if not 0 <= min_throw <= max_throw <= 255:
+            raise ValueError("Throws must fit in one byte to be packed.")
+        self.path = Path(path)
+        self.period = period
+        self.num_objects = num_objects
+        self.min_throw = min_throw
+        self.max_throw = max_throw
+        self.count = 0
+        self._buffer = bytearray()
+        self._file: BinaryIO = open(self.path, "wb")
+        self._file.write(self._header())
+
+    def _header(self) -> bytes:
+        return HEADER.pack(
+            MAGIC,
+            VERSION,
+            self.period,
+            self.num_objects,
+            self.min_throw,
+            self.max_throw,
+            self.count,
+        )
+
+    def __enter__(self) -> "PatternWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, pattern: List[int]) -> None:
+        """
+        Append one pattern to the file.
+
+        Args:
+            pattern: The pattern; its length must be the period of the file, and its throws must be
+                within the throw bounds of the file.
+
+        Raises:
+            ValueError: If the pattern does not fit the header of the file.
+        """
+        if len(pattern) != self.period:
+            raise ValueError("Pattern length must match the period of the file.")
+        if pattern and not self.min_throw <= min(pattern) <= max(pattern) <= self.max_throw:
+            raise ValueError("Throws must be within the throw bounds of the file.")
+        self._buffer += bytes(pattern)
+        self.count += 1
+        if len(self._buffer) >= WRITE_BUFFER_SIZE:
+            self.flush()
+
+    def write_many(self, patterns: Iterable[List[int]]) -> int:
+        """
+        Append patterns to the file as they are produced.
+
+        Args:
+            patterns: An iterable of patterns, e.g. `siteswaps_generator.iter_siteswaps(...)`.
+
+        Returns:
+            The number of patterns written.
+
+        Raises:
+            ValueError: If a pattern does not fit the header of the file.
+        """
+        count = self.count
+        for pattern in patterns:
+            self.write(pattern)
+        return self.count - count
+
+    def flush(self) -> None:
+        self._file.write(self._buffer)
+        self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.close()
+
+
+def write_patterns(
+    path: Union[str, Path],
+    patterns: Iterable[List[int]],
+    period: int,
+    num_objects: int,
+    min_throw: int = 0,
+    max_throw: int = 255,
+) -> int:
+    """
+    Write patterns to a packed binary pattern file.
+
+    Args:
+        path: The file to write.
+        patterns: An iterable of patterns of the given period.
+        period: The period of the patterns.
+        num_objects: The number of objects of the patterns.
+        min_throw: Minimum throw of the patterns.
+        max_throw: Maximum throw of the patterns.
+
+    Returns:
+        The number of patterns written.
+    """
+    with PatternWriter(path, period, num_objects, min_throw, max_throw) as writer:
+        return writer.write_many(patterns)
+
+
+class PatternFile:
+    """
+    A zero-copy, memory-mapped view of a packed binary pattern file.
+
+    Records are read straight from the mapping: `records` is a flat `memoryview` of the
+    `count * period` record bytes, indexing and slicing the file returns patterns, and
+    `as_array()` returns the same memory as a read-only `(count, period)` NumPy array. The mapping
+    is shared between processes that open the same file. Arrays returned by `as_array()` must be
+    released before the file is closed.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, "rb") as pattern_file:
+            raw_header = pattern_file.read(HEADER.size)
+            if len(raw_header) < HEADER.size:
+                raise ValueError(f"{self.path} is not a pattern file.")
+            magic, version, *fields = HEADER.unpack(raw_header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{self.path} is not a version {VERSION} pattern file.")
+            self.header = PatternFileHeader(*fields)
+            size = HEADER.size + self.header.count * self.header.period
+            self._mmap = (
+                mmap.mmap(pattern_file.fileno(), size, access=mmap.ACCESS_READ)
+                if size
+                else None
+            )
+        self.records = (
+            memoryview(self._mmap)[HEADER.size :]
+            if self._mmap is not None
+            else memoryview(b"")
+        )
+
+    def __enter__(self) -> "PatternFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.header.count
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[List[int], List[List[int]]]:
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(len(self)))]
+        if not -len(self) <= index < len(self):
+            raise IndexError("pattern index out of range")
+        return self._record(index % len(self))
+
+    def __iter__(self) -> Iterator[List[int]]:
+        for index in range(len(self)):
+            yield self._record(index)
+
+    def _record(self, index: int) -> List[int]:
+        period = self.header.period
+        return list(self.records[index * period : (index + 1) * period])
+
+    def as_array(self):
+        """Return the records as a read-only `(count, period)` uint8 NumPy array, without copying."""
+        import numpy as np
+
+        if not len(self):
+            return np.empty((0, self.header.period), dtype=np.uint8)
+        return np.frombuffer(
+            self._mmap, dtype=np.uint8, count=len(self) * self.header.period, offset=HEADER.size
+        ).reshape(len(self), self.header.period)
+
+    def close(self) -> None:
+        self.records.release()
+        if self._mmap is not None:
+            self._mmap.close()
@@ -0,0 +1,219 @@
+import sys
+import threading
+from itertools import chain, islice
+from pathlib import Path
+from queue import Queue
+from typing import Dict, Iterable, Optional, Sequence, TextIO, Union
+
+from .pattern_file import PatternWriter
+
+FORMATS = ("plain", "color", "jsonl", "csv", "binary")
+# Patterns formatted and written at once
+CHUNK_SIZE = 4096
+# Formatted chunks waiting for the writer thread before the producer has to wait for it
+MAX_PENDING_CHUNKS = 16
+# Buffer size of output files, so every chunk is a single system call
+FILE_BUFFER_SIZE = 1 << 20
+
+
+def default_format(stream: TextIO) -> str:
+    """
+    Choose the text format for a stream: colored for a terminal, plain otherwise.
+
+    Args:
+        stream: The stream the patterns are written to.
+
+    Returns:
+        The name of the format.
+    """
+    isatty = getattr(stream, "isatty", None)
+    return "color" if isatty is not None and isatty() else "plain"
+
+
+def line_format(output_format: str, period: int) -> str:
+    """
+    Build the %-format string of a single output line for patterns of a period.
+
+    Args:
+        output_format: One of the text formats of `FORMATS`.
+        period: The period of the patterns.
+
+    Returns:
+        The format string, taking the throws of a pattern as its arguments.
+    """
+    if output_format == "plain":
+        return " ".join(["%s"] * period) + "\n"
+    if output_format == "csv":
+        return ",".join(["%s"] * period) + "\n"
+    if output_format == "jsonl":
+        return "[" + ", ".join(["%s"] * period) + "]\n"
+    if output_format == "color":
+        # Imported here so the module loads without the terminal color support
+        from colorama import Fore, Style
+
+        # Alternate colors based on index, red for even and green for odd indices
+        throws = "".join(
+            (Fore.RED if index % 2 == 0 else Fore.GREEN) + "%s " for index in range(period)
+        )
+        return throws + Style.RESET_ALL + "\n"
+    raise ValueError(f"Unknown text format: {output_format}")
+
+
+def format_patterns(
+    patterns: Sequence[Sequence[int]],
+    output_format: str,
+    line_formats: Optional[Dict[int, str]] = None,
+) -> str:
+    """
+    Format a chunk of patterns as text, one pattern per line.
+
+    When every pattern of the chunk has the same period, the whole chunk is formatted with a
+    single %-operation.
+
+    Args:
+        patterns: The patterns to format.
+        output_format: One of the text formats of `FORMATS`.
+        line_formats: A cache of the line formats per period, filled in as needed.
+
+    Returns:
+        The formatted lines.
+    """
+    if not patterns:
+        return ""
+    if line_formats is None:
+        line_formats = {}
+    period = len(patterns[0])
+    if all(len(pattern) == period for pattern in patterns):
+        if period not in line_formats:
+            line_formats[period] = line_format(output_format, period)
+        return (line_formats[period] * len(patterns)) % tuple(chain.from_iterable(patterns))
+    lines = []
+    for pattern in patterns:
+        if len(pattern) not in line_formats:
+            line_formats[len(pattern)] = line_format(output_format, len(pattern))
+        lines.append(line_formats[len(pattern)] % tuple(pattern))
+    return "".join(lines)
+
+
+def write_text_patterns(
+    patterns: Iterable[Sequence[int]],
+    stream: TextIO,
+    output_format: str = "plain",
+    chunk_size: int = CHUNK_SIZE,
+) -> int:
+    """
+    Write patterns to a text stream as they are produced, in chunks.
+
+    The patterns are consumed `chunk_size` at a time, and every formatted chunk is written in a
+    single call by a background thread, so a slow reader of the stream does not hold up the
+    generation of the next chunk.
+
+    Args:
+        patterns: The patterns to write; consumed incrementally.
+        stream: The stream to write to.
+        output_format: One of the text formats of `FORMATS`.
+        chunk_size: Number of patterns formatted and written at once.
+
+    Returns:
+        The number of patterns written.
+    """
+    if output_format not in FORMATS or output_format == "binary":
+        raise ValueError(f"Unknown text format: {output_format}")
+    patterns = iter(patterns)
+    line_formats: Dict[int, str] = {}
+    writer = _BackgroundWriter(stream)
+    num_written = 0
+    try:
+        while True:
+            chunk = list(islice(patterns, chunk_size))
+            if not chunk:
+                break
+            writer.write(format_patterns(chunk, output_format, line_formats))
+            num_written += len(chunk)
+    finally:
+        writer.close()
+    return num_written
+
+
+def write_pattern_output(
+    patterns: Iterable[Sequence[int]],
+    output_format: str,
+    output: Union[str, Path, None] = None,
+    period: int = 0,
+    num_objects: int = 0,
+    min_throw: int = 0,
+    max_throw: int = 255,
+) -> int:
+    """
+    Write patterns in any of the output formats, to a file or to the standard output.
+
+    Args:
+        patterns: The patterns to write; consumed incrementally.
+        output_format: One of `FORMATS`.
+        output: The file to write; None writes text formats to the standard output.
+        period: The period of the patterns, for the header of binary files.
+        num_objects: The number of objects of the patterns, for the header of binary files.
+        min_throw: Minimum throw of the patterns, for the header of binary files.
+        max_throw: Maximum throw of the patterns, for the header of binary files.
+
+    Returns:
+        The number of patterns written.
+
+    Raises:
+        ValueError: If the format is unknown, or is binary without an output file.
+    """
+    if output_format not in FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    if output_format == "binary":
+        if output is None:
+            raise ValueError("The binary format needs an output file.")
+        with PatternWriter(output, period, num_objects, min_throw, max_throw) as writer:
+            return writer.write_many(patterns)
+    if output is None:
+        return write_text_patterns(patterns, sys.stdout, output_format)
+    with open(output, "w", buffering=FILE_BUFFER_SIZE) as output_file:
+        return write_text_patterns(patterns, output_file, output_format)
+
+
+class _BackgroundWriter:
+    """
+    Write text to a stream from a background thread, through a bounded queue.
+
+    The thread releases the GIL while it waits on the stream, so the producer keeps formatting the
+    next chunks meanwhile. An error of the stream is raised in the producer by the next `write` or
+    by `close`.
+    """
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+        self._queue: Queue = Queue(MAX_PENDING_CHUNKS)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, text: str) -> None:
+        if self._error is not None:
+            raise self._error
+        self._queue.put(text)
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        while True:
+            text = self._queue.get()
+            if text is None:
+                break
+            if self._error is None:
+                try:
+                    self._stream.write(text)
+                except BaseException as error:  # Raised in the producer
+                    self._error = error
+        if self._error is None:
+            try:
+                self._stream.flush()
+            except BaseException as error:
+                self._error = error
@@ -0,0 +1,419 @@
+import argparse
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .pattern_output import FORMATS, format_patterns, write_pattern_output
+from .siteswaps_generator import PassingConstraints, iter_unique_patterns, split_siteswap_search
+
+# Subtrees every shard is split into; a checkpoint is written whenever one of them is done
+PREFIXES_PER_SHARD = 256
+# Subtrees searched ahead per worker, so memory stays bounded while the pool is kept busy
+TASKS_PER_WORKER = 4
+CHECKPOINT_VERSION = 1
+
+
+class SearchCheckpoint(NamedTuple):
+    """
+    The frontier of a checkpointed search, as stored by `run_checkpointed_search`.
+
+    The subtrees of the shard are searched in `fill_pattern` order; every subtree before
+    `next_task` is done and its patterns are in the first `output_size` bytes of the output.
+    """
+
+    query: Dict
+    num_tasks: int
+    next_task: int
+    num_written: int
+    output_size: int
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "SearchCheckpoint":
+        """
+        Read a checkpoint file.
+
+        Args:
+            path: The checkpoint file.
+
+        Returns:
+            The checkpoint.
+
+        Raises:
+            ValueError: If the file was written by another version of this module.
+        """
+        with open(path) as checkpoint_file:
+            data = json.load(checkpoint_file)
+        if data.pop("version", None) != CHECKPOINT_VERSION:
+            raise ValueError(f"{path} is not a checkpoint of this version.")
+        return cls(**data)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write the checkpoint; the previous checkpoint is replaced atomically.
+
+        Args:
+            path: The checkpoint file.
+        """
+        temporary_path = Path(path).with_suffix(".tmp")
+        with open(temporary_path, "w") as checkpoint_file:
+            json.dump({"version": CHECKPOINT_VERSION, **self._asdict()}, checkpoint_file)
+        temporary_path.replace(path)
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """
+    Parse a shard given as "i/N", with i counted from 1 to N.
+
+    Args:
+        shard: The shard argument.
+
+    Returns:
+        The zero-based index of the shard and the number of shards.
+
+    Raises:
+        ValueError: If the argument is not of the form "i/N" with 1 <= i <= N.
+    """
+    index, _, num_shards = shard.partition("/")
+    try:
+        index, num_shards = int(index), int(num_shards)
+    except ValueError:
+        raise ValueError(f"Shard must be given as i/N, not {shard!r}.") from None
+    if not 1 <= index <= num_shards:
+        raise ValueError(f"Shard index must be between 1 and {num_shards}.")
+    return index - 1, num_shards
+
+
+def shard_tasks(
+    period_length: int,
+    num_of_objects: int,
+    partial_pattern: List[Union[int, None]],
+    min_throw: int = 2,
+    max_throw: int = 14,
+    exclude_throws: Optional[List[int]] = [1, 3],
+    include_throws: Optional[List[int]] = None,
+    shard: Tuple[int, int] = (0, 1),
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+    prime_only: bool = False,
+    ground_only: bool = False,
+    excited_only: bool = False,
+) -> List[Callable[[], List[List[int]]]]:
+    """
+    Split a `generate_siteswaps` query into subtree searches and keep those of a single shard.
+
+    The split only depends on the query and the number of shards, so separate runs, e.g. on
+    separate machines, agree on it. Subtrees are dealt out to the shards in turn, which spreads
+    the heavy subtrees of the search over all shards. The shards are disjoint and together cover
+    the whole search.
+
+    Args:
+        period_length: Total length of the pattern.
+        num_of_objects: Number of objects in the pattern.
+        partial_pattern: A list representing the partial pattern (e.g., [None, None, 4, None, 6, None]).
+        min_throw: Minimum value for a throw.
+        max_throw: Maximum value for a throw.
+        exclude_throws: A list of throws to exclude from the patterns.
+        include_throws: A list of throws that must appear at least once in every pattern.
+        shard: The zero-based index of the shard and the number of shards.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there (e.g. a set or a
+            range), or None for no restriction.
+        prime_only: Only keep prime patterns, which never revisit a juggling state.
+        ground_only: Only keep patterns that pass through the ground state.
+        excited_only: Only keep patterns that never pass through the ground state.
+
+    Returns:
+        The subtree search tasks of the shard, in search order.
+    """
+    index, num_shards = shard
+    if not 0 <= index < num_shards:
+        raise ValueError("Shard index must be between 0 and the number of shards.")
+    tasks = split_siteswap_search(
+        period_length,
+        num_of_objects,
+        partial_pattern,
+        min_throw,
+        max_throw,
+        exclude_throws,
+        include_throws,
+        num_shards * PREFIXES_PER_SHARD,
+        passing,
+        slot_domains,
+        prime_only,
+        ground_only,
+        excited_only,
+    )
+    return tasks[index::num_shards]
+
+
+def iter_task_results(
+    tasks: List[Callable[[], List[List[int]]]], workers: int = 1
+) -> Iterator[List[List[int]]]:
+    """
+    Run subtree search tasks and yield the patterns of every task, in task order.
+
+    Args:
+        tasks: The tasks, as returned by `shard_tasks`.
+        workers: Number of processes to search with.
+
+    Returns:
+        An iterator over the patterns found by every task.
+    """
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield task()
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    tasks = iter(tasks)
+    pending = deque()
+    try:
+        while True:
+            while len(pending) < workers * TASKS_PER_WORKER:
+                task = next(tasks, None)
+                if task is None:
+                    break
+                pending.append(executor.submit(task))
+            if not pending:
+                return
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def run_checkpointed_search(
+    output: Union[str, Path],
+    checkpoint: Union[str, Path],
+    period_length: int,
+    num_of_objects: int,
+    partial_pattern: List[Union[int, None]],
+    min_throw: int = 2,
+    max_throw: int = 14,
+    exclude_throws: Optional[List[int]] = [1, 3],
+    include_throws: Optional[List[int]] = None,
+    shard: Tuple[int, int] = (0, 1),
+    workers: int = 1,
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+    prime_only: bool = False,
+    ground_only: bool = False,
+    excited_only: bool = False,
+    output_format: str = "plain",
+    resume: bool = False,
+) -> int:
+    """
+    Search a shard of a `generate_siteswaps` query into a text file, checkpointing as it goes.
+
+    The patterns of every subtree are appended to the output and flushed to disk as soon as the
+    subtree is done, and then the checkpoint is updated with the position of the next subtree. A
+    crashed or interrupted run can be resumed from the checkpoint: the output is cut back to the
+    last checkpoint and the search continues with the next subtree, so no pattern is lost or
+    written twice.
+
+    Args:
+        output: The text file to write the patterns to.
+        checkpoint: The checkpoint file.
+        period_length: Total length of the pattern.
+        num_of_objects: Number of objects in the pattern.
+        partial_pattern: A list representing the partial pattern (e.g., [None, None, 4, None, 6, None]).
+        min_throw: Minimum value for a throw.
+        max_throw: Maximum value for a throw.
+        exclude_throws: A list of throws to exclude from the patterns.
+        include_throws: A list of throws that must appear at least once in every pattern.
+        shard: The zero-based index of the shard and the number of shards.
+        workers: Number of processes to search with.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there (e.g. a set or a
+            range), or None for no restriction.
+        prime_only: Only keep prime patterns, which never revisit a juggling state.
+        ground_only: Only keep patterns that pass through the ground state.
+        excited_only: Only keep patterns that never pass through the ground state.
+        output_format: One of the text formats of `FORMATS`.
+        resume: Continue from the checkpoint, if there is one, instead of starting over.
+
+    Returns:
+        The number of patterns in the output.
+
+    Raises:
+        ValueError: If the format is not a text format, or the checkpoint belongs to another
+            query.
+    """
+    if output_format not in FORMATS or output_format == "binary":
+        raise ValueError("Checkpointed searches only write text formats.")
+    tasks = shard_tasks(
+        period_length,
+        num_of_objects,
+        partial_pattern,
+        min_throw,
+        max_throw,
+        exclude_throws,
+        include_throws,
+        shard,
+        passing,
+        slot_domains,
+        prime_only,
+        ground_only,
+        excited_only,
+    )
+    query = _query_key(
+        period_length,
+        num_of_objects,
+        partial_pattern,
+        min_throw,
+        max_throw,
+        exclude_throws,
+        include_throws,
+        shard,
+        passing,
+        slot_domains,
+        prime_only,
+        ground_only,
+        excited_only,
+        output_format,
+    )
+    state = SearchCheckpoint(query, len(tasks), 0, 0, 0)
+    if resume and Path(checkpoint).exists():
+        state = SearchCheckpoint.load(checkpoint)
+        if state.query != query or state.num_tasks != len(tasks):
+            raise ValueError(f"{checkpoint} is the checkpoint of another search.")
+
+    line_formats: Dict[int, str] = {}
+    with open(output, "r+b" if state.output_size else "wb") as output_file:
+        # Drop the patterns written after the last checkpoint
+        output_file.truncate(state.output_size)
+        output_file.seek(state.output_size)
+        state.save(checkpoint)
+        for patterns in iter_task_results(tasks[state.next_task :], workers):
+            output_file.write(format_patterns(patterns, output_format, line_formats).encode())
+            output_file.flush()
+            os.fsync(output_file.fileno())
+            state = state._replace(
+                next_task=state.next_task + 1,
+                num_written=state.num_written + len(patterns),
+                output_size=output_file.tell(),
+            )
+            state.save(checkpoint)
+    return state.num_written
+
+
+def read_text_patterns(path: Union[str, Path]) -> Iterator[List[int]]:
+    """
+    Lazily read the patterns of a plain, csv or jsonl pattern file.
+
+    Args:
+        path: The text file, one pattern per line.
+
+    Returns:
+        An iterator over the patterns of the file.
+    """
+    with open(path) as pattern_file:
+        for line in pattern_file:
+            throws = line.strip().strip("[]").replace(",", " ").split()
+            if throws:
+                yield [int(throw) for throw in throws]
+
+
+def merge_shard_outputs(
+    paths: Iterable[Union[str, Path]],
+    output: Union[str, Path],
+    output_format: str = "plain",
+) -> int:
+    """
+    Merge the text outputs of the shards of a search into one file.
+
+    Patterns are kept in the order of the given files, and every rotation class is only written
+    once, so overlapping outputs, e.g. a shard that was run twice, can be merged as well.
+
+    Args:
+        paths: The text outputs of the shards.
+        output: The file to write the merged patterns to.
+        output_format: One of the text formats of `FORMATS`.
+
+    Returns:
+        The number of patterns written.
+    """
+    patterns = iter_unique_patterns(chain.from_iterable(map(read_text_patterns, paths)))
+    return write_pattern_output(patterns, output_format, output)
+
+
+def _query_key(
+    period_length: int,
+    num_of_objects: int,
+    partial_pattern: List[Union[int, None]],
+    min_throw: int,
+    max_throw: int,
+    exclude_throws: Optional[List[int]],
+    include_throws: Optional[List[int]],
+    shard: Tuple[int, int],
+    passing: Optional[PassingConstraints],
+    slot_domains: Optional[List[Optional[Iterable[int]]]],
+    prime_only: bool,
+    ground_only: bool,
+    excited_only: bool,
+    output_format: str,
+) -> Dict:
+    """
+    Describe a checkpointed search as a JSON object, to match checkpoints to their search.
+
+    Takes the arguments of `run_checkpointed_search` that define the output.
+
+    Returns:
+        The description of the search, as stored in its checkpoints.
+    """
+    return {
+        "period_length": period_length,
+        "num_of_objects": num_of_objects,
+        "partial_pattern": [None if throw in (None, "_") else throw for throw in partial_pattern],
+        "min_throw": min_throw,
+        "max_throw": max_throw,
+        "exclude_throws": sorted(set(exclude_throws or [])),
+        "include_throws": sorted(set(include_throws or [])),
+        "shard": list(shard),
+        "passing": None if passing is None else json.loads(json.dumps(passing._asdict())),
+        "slot_domains": None
+        if slot_domains is None
+        else [None if domain is None else sorted(set(domain)) for domain in slot_domains],
+        "prime_only": prime_only,
+        "ground_only": ground_only,
+        "excited_only": excited_only,
+        "output_format": output_format,
+    }
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Merge the outputs of the shards of a siteswap search, without duplicates."
+    )
+    parser.add_argument("shards", nargs="+", help="Text outputs of the shards.")
+    parser.add_argument("--output", required=True, help="File to write the merged patterns to.")
+    parser.add_argument(
+        "--format",
+        choices=[output_format for output_format in FORMATS if output_format != "binary"],
+        default="plain",
+        help="Output format.",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    num_found = merge_shard_outputs(args.shards, args.output, args.format)
+    print(f"{num_found} siteswaps were written to {args.output}")
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,488 @@
+import argparse
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Hashable, Iterator, List, Optional, Union
+
+from flask import Flask, Response, jsonify, request, stream_with_context
+from flask_cors import CORS
+
+from .siteswaps_generator import split_siteswap_search
+from .tools import calculate_num_balls, find_minimal_transitions, is_valid
+
+# Searches are split into this many subtrees per worker, which is also the progress resolution
+SUBTREES_PER_WORKER = 16
+
+
+class LRUCache:
+    """
+    A thread-safe mapping that forgets its least recently used entries beyond its bounds.
+
+    Every value has a size, the number of patterns or transitions it holds, and the cache keeps
+    at most `maxsize` entries and `max_items` items in total. A value larger than `max_items` is
+    not stored at all.
+    """
+
+    def __init__(self, maxsize: int = 128, max_items: int = 1_000_000):
+        self.maxsize = maxsize
+        self.max_items = max_items
+        self.num_items = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if len(value) > self.max_items:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.num_items -= len(self._entries[key])
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self.num_items += len(value)
+            while len(self._entries) > self.maxsize or self.num_items > self.max_items:
+                _, evicted = self._entries.popitem(last=False)
+                self.num_items -= len(evicted)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class SearchJob:
+    """
+    A search running in the worker pool, shared by every request that asked for it.
+
+    A siteswap search is split into subtree tasks (see `siteswaps_generator.split_siteswap_search`),
+    and their results are appended in search order as they complete, so readers can stream them
+    while the search is still running. A transition search is a single task.
+    """
+
+    def __init__(
+        self,
+        tasks: List[Callable[[], List[List[int]]]],
+        executor: Executor,
+        on_done: Callable[["SearchJob"], None],
+    ):
+        self.patterns: List[List[int]] = []
+        self.total = len(tasks)
+        self.done = 0
+        self.error: Optional[BaseException] = None
+        self.finished = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, args=(tasks, executor, on_done), daemon=True
+        )
+        self._thread.start()
+
+    def _run(
+        self,
+        tasks: List[Callable[[], List[List[int]]]],
+        executor: Executor,
+        on_done: Callable[["SearchJob"], None],
+    ) -> None:
+        try:
+            futures = [executor.submit(task) for task in tasks]
+            for future in futures:
+                chunk = future.result()
+                with self._condition:
+                    self.patterns.extend(chunk)
+                    self.done += 1
+                    self._condition.notify_all()
+        except BaseException as error:  # Reported to every reader of the job
+            self.error = error
+        with self._condition:
+            self.finished = True
+            self._condition.notify_all()
+        on_done(self)
+
+    def result(self) -> List[List[int]]:
+        """
+        Wait for the job to finish.
+
+        Returns:
+            Every result of the job, in search order.
+
+        Raises:
+            The error of the job, if it failed.
+        """
+        with self._condition:
+            while not self.finished:
+                self._condition.wait()
+        if self.error is not None:
+            raise self.error
+        return self.patterns
+
+    def iter_messages(self) -> Iterator[dict]:
+        """
+        Yield the job's progress and patterns as they become available.
+
+        Returns:
+            An iterator over `{"progress": ...}`, `{"patterns": [...]}` and a final
+            `{"done": ...}` or `{"error": ...}` message.
+        """
+        sent = 0
+        reported = -1
+        while True:
+            with self._condition:
+                while (
+                    not self.finished
+                    and sent == len(self.patterns)
+                    and reported == self.done
+                ):
+                    self._condition.wait()
+                patterns = self.patterns[sent:]
+                done, finished, error = self.done, self.finished, self.error
+            if done != reported:
+                reported = done
+                yield {"progress": {"done": done, "total": self.total}}
+            if patterns:
+                sent += len(patterns)
+                yield {"patterns": patterns}
+            if finished:
+                if error is not None:
+                    yield {"error": str(error)}
+                else:
+                    yield {"done": True, "count": sent}
+                return
+
+
+def _query_int(query: dict, name: str, default: Optional[int] = None) -> Optional[int]:
+    """
+    Read an integer field of a query.
+
+    Args:
+        query: The query, as decoded from JSON.
+        name: The name of the field.
+        default: The value of a missing field; a field without a default is required.
+
+    Returns:
+        The value of the field.
+
+    Raises:
+        ValueError: If the field is missing or is not an integer.
+    """
+    if name not in query:
+        if default is None:
+            raise ValueError(f"Missing field: {name}")
+        return default
+    try:
+        return int(query[name])
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer.") from None
+
+
+def _query_throws(
+    query: dict, name: str, default: Optional[List[int]] = None, holes: bool = False
+) -> List[Optional[int]]:
+    """
+    Read a list of throws of a query; a null field reads as an empty list.
+
+    Args:
+        query: The query, as decoded from JSON.
+        name: The name of the field.
+        default: The value of a missing field; a field without a default is required.
+        holes: Whether the list may hold None for open slots.
+
+    Returns:
+        The throws.
+
+    Raises:
+        ValueError: If the field is missing or is not a list of throws.
+    """
+    if name not in query:
+        if default is None:
+            raise ValueError(f"Missing field: {name}")
+        return default
+    value = query[name]
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ValueError(f"{name} must be a list of throws.")
+    try:
+        return [None if holes and throw is None else int(throw) for throw in value]
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a list of throws.") from None
+
+
+def _check_query(query: Any) -> dict:
+    if not isinstance(query, dict):
+        raise ValueError("The query must be a JSON object.")
+    return query
+
+
+def normalize_siteswap_query(query: dict) -> tuple:
+    """
+    Turn a siteswap query into a hashable key, so equivalent requests share results.
+
+    Args:
+        query: The `generate_siteswaps` arguments, as decoded from JSON.
+
+    Returns:
+        The arguments of `generate_siteswaps` in order, with sorted throw sets and the partial
+        pattern as a tuple.
+
+    Raises:
+        ValueError: If a field is missing or has the wrong type.
+    """
+    query = _check_query(query)
+    period_length = _query_int(query, "period_length")
+    partial_pattern = _query_throws(query, "partial_pattern", [], holes=True)
+    return (
+        period_length,
+        _query_int(query, "num_of_objects"),
+        tuple(partial_pattern or [None] * period_length),
+        _query_int(query, "min_throw", 2),
+        _query_int(query, "max_throw", 14),
+        tuple(sorted(set(_query_throws(query, "exclude_throws", [1, 3])))),
+        tuple(sorted(set(_query_throws(query, "include_throws", [])))),
+    )
+
+
+def normalize_transition_query(query: dict) -> tuple:
+    """
+    Turn a transition query into a hashable key.
+
+    Args:
+        query: The `find_minimal_transitions` arguments, as decoded from JSON.
+
+    Returns:
+        Both patterns as tuples, the throw bounds and the sorted excluded throws.
+
+    Raises:
+        ValueError: If a field is missing or has the wrong type, or the patterns are not valid
+            siteswaps of the same number of objects.
+    """
+    query = _check_query(query)
+    pattern_a = _query_throws(query, "patternA")
+    pattern_b = _query_throws(query, "patternB")
+    for pattern in (pattern_a, pattern_b):
+        if not pattern or any(throw < 0 for throw in pattern) or not is_valid(pattern):
+            raise ValueError(f"Not a valid siteswap: {pattern}")
+    if calculate_num_balls(pattern_a) != calculate_num_balls(pattern_b):
+        raise ValueError("Both patterns must have the same number of objects.")
+    max_throw = query.get("max_throw")
+    return (
+        tuple(pattern_a),
+        tuple(pattern_b),
+        _query_int(query, "min_throw", 0),
+        None if max_throw is None else _query_int(query, "max_throw"),
+        tuple(sorted(set(_query_throws(query, "exclude_throws", [])))),
+    )
+
+
+class GenerationService:
+    """
+    Serve siteswap searches and transitions from a process pool, with caching and coalescing.
+
+    Finished results are kept in an LRU cache keyed by the normalized query, bounded both by the
+    number of results and by the number of patterns they hold, and a query that is already
+    running is joined instead of being searched again.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        cache_size: int = 128,
+        cache_patterns: int = 1_000_000,
+    ):
+        workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.num_subtrees = workers * SUBTREES_PER_WORKER
+        self.cache = LRUCache(cache_size, cache_patterns)
+        self._running: dict[tuple, SearchJob] = {}
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
+
+    def stream_siteswaps(self, query: dict) -> Iterator[dict]:
+        """
+        Stream the messages of a siteswap search, from the cache, a running job or a new job.
+
+        Args:
+            query: The `generate_siteswaps` arguments, as decoded from JSON.
+
+        Returns:
+            An iterator over the messages described in `SearchJob.iter_messages`.
+
+        Raises:
+            ValueError: If the query is not valid.
+        """
+        key = normalize_siteswap_query(query)
+        patterns = self.cache.get(key)
+        if patterns is None:
+            patterns = self._join_job(
+                key,
+                lambda: split_siteswap_search(
+                    key[0],
+                    key[1],
+                    list(key[2]),
+                    key[3],
+                    key[4],
+                    list(key[5]),
+                    list(key[6]),
+                    num_subtrees=self.num_subtrees,
+                ),
+            )
+        if isinstance(patterns, SearchJob):
+            return patterns.iter_messages()
+        return iter([{"patterns": patterns}, {"done": True, "count": len(patterns)}])
+
+    def _join_job(
+        self, key: tuple, make_tasks: Callable[[], List[Callable[[], List[List[int]]]]]
+    ) -> Union[SearchJob, List[List[int]]]:
+        """
+        Join the running job of a query, or start one from its tasks.
+
+        The tasks are built without holding the lock, so a large split does not hold up other
+        requests; if another request started the job or cached its result meanwhile, the tasks
+        are dropped.
+
+        Args:
+            key: The normalized query.
+            make_tasks: Builds the tasks of the job, if it is not running yet.
+
+        Returns:
+            The job, or the cached result if the job finished while the tasks were built.
+        """
+        with self._lock:
+            job = self._running.get(key)
+        if job is not None:
+            return job
+        tasks = make_tasks()
+        with self._lock:
+            job = self._running.get(key)
+            if job is None:
+                result = self.cache.get(key)
+                if result is not None:
+                    return result
+                job = SearchJob(tasks, self.executor, lambda job: self._finish(key, job))
+                self._running[key] = job
+        return job
+
+    def _finish(self, key: tuple, job: SearchJob) -> None:
+        with self._lock:
+            if job.error is None:
+                self.cache.put(key, job.patterns)
+            self._running.pop(key, None)
+
+    def find_transitions(self, query: dict) -> dict:
+        """
+        Find the minimal transitions between two patterns in the worker pool.
+
+        Identical queries that are running at the same time share a single job.
+
+        Args:
+            query: The `find_minimal_transitions` arguments, as decoded from JSON.
+
+        Returns:
+            The minimal transitions and their length (None if there is no transition).
+
+        Raises:
+            ValueError: If the query is not valid.
+        """
+        key = normalize_transition_query(query)
+        cache_key = ("transition",) + key
+        transitions = self.cache.get(cache_key)
+        if transitions is None:
+            task = partial(
+                find_minimal_transitions,
+                list(key[0]),
+                list(key[1]),
+                key[2],
+                key[3],
+                list(key[4]),
+            )
+            transitions = self._join_job(cache_key, lambda: [task])
+            if isinstance(transitions, SearchJob):
+                transitions = transitions.result()
+        return {
+            "transitions": transitions,
+            "length": len(transitions[0]) if transitions else None,
+        }
+
+
+def create_app(service: GenerationService) -> Flask:
+    """
+    Create the Flask app serving a generation service.
+
+    `POST /siteswaps` streams a search as JSON lines, and `POST /transition` answers with the
+    minimal transitions between two patterns.
+
+    Args:
+        service: The service answering the requests.
+
+    Returns:
+        Flask: The app.
+    """
+    app = Flask(__name__)
+    CORS(app)
+
+    @app.errorhandler(ValueError)
+    def bad_request(error):
+        return jsonify({"error": str(error)}), 400
+
+    @app.post("/siteswaps")
+    def siteswaps():
+        messages = service.stream_siteswaps(request.get_json(force=True))
+        return Response(
+            stream_with_context(json.dumps(message) + "\n" for message in messages),
+            mimetype="application/x-ndjson",
+        )
+
+    @app.post("/transition")
+    def transition():
+        return jsonify(service.find_transitions(request.get_json(force=True)))
+
+    return app
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Serve siteswap generation over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Host to listen on.")
+    parser.add_argument("--port", type=int, default=5000, help="Port to listen on.")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Number of search processes (0 uses every CPU).",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=128,
+        help="Number of results kept in the cache.",
+    )
+    parser.add_argument(
+        "--cache-patterns",
+        type=int,
+        default=1_000_000,
+        help="Number of patterns kept in the cache over all results; larger results are not "
+        "cached.",
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    service = GenerationService(args.jobs or None, args.cache_size, args.cache_patterns)
+    try:
+        create_app(service).run(host=args.host, port=args.port, threaded=True)
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,332 @@
+import argparse
+import sqlite3
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+from .cache import get_cache_dir
+from .siteswaps_generator import iter_siteswaps
+from .tools import canonical_rotation
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS families (
+    id INTEGER PRIMARY KEY,
+    period INTEGER NOT NULL,
+    num_objects INTEGER NOT NULL,
+    min_throw INTEGER NOT NULL,
+    max_throw INTEGER NOT NULL,
+    UNIQUE (period, num_objects, min_throw, max_throw)
+);
+CREATE TABLE IF NOT EXISTS patterns (
+    id INTEGER PRIMARY KEY,
+    family_id INTEGER NOT NULL REFERENCES families (id),
+    throws BLOB NOT NULL,
+    min_throw INTEGER NOT NULL,
+    max_throw INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS patterns_by_family ON patterns (family_id, id);
+CREATE TABLE IF NOT EXISTS pattern_throws (
+    family_id INTEGER NOT NULL,
+    throw INTEGER NOT NULL,
+    pattern_id INTEGER NOT NULL,
+    PRIMARY KEY (family_id, throw, pattern_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS pattern_slots (
+    family_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    throw INTEGER NOT NULL,
+    pattern_id INTEGER NOT NULL,
+    PRIMARY KEY (family_id, position, throw, pattern_id)
+) WITHOUT ROWID;
+"""
+
+
+def get_default_catalog_path() -> Path:
+    """Return the path of the catalog in the cache directory."""
+    return get_cache_dir() / "siteswaps_catalog.sqlite"
+
+
+class SiteswapCatalog:
+    """
+    A persistent SQLite store of the canonical patterns of whole siteswap families.
+
+    A family holds every pattern `generate_siteswaps` returns for a period, a number of objects and
+    a throw range, with no excluded or required throws and no partial pattern. Each pattern is
+    indexed by the throws it contains and by the throw at each position of its canonical rotation,
+    so `include_throws`, `exclude_throws` and `partial_pattern` filters become index lookups.
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path) if path is not None else get_default_catalog_path()
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> "SiteswapCatalog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def add_family(
+        self,
+        period_length: int,
+        num_of_objects: int,
+        min_throw: int = 0,
+        max_throw: int = 14,
+        workers: Optional[int] = 1,
+    ) -> int:
+        """
+        Generate a family and store it, unless it is already in the catalog.
+
+        Args:
+            period_length: Total length of the patterns.
+            num_of_objects: Number of objects in the patterns.
+            min_throw: Minimum value for a throw.
+            max_throw: Maximum value for a throw.
+            workers: Number of processes to search with; None uses every CPU.
+
+        Returns:
+            The number of patterns in the family.
+        """
+        key = (period_length, num_of_objects, min_throw, max_throw)
+        row = self.connection.execute(
+            "SELECT id FROM families"
+            " WHERE period = ? AND num_objects = ? AND min_throw = ? AND max_throw = ?",
+            key,
+        ).fetchone()
+        if row is not None:
+            return self._family_size(row[0])
+
+        with self.connection:
+            family_id = self.connection.execute(
+                "INSERT INTO families (period, num_objects, min_throw, max_throw)"
+                " VALUES (?, ?, ?, ?)",
+                key,
+            ).lastrowid
+            for pattern in iter_siteswaps(
+                period_length,
+                num_of_objects,
+                [None] * period_length,
+                min_throw,
+                max_throw,
+                exclude_throws=None,
+                workers=workers,
+            ):
+                pattern_id = self.connection.execute(
+                    "INSERT INTO patterns (family_id, throws, min_throw, max_throw)"
+                    " VALUES (?, ?, ?, ?)",
+                    (family_id, bytes(pattern), min(pattern), max(pattern)),
+                ).lastrowid
+                self.connection.executemany(
+                    "INSERT INTO pattern_throws (family_id, throw, pattern_id)"
+                    " VALUES (?, ?, ?)",
+                    [(family_id, throw, pattern_id) for throw in set(pattern)],
+                )
+                self.connection.executemany(
+                    "INSERT INTO pattern_slots (family_id, position, throw, pattern_id)"
+                    " VALUES (?, ?, ?, ?)",
+                    [
+                        (family_id, position, throw, pattern_id)
+                        for position, throw in enumerate(pattern)
+                    ],
+                )
+        return self._family_size(family_id)
+
+    def _family_size(self, family_id: int) -> int:
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM patterns WHERE family_id = ?", (family_id,)
+        ).fetchone()[0]
+
+    def find_family(
+        self, period_length: int, num_of_objects: int, min_throw: int, max_throw: int
+    ) -> Optional[int]:
+        """
+        Find a stored family whose throw range covers the given one.
+
+        Returns:
+            The id of the family with the narrowest covering throw range, or None.
+        """
+        row = self.connection.execute(
+            "SELECT id FROM families"
+            " WHERE period = ? AND num_objects = ? AND min_throw <= ? AND max_throw >= ?"
+            " ORDER BY max_throw - min_throw LIMIT 1",
+            (period_length, num_of_objects, min_throw, max_throw),
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def iter_query(
+        self,
+        period_length: int,
+        num_of_objects: int,
+        partial_pattern: List[Union[int, None]],
+        min_throw: int = 2,
+        max_throw: int = 14,
+        exclude_throws: Optional[List[int]] = [1, 3],
+        include_throws: Optional[List[int]] = None,
+    ) -> Optional[Iterator[List[int]]]:
+        """
+        Answer a `generate_siteswaps` query from the catalog.
+
+        The patterns come out in the order `generate_siteswaps` returns them.
+
+        Args:
+            period_length: Total length of the pattern.
+            num_of_objects: Number of objects in the pattern.
+            partial_pattern: A list representing the partial pattern (e.g., [None, None, 4, None, 6, None]).
+            min_throw: Minimum value for a throw.
+            max_throw: Maximum value for a throw.
+            exclude_throws: A list of throws to exclude from the patterns.
+            include_throws: A list of throws that must appear at least once in every pattern.
+
+        Returns:
+            An iterator over the canonical patterns, or None if no stored family covers the query.
+        """
+        family_id = self.find_family(period_length, num_of_objects, min_throw, max_throw)
+        if family_id is None:
+            return None
+        pattern = [None if throw in (None, "_") else throw for throw in partial_pattern]
+        excluded = sorted(set(exclude_throws or []))
+        included = sorted(set(include_throws or []))
+        if all(throw is None for throw in pattern):
+            return self._iter_family_patterns(
+                family_id, min_throw, max_throw, excluded, included
+            )
+        return iter(
+            self._query_partial_pattern(
+                family_id, pattern, min_throw, max_throw, set(excluded), set(included)
+            )
+        )
+
+    def _iter_family_patterns(
+        self,
+        family_id: int,
+        min_throw: int,
+        max_throw: int,
+        excluded: List[int],
+        included: List[int],
+    ) -> Iterator[List[int]]:
+        query = (
+            "SELECT throws FROM patterns"
+            " WHERE family_id = ? AND min_throw >= ? AND max_throw <= ?"
+        )
+        parameters: list = [family_id, min_throw, max_throw]
+        if excluded:
+            query += (
+                " AND id NOT IN (SELECT pattern_id FROM pattern_throws"
+                f" WHERE family_id = ? AND throw IN ({', '.join('?' * len(excluded))}))"
+            )
+            parameters += [family_id, *excluded]
+        for throw in included:
+            query += (
+                " AND id IN (SELECT pattern_id FROM pattern_throws"
+                " WHERE family_id = ? AND throw = ?)"
+            )
+            parameters += [family_id, throw]
+        query += " ORDER BY id"
+        for (throws,) in self.connection.execute(query, parameters):
+            yield list(throws)
+
+    def _query_partial_pattern(
+        self,
+        family_id: int,
+        pattern: List[Union[int, None]],
+        min_throw: int,
+        max_throw: int,
+        excluded: set,
+        included: set,
+    ) -> List[List[int]]:
+        """
+        Find the stored patterns with a rotation that completes the partial pattern.
+
+        Every rotation of the partial pattern is looked up in the position index. A completion
+        must also respect the throw constraints on its open slots, and each pattern is placed
+        where the search meets its smallest completion.
+        """
+        period = len(pattern)
+        pins = [(i, throw) for i, throw in enumerate(pattern) if throw is not None]
+        open_indices = [i for i, throw in enumerate(pattern) if throw is None]
+        first_completions: dict[bytes, List[int]] = {}
+        for shift in range(period):
+            lookups = " INTERSECT ".join(
+                "SELECT pattern_id FROM pattern_slots"
+                " WHERE family_id = ? AND position = ? AND throw = ?"
+                for _ in pins
+            )
+            parameters = [
+                value
+                for i, throw in pins
+                for value in (family_id, (i + shift) % period, throw)
+            ]
+            for (throws,) in self.connection.execute(
+                f"SELECT throws FROM patterns WHERE id IN ({lookups})", parameters
+            ):
+                completion = list(throws[shift:] + throws[:shift])
+                open_values = {completion[i] for i in open_indices}
+                if (
+                    all(min_throw <= value <= max_throw for value in open_values)
+                    and not open_values & excluded
+                    and included <= open_values
+                ):
+                    first = first_completions.get(throws)
+                    if first is None or completion < first:
+                        first_completions[throws] = completion
+        return [
+            canonical_rotation(completion)
+            for completion in sorted(first_completions.values())
+        ]
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Store whole siteswap families in the pattern catalog."
+    )
+    parser.add_argument(
+        "--period-length",
+        type=int,
+        required=True,
+        help="Length of the siteswap period.",
+    )
+    parser.add_argument(
+        "--num-objects",
+        type=int,
+        required=True,
+        help="Number of objects in the siteswap.",
+    )
+    parser.add_argument("--min-throw", type=int, default=0, help="Minimum throw value.")
+    parser.add_argument(
+        "--max_throw", type=int, default=14, help="Maximum throw value."
+    )
+    parser.add_argument(
+        "--catalog",
+        type=Path,
+        default=None,
+        help="Catalog file (defaults to the one in the cache directory).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes to search with (0 uses every CPU).",
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+
+    with SiteswapCatalog(args.catalog) as catalog:
+        num_patterns = catalog.add_family(
+            args.period_length,
+            args.num_objects,
+            args.min_throw,
+            args.max_throw,
+            workers=args.jobs or None,
+        )
+    print(f"{num_patterns} siteswaps are stored in the catalog")
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,347 @@
+import heapq
+from itertools import count, islice
+from math import ceil
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from .siteswaps_generator import (
+    PassingConstraints,
+    _make_state_filter,
+    iter_filled_patterns,
+    iter_search_prefixes,
+    validate_siteswap_arguments,
+)
+from .tools import calculate_pattern_orbit, canonical_rotation
+
+# Nodes with at most this many open slots left are completed at once instead of one slot at a time
+LEAF_SLOTS = 2
+
+
+class PatternScore(NamedTuple):
+    """
+    A difficulty score of siteswap patterns; lower scores are easier.
+
+    `score` maps a valid pattern to its score and must not depend on the rotation the pattern is
+    written in. `bound(partial_pattern, num_of_objects, max_throw)` gets a partial pattern with
+    None for the open slots and returns a lower bound of the score of every completion; the
+    tighter it is, the fewer branches the ranked search expands. Without a bound every branch is
+    expanded before the first pattern is returned.
+    """
+
+    score: Callable[[Sequence[int]], float]
+    bound: Optional[Callable[[Sequence[Optional[int]], int, int], float]] = None
+
+
+def _max_throw(pattern: Sequence[int]) -> int:
+    return max(pattern)
+
+
+def _max_throw_bound(
+    partial_pattern: Sequence[Optional[int]], num_of_objects: int, max_throw: int
+) -> int:
+    placed = [throw for throw in partial_pattern if throw is not None]
+    num_open = len(partial_pattern) - len(placed)
+    if not num_open:
+        return max(placed)
+    # The open slots share the rest of the sum, so one of them takes at least its average
+    remaining_sum = num_of_objects * len(partial_pattern) - sum(placed)
+    return max(placed + [ceil(remaining_sum / num_open)])
+
+
+def _num_orbits(pattern: Sequence[int]) -> int:
+    return sum(1 for orbit in calculate_pattern_orbit(list(pattern)) if any(orbit))
+
+
+MAX_THROW_SCORE = PatternScore(_max_throw, _max_throw_bound)
+ORBIT_SCORE = PatternScore(_num_orbits)
+
+
+def high_throw_score(threshold: int) -> PatternScore:
+    """
+    Score patterns by their number of high throws.
+
+    Args:
+        threshold: The lowest throw that counts as high.
+
+    Returns:
+        The score.
+    """
+
+    def score(pattern: Sequence[int]) -> int:
+        return sum(1 for throw in pattern if throw >= threshold)
+
+    def bound(
+        partial_pattern: Sequence[Optional[int]], num_of_objects: int, max_throw: int
+    ) -> int:
+        placed = [throw for throw in partial_pattern if throw is not None]
+        num_open = len(partial_pattern) - len(placed)
+        num_high = sum(1 for throw in placed if throw >= threshold)
+        # Low throws add at most threshold - 1 each, so the rest of the sum needs high throws
+        missing_sum = (
+            num_of_objects * len(partial_pattern) - sum(placed) - num_open * (threshold - 1)
+        )
+        if missing_sum <= 0 or max_throw < threshold:
+            return num_high
+        return num_high + ceil(missing_sum / (max_throw - threshold + 1))
+
+    return PatternScore(score, bound)
+
+
+def pass_score(num_jugglers: int = 2) -> PatternScore:
+    """
+    Score patterns by their number of passes.
+
+    Args:
+        num_jugglers: Number of jugglers; throws that are not a multiple of it are passes.
+
+    Returns:
+        The score.
+    """
+
+    def score(pattern: Sequence[int]) -> int:
+        return sum(1 for throw in pattern if throw % num_jugglers)
+
+    def bound(
+        partial_pattern: Sequence[Optional[int]], num_of_objects: int, max_throw: int
+    ) -> int:
+        return score([throw for throw in partial_pattern if throw is not None])
+
+    return PatternScore(score, bound)
+
+
+SCORE_NAMES = ("max-throw", "high-throws", "passes", "orbits")
+
+
+def named_score(name: str, num_of_objects: int, num_jugglers: int = 2) -> PatternScore:
+    """
+    Return one of the built-in scores by name.
+
+    Args:
+        name: One of `SCORE_NAMES`; high throws are the throws above the number of objects.
+        num_of_objects: Number of objects in the patterns.
+        num_jugglers: Number of jugglers, to tell passes from selfs.
+
+    Returns:
+        The score.
+    """
+    if name == "max-throw":
+        return MAX_THROW_SCORE
+    if name == "high-throws":
+        return high_throw_score(num_of_objects + 1)
+    if name == "passes":
+        return pass_score(num_jugglers)
+    if name == "orbits":
+        return ORBIT_SCORE
+    raise ValueError(f"Unknown score: {name}")
+
+
+def iter_ranked_siteswaps(
+    period_length: int,
+    num_of_objects: int,
+    partial_pattern: List[Union[int, None]],
+    min_throw: int = 2,
+    max_throw: int = 14,
+    exclude_throws: Optional[List[int]] = [1, 3],
+    include_throws: Optional[List[int]] = None,
+    score: Union[PatternScore, Callable[[Sequence[int]], float]] = MAX_THROW_SCORE,
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+    prime_only: bool = False,
+    ground_only: bool = False,
+    excited_only: bool = False,
+    limit: Optional[int] = None,
+) -> Iterator[List[int]]:
+    """
+    Lazily yield the patterns of `generate_siteswaps` from the lowest score to the highest.
+
+    The search is best-first: its frontier is a heap of search prefixes keyed by the lower bound
+    of the score of their completions, and of completed patterns keyed by their score. A pattern
+    is yielded once it is on top of the heap, since nothing left can score lower. Prefixes are
+    extended one open slot at a time, with all the pruning of the regular search, so with a tight
+    bound only the branches that can still hold one of the next patterns are expanded. Patterns
+    with the same score come in an unspecified but deterministic order.
+
+    Args:
+        period_length: Total length of the pattern.
+        num_of_objects: Number of objects in the pattern.
+        partial_pattern: A list representing the partial pattern (e.g., [None, None, 4, None, 6, None]).
+        min_throw: Minimum value for a throw.
+        max_throw: Maximum value for a throw.
+        exclude_throws: A list of throws to exclude from the patterns.
+        include_throws: A list of throws that must appear at least once in every pattern.
+        score: The score to rank by; a plain function is used without a bound.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there (e.g. a set or a
+            range), or None for no restriction.
+        prime_only: Only keep prime patterns, which never revisit a juggling state.
+        ground_only: Only keep patterns that pass through the ground state.
+        excited_only: Only keep patterns that never pass through the ground state.
+        limit: If given, at most this many patterns are wanted, so branches that cannot beat the
+            best `limit` patterns found so far are dropped instead of kept in the heap.
+
+    Returns:
+        An iterator over the canonical patterns, in order of their scores.
+    """
+    validate_siteswap_arguments(
+        period_length,
+        num_of_objects,
+        partial_pattern,
+        min_throw,
+        max_throw,
+        exclude_throws,
+        include_throws,
+        passing,
+        slot_domains,
+    )
+    if limit is not None and limit <= 0:
+        raise ValueError("Number of patterns must be positive.")
+    pattern = [None if throw in (None, "_") else throw for throw in partial_pattern]
+    return _iter_ranked_patterns(
+        (pattern, num_of_objects, min_throw, max_throw, set(exclude_throws or [])),
+        dict(
+            canonical_only=True,
+            passing=passing,
+            slot_domains=slot_domains,
+            state_filter=_make_state_filter(prime_only, ground_only, excited_only),
+        ),
+        set(include_throws or []),
+        score if isinstance(score, PatternScore) else PatternScore(score),
+        limit,
+    )
+
+
+def _iter_ranked_patterns(
+    search_args: tuple,
+    search_kwargs: dict,
+    include_throws: set,
+    score: PatternScore,
+    limit: Optional[int],
+) -> Iterator[List[int]]:
+    """
+    Run the best-first search of `iter_ranked_siteswaps`.
+
+    Args:
+        search_args: The pattern, number of objects, throw bounds and excluded throws of the
+            search, as taken by `iter_search_prefixes`.
+        search_kwargs: The search options shared by `iter_search_prefixes` and
+            `iter_filled_patterns`.
+        include_throws: A set of throws that must appear at least once in every pattern.
+        score: The score to rank by.
+        limit: If given, at most this many patterns are wanted.
+
+    Returns:
+        An iterator over the canonical patterns, in order of their scores.
+    """
+    pattern, num_of_objects, _, max_throw, _ = search_args
+    generator_indices = [i for i, throw in enumerate(pattern) if throw is None]
+
+    def prefix_bound(prefix: Sequence[int]) -> float:
+        if score.bound is None:
+            return float("-inf")
+        partial = pattern[:]
+        for i, throw in zip(generator_indices, prefix):
+            partial[i] = throw
+        return score.bound(partial, num_of_objects, max_throw)
+
+    # Entries are (key, is_prefix, order, item), so patterns leave before prefixes of equal key
+    frontier = []
+    # The negated scores of the best `limit` patterns pushed so far
+    best_scores = []
+    order = count()
+
+    def push(key: float, is_prefix: bool, item: Sequence[int]) -> None:
+        if limit is not None and len(best_scores) == limit and key >= -best_scores[0]:
+            return  # The best patterns found so far already fill the limit
+        heapq.heappush(frontier, (key, is_prefix, next(order), item))
+        if limit is not None and not is_prefix:
+            if len(best_scores) < limit:
+                heapq.heappush(best_scores, -key)
+            else:
+                heapq.heapreplace(best_scores, -key)
+
+    push(prefix_bound(()), True, ())
+    while frontier:
+        _, is_prefix, _, item = heapq.heappop(frontier)
+        if not is_prefix:
+            yield list(item)
+            continue
+        if len(generator_indices) - len(item) <= LEAF_SLOTS:
+            for filled_pattern in iter_filled_patterns(
+                *search_args,
+                include_throws,
+                generator_indices,
+                prefix=item,
+                **search_kwargs,
+            ):
+                canonical_pattern = canonical_rotation(filled_pattern)
+                push(score.score(canonical_pattern), False, canonical_pattern)
+            continue
+        for prefix in iter_search_prefixes(
+            *search_args,
+            len(item) + 1,
+            include_throws=include_throws,
+            generator_indices=generator_indices,
+            prefix=item,
+            **search_kwargs,
+        ):
+            push(prefix_bound(prefix), True, prefix)
+
+
+def top_siteswaps(
+    k: int,
+    period_length: int,
+    num_of_objects: int,
+    partial_pattern: List[Union[int, None]],
+    min_throw: int = 2,
+    max_throw: int = 14,
+    exclude_throws: Optional[List[int]] = [1, 3],
+    include_throws: Optional[List[int]] = None,
+    score: Union[PatternScore, Callable[[Sequence[int]], float]] = MAX_THROW_SCORE,
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+    prime_only: bool = False,
+    ground_only: bool = False,
+    excited_only: bool = False,
+) -> List[List[int]]:
+    """
+    Return the `k` patterns of `generate_siteswaps` with the lowest scores, from the lowest up.
+
+    See `iter_ranked_siteswaps` for the search; it stops as soon as the `k` patterns are proven
+    to be the best, and never keeps branches that cannot beat the best `k` patterns found.
+
+    Args:
+        k: Number of patterns to return.
+        period_length: Total length of the pattern.
+        num_of_objects: Number of objects in the pattern.
+        partial_pattern: A list representing the partial pattern (e.g., [None, None, 4, None, 6, None]).
+        min_throw: Minimum value for a throw.
+        max_throw: Maximum value for a throw.
+        exclude_throws: A list of throws to exclude from the patterns.
+        include_throws: A list of throws that must appear at least once in every pattern.
+        score: The score to rank by; a plain function is used without a bound.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there (e.g. a set or a
+            range), or None for no restriction.
+        prime_only: Only keep prime patterns, which never revisit a juggling state.
+        ground_only: Only keep patterns that pass through the ground state.
+        excited_only: Only keep patterns that never pass through the ground state.
+
+    Returns:
+        The best patterns, in their canonical rotation.
+    """
+    patterns = iter_ranked_siteswaps(
+        period_length,
+        num_of_objects,
+        partial_pattern,
+        min_throw,
+        max_throw,
+        exclude_throws,
+        include_throws,
+        score,
+        passing,
+        slot_domains,
+        prime_only,
+        ground_only,
+        excited_only,
+        limit=k,
+    )
+    return list(islice(patterns, k))
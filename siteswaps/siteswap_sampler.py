@@ -0,0 +1,447 @@
+import argparse
+import hashlib
+import json
+import random
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from math import gcd
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .cache import get_cache_dir
+from .siteswaps_generator import validate_siteswap_arguments
+from .state_graph import StateGraph
+from .tools import canonical_rotation
+
+# Start states whose return counts are kept between samples; each takes O(p * states) memory
+RETURN_WAYS_CACHE_SIZE = 256
+
+
+class SiteswapSampler:
+    """
+    Draw the patterns `generate_siteswaps` returns uniformly at random, without enumerating them.
+
+    Valid sequences of period `p` are the closed walks of length `p` in the state graph (see
+    `state_graph.StateGraph`). The number of closed walks through every start state is computed
+    once; a sample then picks a start state with probability proportional to its count and walks
+    the graph, choosing every throw by the number of ways the walk can still return to its start.
+    A sample costs O(p * E) for the E edges of the graph, and O(p) once the return counts of its
+    start state are cached.
+
+    Patterns are drawn per rotation class, as `generate_siteswaps` lists them. Without a partial
+    pattern this uses Burnside's lemma: a uniform pair of a rotation and a sequence fixed by it
+    belongs to a uniform rotation class, and the sequences fixed by a rotation of `p / g` slots
+    are the closed walks of length `g` repeated. With a partial pattern a completion is accepted
+    with probability one over the number of its rotations that also complete the partial pattern.
+    """
+
+    def __init__(
+        self,
+        period_length: int,
+        num_of_objects: int,
+        partial_pattern: Optional[List[Union[int, None]]] = None,
+        min_throw: int = 2,
+        max_throw: int = 14,
+        exclude_throws: Optional[List[int]] = [1, 3],
+        cache_dir: Optional[Path] = None,
+    ):
+        """
+        Count the closed walks the samples are drawn from.
+
+        Args:
+            period_length: Total length of the pattern.
+            num_of_objects: Number of objects in the pattern.
+            partial_pattern: A list representing the partial pattern (e.g., [None, None, 4, None, 6, None]).
+            min_throw: Minimum value for a throw.
+            max_throw: Maximum value for a throw.
+            exclude_throws: A list of throws to exclude from the patterns.
+            cache_dir: Directory the state graph is cached in; defaults to
+                `cache.get_cache_dir()`.
+        """
+        self._setup(
+            period_length,
+            num_of_objects,
+            partial_pattern,
+            min_throw,
+            max_throw,
+            exclude_throws,
+            cache_dir,
+        )
+        self.start_weights = self._count_closed_walks()
+        self._setup_weights()
+
+    def _setup(
+        self,
+        period_length: int,
+        num_of_objects: int,
+        partial_pattern: Optional[List[Union[int, None]]],
+        min_throw: int,
+        max_throw: int,
+        exclude_throws: Optional[List[int]],
+        cache_dir: Optional[Path],
+    ) -> None:
+        if partial_pattern is None:
+            partial_pattern = [None] * period_length
+        validate_siteswap_arguments(
+            period_length,
+            num_of_objects,
+            partial_pattern,
+            min_throw,
+            max_throw,
+            exclude_throws,
+            None,
+        )
+        self.pattern = [None if throw in (None, "_") else throw for throw in partial_pattern]
+        self.num_of_objects = num_of_objects
+        self.min_throw = min_throw
+        self.max_throw = max_throw
+        self.exclude_throws = sorted(set(exclude_throws or []))
+        # The graph has to hold the prefilled throws, and at least one state
+        graph_max_throw = max(
+            [max_throw, num_of_objects] + [throw for throw in self.pattern if throw is not None]
+        )
+        self.graph = StateGraph.load(num_of_objects, graph_max_throw, cache_dir)
+        throws = {
+            throw
+            for throw in range(min_throw, max_throw + 1)
+            if throw not in self.exclude_throws
+        }
+        self.open_pattern = all(throw is None for throw in self.pattern)
+        edges_by_throws: Dict[frozenset, List[List[Tuple[int, int]]]] = {}
+        self.slot_edges = []
+        for throw in self.pattern:
+            slot_throws = frozenset(throws if throw is None else [throw])
+            if slot_throws not in edges_by_throws:
+                edges_by_throws[slot_throws] = [
+                    [
+                        (target, state_throw)
+                        for target, state_throw in zip(targets, state_throws)
+                        if state_throw in slot_throws
+                    ]
+                    for targets, state_throws in zip(self.graph.targets, self.graph.throws)
+                ]
+            self.slot_edges.append(edges_by_throws[slot_throws])
+        self._return_ways = lru_cache(maxsize=RETURN_WAYS_CACHE_SIZE)(self._count_return_ways)
+
+    def _count_closed_walks(self) -> Dict[int, Dict[int, int]]:
+        """
+        Count the closed walks of every block length through every start state.
+
+        Returns:
+            For every block length the samples can repeat, the number of closed walks of that
+            length from every start state that has any.
+        """
+        period = len(self.pattern)
+        block_lengths = (
+            [g for g in range(1, period + 1) if period % g == 0] if self.open_pattern else [period]
+        )
+        start_weights: Dict[int, Dict[int, int]] = {g: {} for g in block_lengths}
+        for start in range(len(self.graph.states)):
+            counts = {start: 1}
+            for step, edges in enumerate(self.slot_edges, 1):
+                next_counts: Dict[int, int] = {}
+                for state, count in counts.items():
+                    for target, _ in edges[state]:
+                        next_counts[target] = next_counts.get(target, 0) + count
+                counts = next_counts
+                if step in start_weights and counts.get(start):
+                    start_weights[step][start] = counts[start]
+        return start_weights
+
+    def _setup_weights(self) -> None:
+        """Set up the cumulative weights the block lengths and start states are drawn with."""
+        period = len(self.pattern)
+        self.num_sequences = sum(self.start_weights.get(period, {}).values())
+        ground_state = self.graph.ground_state
+        constant_edge = (ground_state, self.num_of_objects)
+        self._blocks = []
+        constant_weight = 0
+        for block_length, weights in self.start_weights.items():
+            # Rotations by a multiple of p / g fix the sequences made of a repeated block of g
+            num_shifts = sum(1 for shift in range(period) if gcd(shift, period) == block_length)
+            starts = sorted(weights)
+            cumulative = list(accumulate(weights[start] for start in starts))
+            if cumulative:
+                self._blocks.append((block_length, num_shifts * cumulative[-1], starts, cumulative))
+            if all(
+                constant_edge in edges[ground_state]
+                for edges in self.slot_edges[:block_length]
+            ):
+                constant_weight += num_shifts
+        self._block_cumulative = list(accumulate(weight for _, weight, _, _ in self._blocks))
+        # Draws of the pattern that throws the same throw on every beat are rejected
+        self.empty = sum(weight for _, weight, _, _ in self._blocks) == constant_weight
+
+    @staticmethod
+    def cache_path(
+        period_length: int,
+        num_of_objects: int,
+        partial_pattern: Optional[List[Union[int, None]]] = None,
+        min_throw: int = 2,
+        max_throw: int = 14,
+        exclude_throws: Optional[List[int]] = [1, 3],
+        cache_dir: Optional[Path] = None,
+    ) -> Path:
+        """
+        Return the file the walk counts of a parameter set are cached in.
+
+        Args:
+            period_length: Total length of the pattern.
+            num_of_objects: Number of objects in the pattern.
+            partial_pattern: A list representing the partial pattern.
+            min_throw: Minimum value for a throw.
+            max_throw: Maximum value for a throw.
+            exclude_throws: A list of throws to exclude from the patterns.
+            cache_dir: Directory of the cache; defaults to `cache.get_cache_dir()`.
+
+        Returns:
+            The cache file path.
+        """
+        if partial_pattern is None:
+            partial_pattern = [None] * period_length
+        key = json.dumps(
+            [
+                [None if throw in (None, "_") else throw for throw in partial_pattern],
+                num_of_objects,
+                min_throw,
+                max_throw,
+                sorted(set(exclude_throws or [])),
+            ]
+        )
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        cache_dir = cache_dir if cache_dir is not None else get_cache_dir()
+        return Path(cache_dir) / f"siteswap_sampler_{digest}.json"
+
+    @classmethod
+    def load(
+        cls,
+        period_length: int,
+        num_of_objects: int,
+        partial_pattern: Optional[List[Union[int, None]]] = None,
+        min_throw: int = 2,
+        max_throw: int = 14,
+        exclude_throws: Optional[List[int]] = [1, 3],
+        cache_dir: Optional[Path] = None,
+    ) -> "SiteswapSampler":
+        """
+        Load the sampler of a parameter set from the cache, counting and caching it on a miss.
+
+        Args:
+            period_length: Total length of the pattern.
+            num_of_objects: Number of objects in the pattern.
+            partial_pattern: A list representing the partial pattern.
+            min_throw: Minimum value for a throw.
+            max_throw: Maximum value for a throw.
+            exclude_throws: A list of throws to exclude from the patterns.
+            cache_dir: Directory of the cache; defaults to `cache.get_cache_dir()`.
+
+        Returns:
+            The sampler.
+        """
+        args = (period_length, num_of_objects, partial_pattern, min_throw, max_throw)
+        path = cls.cache_path(*args, exclude_throws, cache_dir)
+        if path.exists():
+            sampler = cls.__new__(cls)
+            sampler._setup(*args, exclude_throws, cache_dir)
+            with open(path) as cache_file:
+                data = json.load(cache_file)
+            if data["pattern"] == sampler.pattern and data["num_states"] == len(
+                sampler.graph.states
+            ):
+                sampler.start_weights = {
+                    int(block_length): {int(start): weight for start, weight in weights.items()}
+                    for block_length, weights in data["start_weights"].items()
+                }
+                sampler._setup_weights()
+                return sampler
+
+        sampler = cls(*args, exclude_throws, cache_dir)
+        sampler.save(path)
+        return sampler
+
+    def save(self, path: Path) -> None:
+        """
+        Write the walk counts to a cache file.
+
+        Args:
+            path: The file to write.
+        """
+        temporary_path = Path(path).with_suffix(".tmp")
+        with open(temporary_path, "w") as cache_file:
+            json.dump(
+                {
+                    "pattern": self.pattern,
+                    "num_states": len(self.graph.states),
+                    "start_weights": self.start_weights,
+                },
+                cache_file,
+            )
+        temporary_path.replace(path)
+
+    def sample(self, rng: Optional[random.Random] = None) -> List[int]:
+        """
+        Draw a pattern uniformly at random among the patterns `generate_siteswaps` returns.
+
+        Args:
+            rng: The random number generator to draw with; defaults to the `random` module.
+
+        Returns:
+            The pattern, in its canonical rotation.
+
+        Raises:
+            ValueError: If no pattern meets the constraints.
+        """
+        if self.empty:
+            raise ValueError("No siteswap meets the constraints.")
+        rng = rng if rng is not None else random
+        period = len(self.pattern)
+        while True:
+            block = bisect_right(self._block_cumulative, rng.randrange(self._block_cumulative[-1]))
+            block_length, _, starts, cumulative = self._blocks[block]
+            start = starts[bisect_right(cumulative, rng.randrange(cumulative[-1]))]
+            sequence = self._walk(start, block_length, rng) * (period // block_length)
+            # generate_siteswaps leaves out the pattern that throws the same throw on every beat
+            if len(set(sequence)) == 1:
+                continue
+            if self.open_pattern or rng.randrange(self._num_completions(sequence)) == 0:
+                return canonical_rotation(sequence)
+
+    def _walk(self, start: int, length: int, rng: random.Random) -> List[int]:
+        """
+        Draw a closed walk from a start state uniformly at random.
+
+        Args:
+            start: The index of the start state.
+            length: The length of the walk.
+            rng: The random number generator to draw with.
+
+        Returns:
+            The throws of the walk.
+        """
+        ways = self._return_ways(start, length)
+        throws = []
+        state = start
+        for step, edges in enumerate(self.slot_edges[:length]):
+            later = ways[step + 1]
+            choice = rng.randrange(ways[step][state])
+            for target, throw in edges[state]:
+                choice -= later.get(target, 0)
+                if choice < 0:
+                    throws.append(throw)
+                    state = target
+                    break
+        return throws
+
+    def _count_return_ways(self, start: int, length: int) -> List[Dict[int, int]]:
+        """
+        Count the ways back to a start state from every state and step of a closed walk.
+
+        Args:
+            start: The index of the start state.
+            length: The length of the walk.
+
+        Returns:
+            For every step of the walk, the number of ways from every state to get back to the
+            start state in the remaining steps, leaving out states without any.
+        """
+        ways = [{start: 1}]
+        for edges in reversed(self.slot_edges[:length]):
+            later = ways[-1]
+            step_ways = {}
+            for state, state_edges in enumerate(edges):
+                count = sum(later.get(target, 0) for target, _ in state_edges)
+                if count:
+                    step_ways[state] = count
+            ways.append(step_ways)
+        ways.reverse()
+        return ways
+
+    def _num_completions(self, sequence: List[int]) -> int:
+        """
+        Count the distinct rotations of a completion that also complete the partial pattern.
+
+        Args:
+            sequence: A completion of the partial pattern.
+
+        Returns:
+            The number of completions in the rotation class of the sequence.
+        """
+        rotations = {tuple(sequence[shift:] + sequence[:shift]) for shift in range(len(sequence))}
+        return sum(
+            1
+            for rotation in rotations
+            if all(throw is None or throw == other for throw, other in zip(self.pattern, rotation))
+        )
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Draw siteswap patterns uniformly at random without generating all of them."
+    )
+
+    parser.add_argument(
+        "--period-length",
+        type=int,
+        required=True,
+        help="Length of the siteswap period.",
+    )
+    parser.add_argument(
+        "--num-objects",
+        type=int,
+        required=True,
+        help="Number of objects in the siteswap.",
+    )
+    parser.add_argument("--min-throw", type=int, default=2, help="Minimum throw value.")
+    parser.add_argument(
+        "--max_throw", type=int, default=14, help="Maximum throw value."
+    )
+    parser.add_argument(
+        "--exclude-throws",
+        type=int,
+        nargs="*",
+        default=[1, 3],
+        help="Throws to exclude.",
+    )
+    parser.add_argument(
+        "--partial-pattern",
+        type=int,
+        nargs="*",
+        default=None,
+        help="Partial pattern (use -1 for placeholders).",
+    )
+    parser.add_argument(
+        "--count", type=int, default=1, help="Number of patterns to draw."
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="Seed of the random number generator."
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    partial_pattern = (
+        [None if x == -1 else x for x in args.partial_pattern]
+        if args.partial_pattern
+        else None
+    )
+    sampler = SiteswapSampler.load(
+        args.period_length,
+        args.num_objects,
+        partial_pattern,
+        args.min_throw,
+        args.max_throw,
+        args.exclude_throws,
+    )
+    rng = random.Random(args.seed)
+    try:
+        for _ in range(args.count):
+            print(" ".join(map(str, sampler.sample(rng))))
+    except ValueError as error:
+        exit(str(error))
+
+
+if __name__ == "__main__":
+    exit(main())
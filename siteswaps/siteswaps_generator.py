@@ -0,0 +1,2387 @@
+import argparse
+import os
+import sys
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, combinations, islice
+from math import gcd
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .pattern_output import FORMATS, default_format, write_pattern_output
+from .tools import canonical_rotation, time_reversal
+
+if TYPE_CHECKING:
+    from .siteswap_catalog import SiteswapCatalog
+
+# Parallel searches split the tree until every worker has this many subtrees to pick from
+PREFIXES_PER_WORKER = 16
+
+
+class PassingConstraints(NamedTuple):
+    """
+    Constraints for passing patterns, in which beat `i` is thrown by juggler `i % num_jugglers`.
+
+    A throw is a pass when it is not a multiple of the number of jugglers, since it then lands in
+    the hands of another juggler; with two jugglers every odd throw is a pass.
+
+    Attributes:
+        num_jugglers: Number of jugglers sharing the pattern.
+        juggler_throws: For every juggler the throws they may make, or None for no restriction.
+        min_passes: Minimum number of passes per period.
+        max_passes: Maximum number of passes per period.
+        num_selfs: Required number of selfs (throws that are not passes) per period.
+    """
+
+    num_jugglers: int = 2
+    juggler_throws: Optional[List[Optional[List[int]]]] = None
+    min_passes: Optional[int] = None
+    max_passes: Optional[int] = None
+    num_selfs: Optional[int] = None
+
+
+class SymmetryGroup(NamedTuple):
+    """
+    The symmetries under which patterns count as the same routine.
+
+    Patterns that are rotations of each other by a multiple of `num_jugglers` beats are always
+    the same: every juggler throws the same throws, only starting at another point. Since the
+    jugglers take turns beat by beat, a rotation by a single beat relabels the jugglers
+    cyclically (with two jugglers it swaps them), so juggler relabeling adds the remaining
+    rotations. Time reversal plays the pattern backwards (see `tools.time_reversal`).
+
+    Attributes:
+        num_jugglers: Number of jugglers sharing the pattern.
+        juggler_relabeling: Patterns that differ by relabeling the jugglers are the same.
+        reversal: Patterns that are time reversals of each other are the same.
+    """
+
+    num_jugglers: int = 1
+    juggler_relabeling: bool = True
+    reversal: bool = False
+
+
+class _StateFilter(NamedTuple):
+    """
+    Filters on the juggling states a pattern passes through, checked while the search runs.
+
+    Attributes:
+        prime_only: Keep only prime patterns, which never repeat a state within a period.
+        ground_only: Keep only patterns that pass through the ground state.
+        excited_only: Keep only patterns that never pass through the ground state.
+    """
+
+    prime_only: bool = False
+    ground_only: bool = False
+    excited_only: bool = False
+
+
+class _StateWalk(NamedTuple):
+    """
+    The fixed part of the state tracking of a search.
+
+    Attributes:
+        state_filter: The state filters to apply.
+        num_balls: The number of balls in the patterns.
+        period: The period of the patterns.
+        runs: For every open slot, the beats from it up to the next open slot, which are
+            walked once a throw is placed in the slot.
+    """
+
+    state_filter: _StateFilter
+    num_balls: int
+    period: int
+    runs: List[range]
+
+
+class SearchStats:
+    """
+    Counters and per-phase timings collected by an instrumented search.
+
+    Attributes:
+        nodes: Open slots the search tried to fill.
+        throws_tried: Throws considered for those slots.
+        necklace_skips: Throws skipped because they would start a non-canonical rotation.
+        pass_prunes: Throws skipped because the pass or self count would become unreachable.
+        include_prunes: Nodes cut and throws skipped to leave room for the required throws.
+        state_prunes: Throws cut because no possible start state passes the state filters.
+        sum_prunes: Throws cut because the remaining slots could not balance the sum.
+        collision_prunes: Throws cut because they land on a taken slot.
+        leaves: Completed fills, which always have distinct landings and the right sum.
+        rejections: Leaves rejected by each final check: "sum" for a fully prefilled pattern with
+            the wrong sum, "include_throws" for a missing required throw, "constant" for a single
+            repeated throw, "prenecklace" for a periodic walk of the necklace search and
+            "rotation" for a rotation of an earlier pattern.
+        patterns: Patterns yielded.
+        timings: Seconds spent in the "setup", "search", "rotation_check" and "canonicalize"
+            phases.
+    """
+
+    def __init__(self):
+        self.nodes = 0
+        self.throws_tried = 0
+        self.necklace_skips = 0
+        self.pass_prunes = 0
+        self.include_prunes = 0
+        self.state_prunes = 0
+        self.sum_prunes = 0
+        self.collision_prunes = 0
+        self.leaves = 0
+        self.rejections = Counter()
+        self.patterns = 0
+        self.timings = dict.fromkeys(
+            ("setup", "search", "rotation_check", "canonicalize"), 0.0
+        )
+
+    @property
+    def dedup_hit_rate(self) -> float:
+        """The share of rotation-class checks that rejected a duplicate."""
+        duplicates = self.rejections["prenecklace"] + self.rejections["rotation"]
+        checked = duplicates + self.patterns
+        return duplicates / checked if checked else 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        """Search throughput, over the time spent walking the tree."""
+        seconds = self.timings["search"] + self.timings["rotation_check"]
+        return self.nodes / seconds if seconds else 0.0
+
+    def as_dict(self) -> Dict[str, object]:
+        """
+        Returns:
+            The counters, rates and timings as plain JSON-serializable values.
+        """
+        return {
+            "nodes": self.nodes,
+            "throws_tried": self.throws_tried,
+            "necklace_skips": self.necklace_skips,
+            "pass_prunes": self.pass_prunes,
+            "include_prunes": self.include_prunes,
+            "state_prunes": self.state_prunes,
+            "sum_prunes": self.sum_prunes,
+            "collision_prunes": self.collision_prunes,
+            "leaves": self.leaves,
+            "rejections": dict(self.rejections),
+            "patterns": self.patterns,
+            "dedup_hit_rate": self.dedup_hit_rate,
+            "nodes_per_second": self.nodes_per_second,
+            "timings": dict(self.timings),
+        }
+
+    def report(self) -> str:
+        """
+        Returns:
+            A human readable multi-line summary of the search.
+        """
+        rows = [
+            ("nodes", self.nodes),
+            ("throws tried", self.throws_tried),
+            ("necklace skips", self.necklace_skips),
+            ("pass prunes", self.pass_prunes),
+            ("include prunes", self.include_prunes),
+            ("state prunes", self.state_prunes),
+            ("sum prunes", self.sum_prunes),
+            ("collision prunes", self.collision_prunes),
+            ("leaves", self.leaves),
+        ]
+        rows += [
+            (f"  rejected {reason}", count)
+            for reason, count in sorted(self.rejections.items())
+        ]
+        rows += [
+            ("patterns", self.patterns),
+            ("dedup hit rate", f"{self.dedup_hit_rate:.1%}"),
+            ("throughput", f"{self.nodes_per_second:,.0f} nodes/s"),
+        ]
+        rows += [
+            (f"{phase} time", f"{seconds:.4f}s")
+            for phase, seconds in self.timings.items()
+        ]
+        lines = [f"{label + ':':28}{value}" for label, value in rows]
+        return "\n".join(lines)
+
+
+def generate_siteswaps(
+    period_length: int,
+    num_of_objects: int,
+    partial_pattern: List[Union[int, None]],
+    min_throw: int = 2,
+    max_throw: int = 14,
+    exclude_throws: Optional[List[int]] = [1, 3],
+    include_throws: Optional[List[int]] = None,
+    workers: Optional[int] = 1,
+    catalog: Optional["SiteswapCatalog"] = None,
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+    prime_only: bool = False,
+    ground_only: bool = False,
+    excited_only: bool = False,
+    top_k: Optional[int] = None,
+    score: Optional[Callable[[Sequence[int]], float]] = None,
+    symmetry: Optional[SymmetryGroup] = None,
+) -> List[List[int]]:
+    """
+    Generate siteswap patterns by completing a given partial pattern.
+
+    With `top_k`, only the `top_k` patterns with the lowest score are returned, from the lowest
+    up, by a best-first search that stops once they are proven to be the best (see
+    `siteswap_ranking.iter_ranked_siteswaps`); `workers` and `catalog` are not used then.
+
+    Args:
+        period_length: Total length of the pattern.
+        num_of_objects: Number of objects in the pattern.
+        partial_pattern: A list representing the partial pattern (e.g., [None, None, 4, None, 6, None]).
+        min_throw: Minimum value for a throw.
+        max_throw: Maximum value for a throw.
+        exclude_throws: A list of throws to exclude from the patterns.
+        include_throws: A list of throws that must appear at least once in every pattern.
+        workers: Number of processes to search with; None uses every CPU.
+        catalog: A catalog to serve the query from when one of its families covers it.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there (e.g. a set or a
+            range), or None for no restriction.
+        prime_only: Only keep prime patterns, which never revisit a juggling state.
+        ground_only: Only keep patterns that pass through the ground state.
+        excited_only: Only keep patterns that never pass through the ground state.
+        top_k: If given, only return this many patterns with the lowest score.
+        score: The score `top_k` ranks by, as a `siteswap_ranking.PatternScore` or a plain
+            function of a pattern; defaults to the maximal throw.
+        symmetry: Return a single pattern of every class of patterns that are the same under
+            these symmetries, instead of one per rotation class (see `iter_siteswaps`).
+
+    Returns:
+        A list of valid completed siteswap patterns.
+    """
+    if top_k is not None:
+        # Imported here since the ranking module builds on this one
+        from .siteswap_ranking import MAX_THROW_SCORE, iter_ranked_siteswaps
+
+        ranked_args = (
+            period_length,
+            num_of_objects,
+            partial_pattern,
+            min_throw,
+            max_throw,
+            exclude_throws,
+            include_throws,
+            score if score is not None else MAX_THROW_SCORE,
+            passing,
+            slot_domains,
+            prime_only,
+            ground_only,
+            excited_only,
+        )
+        if not _reduces_symmetry(symmetry):
+            return list(islice(iter_ranked_siteswaps(*ranked_args, limit=top_k), top_k))
+        validate_symmetry(symmetry, partial_pattern, passing, slot_domains, prime_only)
+        # Branches cannot be cut by the limit, since some of their patterns may be dropped
+        patterns = _iter_symmetry_representatives(iter_ranked_siteswaps(*ranked_args), symmetry)
+        return list(islice(patterns, top_k))
+    return list(
+        iter_siteswaps(
+            period_length,
+            num_of_objects,
+            partial_pattern,
+            min_throw,
+            max_throw,
+            exclude_throws,
+            include_throws,
+            workers,
+            catalog,
+            passing,
+            slot_domains,
+            prime_only,
+            ground_only,
+            excited_only,
+            symmetry,
+        )
+    )
+
+
+def iter_siteswaps(
+    period_length: int,
+    num_of_objects: int,
+    partial_pattern: List[Union[int, None]],
+    min_throw: int = 2,
+    max_throw: int = 14,
+    exclude_throws: Optional[List[int]] = [1, 3],
+    include_throws: Optional[List[int]] = None,
+    workers: Optional[int] = 1,
+    catalog: Optional["SiteswapCatalog"] = None,
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+    prime_only: bool = False,
+    ground_only: bool = False,
+    excited_only: bool = False,
+    symmetry: Optional[SymmetryGroup] = None,
+) -> Iterator[List[int]]:
+    """
+    Lazily generate siteswap patterns by completing a given partial pattern.
+
+    Patterns are yielded in their canonical rotation as soon as the search finds them, in the same
+    order `generate_siteswaps` returns them. The search only produces one member of every rotation
+    class, so no set of seen patterns is kept. The arguments are validated before the first
+    pattern is requested.
+
+    With more than one worker the search tree is split into subtrees by the throws of the first
+    open slots, and the subtrees are searched in a process pool. Results are merged in subtree
+    order, so the output does not depend on the number of workers.
+
+    If a catalog is given and one of its families covers the query, the patterns are read from it
+    instead of searching. Catalogs do not store passing constraints, slot domains or juggling
+    states, so queries with `passing`, `slot_domains` or a state filter are always searched.
+
+    The state filters are class-level: a pattern is prime, ground-state or excited whatever
+    rotation it is written in, so `ground_only` keeps every pattern that passes through the ground
+    state, not only the rotations that start in it.
+
+    With a symmetry group, a single pattern of every class of patterns that are the same under
+    its symmetries is yielded: the largest one under the rotations the group allows. The search
+    yields one pattern per rotation class, and every class is checked on its own as it comes out
+    of the search, so no set of seen patterns is kept. Without juggler relabeling, a rotation
+    class splits into the classes of its rotations by single beats; with time reversal, a class
+    is only kept if it is not smaller than the class of its reversal. Symmetry groups other than
+    the plain rotations need a fully open pattern without slot domains or per-juggler throws,
+    and cannot be combined with `prime_only`, since time reversal does not keep a pattern prime.
+
+    Args:
+        period_length: Total length of the pattern.
+        num_of_objects: Number of objects in the pattern.
+        partial_pattern: A list representing the partial pattern (e.g., [None, None, 4, None, 6, None]).
+        min_throw: Minimum value for a throw.
+        max_throw: Maximum value for a throw.
+        exclude_throws: A list of throws to exclude from the patterns.
+        include_throws: A list of throws that must appear at least once in every pattern.
+        workers: Number of processes to search with; None uses every CPU.
+        catalog: A catalog to serve the query from when one of its families covers it.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there (e.g. a set or a
+            range), or None for no restriction.
+        prime_only: Only keep prime patterns, which never revisit a juggling state.
+        ground_only: Only keep patterns that pass through the ground state.
+        excited_only: Only keep patterns that never pass through the ground state.
+        symmetry: Only yield one pattern of every class of patterns that are the same under
+            these symmetries.
+
+    Returns:
+        An iterator over the valid completed siteswap patterns.
+    """
+    validate_siteswap_arguments(
+        period_length,
+        num_of_objects,
+        partial_pattern,
+        min_throw,
+        max_throw,
+        exclude_throws,
+        include_throws,
+        passing,
+        slot_domains,
+    )
+    if workers is not None and workers <= 0:
+        raise ValueError("Number of workers must be positive.")
+    state_filter = _make_state_filter(prime_only, ground_only, excited_only)
+    patterns = None
+    if (
+        catalog is not None
+        and passing is None
+        and slot_domains is None
+        and state_filter is None
+    ):
+        patterns = catalog.iter_query(
+            period_length,
+            num_of_objects,
+            partial_pattern,
+            min_throw,
+            max_throw,
+            exclude_throws,
+            include_throws,
+        )
+    if patterns is None:
+        patterns = _iter_rotation_classes(
+            partial_pattern,
+            num_of_objects,
+            min_throw,
+            max_throw,
+            exclude_throws,
+            include_throws,
+            workers,
+            passing,
+            slot_domains,
+            state_filter,
+        )
+    if _reduces_symmetry(symmetry):
+        validate_symmetry(symmetry, partial_pattern, passing, slot_domains, prime_only)
+        return _iter_symmetry_representatives(patterns, symmetry)
+    return patterns
+
+
+def _iter_rotation_classes(
+    partial_pattern: List[Union[int, None]],
+    num_of_objects: int,
+    min_throw: int,
+    max_throw: int,
+    exclude_throws: Optional[List[int]],
+    include_throws: Optional[List[int]],
+    workers: Optional[int],
+    passing: Optional[PassingConstraints],
+    slot_domains: Optional[List[Optional[Iterable[int]]]],
+    state_filter: Optional[_StateFilter],
+) -> Iterator[List[int]]:
+    """
+    Start the search of `iter_siteswaps`, serial or in a process pool.
+
+    Args:
+        partial_pattern: A list representing the partial pattern.
+        num_of_objects: Number of objects in the pattern.
+        min_throw: Minimum value for a throw.
+        max_throw: Maximum value for a throw.
+        exclude_throws: A list of throws to exclude from the patterns.
+        include_throws: A list of throws that must appear at least once in every pattern.
+        workers: Number of processes to search with; None uses every CPU.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there, or None for no
+            restriction.
+        state_filter: Filters on the juggling states of the patterns.
+
+    Returns:
+        An iterator over the canonical pattern of every rotation class.
+    """
+
+    # Prepare the pattern by replacing placeholders with None
+    pattern = [None if throw in (None, "_") else throw for throw in partial_pattern]
+
+    generator_indices = [i for i, throw in enumerate(pattern) if throw is None]
+
+    exclude_throws_set = set(exclude_throws or [])
+    include_throws_set = set(include_throws or [])
+    if workers != 1:
+        return _iter_parallel_siteswaps(
+            pattern,
+            num_of_objects,
+            min_throw,
+            max_throw,
+            exclude_throws_set,
+            include_throws_set,
+            generator_indices,
+            workers or os.cpu_count() or 1,
+            passing,
+            slot_domains,
+            state_filter,
+        )
+    return map(
+        canonical_rotation,
+        iter_filled_patterns(
+            pattern,
+            num_of_objects,
+            min_throw,
+            max_throw,
+            exclude_throws_set,
+            include_throws_set,
+            generator_indices,
+            canonical_only=True,
+            passing=passing,
+            slot_domains=slot_domains,
+            state_filter=state_filter,
+        ),
+    )
+
+
+def generate_siteswaps_with_stats(
+    period_length: int,
+    num_of_objects: int,
+    partial_pattern: List[Union[int, None]],
+    min_throw: int = 2,
+    max_throw: int = 14,
+    exclude_throws: Optional[List[int]] = [1, 3],
+    include_throws: Optional[List[int]] = None,
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+    prime_only: bool = False,
+    ground_only: bool = False,
+    excited_only: bool = False,
+) -> Tuple[List[List[int]], SearchStats]:
+    """
+    Generate siteswap patterns like `generate_siteswaps`, and report how the search went.
+
+    Args:
+        period_length: Total length of the pattern.
+        num_of_objects: Number of objects in the pattern.
+        partial_pattern: A list representing the partial pattern (e.g., [None, None, 4, None, 6, None]).
+        min_throw: Minimum value for a throw.
+        max_throw: Maximum value for a throw.
+        exclude_throws: A list of throws to exclude from the patterns.
+        include_throws: A list of throws that must appear at least once in every pattern.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there (e.g. a set or a
+            range), or None for no restriction.
+        prime_only: Only keep prime patterns, which never revisit a juggling state.
+        ground_only: Only keep patterns that pass through the ground state.
+        excited_only: Only keep patterns that never pass through the ground state.
+
+    Returns:
+        The valid completed siteswap patterns and the statistics of the search.
+    """
+    patterns, stats = iter_siteswaps_with_stats(
+        period_length,
+        num_of_objects,
+        partial_pattern,
+        min_throw,
+        max_throw,
+        exclude_throws,
+        include_throws,
+        passing,
+        slot_domains,
+        prime_only,
+        ground_only,
+        excited_only,
+    )
+    return list(patterns), stats
+
+
+def iter_siteswaps_with_stats(
+    period_length: int,
+    num_of_objects: int,
+    partial_pattern: List[Union[int, None]],
+    min_throw: int = 2,
+    max_throw: int = 14,
+    exclude_throws: Optional[List[int]] = [1, 3],
+    include_throws: Optional[List[int]] = None,
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+    prime_only: bool = False,
+    ground_only: bool = False,
+    excited_only: bool = False,
+) -> Tuple[Iterator[List[int]], SearchStats]:
+    """
+    Lazily generate siteswap patterns like `iter_siteswaps`, counting the work of the search.
+
+    The search runs serially through the same search loop as `iter_siteswaps`, with its counters
+    switched on; with the counters off the loop only pays for a check per throw. The statistics
+    are updated as the patterns are consumed, and time spent by the consumer between patterns is
+    not counted.
+
+    Args:
+        period_length: Total length of the pattern.
+        num_of_objects: Number of objects in the pattern.
+        partial_pattern: A list representing the partial pattern (e.g., [None, None, 4, None, 6, None]).
+        min_throw: Minimum value for a throw.
+        max_throw: Maximum value for a throw.
+        exclude_throws: A list of throws to exclude from the patterns.
+        include_throws: A list of throws that must appear at least once in every pattern.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there (e.g. a set or a
+            range), or None for no restriction.
+        prime_only: Only keep prime patterns, which never revisit a juggling state.
+        ground_only: Only keep patterns that pass through the ground state.
+        excited_only: Only keep patterns that never pass through the ground state.
+
+    Returns:
+        An iterator over the valid completed siteswap patterns, and the statistics it fills in.
+    """
+    validate_siteswap_arguments(
+        period_length,
+        num_of_objects,
+        partial_pattern,
+        min_throw,
+        max_throw,
+        exclude_throws,
+        include_throws,
+        passing,
+        slot_domains,
+    )
+    pattern = [None if throw in (None, "_") else throw for throw in partial_pattern]
+    generator_indices = [i for i, throw in enumerate(pattern) if throw is None]
+    state_filter = _make_state_filter(prime_only, ground_only, excited_only)
+    stats = SearchStats()
+    filled_patterns = iter_filled_patterns(
+        pattern,
+        num_of_objects,
+        min_throw,
+        max_throw,
+        set(exclude_throws or []),
+        set(include_throws or []),
+        generator_indices,
+        canonical_only=True,
+        passing=passing,
+        slot_domains=slot_domains,
+        state_filter=state_filter,
+        stats=stats,
+    )
+    return _iter_timed_patterns(filled_patterns, stats), stats
+
+
+def _iter_timed_patterns(
+    filled_patterns: Iterator[List[int]], stats: SearchStats
+) -> Iterator[List[int]]:
+    """
+    Canonicalize the patterns of an instrumented search, timing the search and canonicalization.
+
+    Args:
+        filled_patterns: The patterns of an `iter_filled_patterns` search run with `stats`.
+        stats: The statistics of that search.
+
+    Returns:
+        An iterator over the canonical patterns.
+    """
+    timings = stats.timings
+    while True:
+        start = perf_counter()
+        rotation_check = timings["rotation_check"]
+        filled_pattern = next(filled_patterns, None)
+        searched = perf_counter()
+        timings["search"] += searched - start - (timings["rotation_check"] - rotation_check)
+        if filled_pattern is None:
+            return
+        canonical_pattern = canonical_rotation(filled_pattern)
+        timings["canonicalize"] += perf_counter() - searched
+        stats.patterns += 1
+        yield canonical_pattern
+
+
+def validate_siteswap_arguments(
+    period_length: int,
+    num_of_objects: int,
+    partial_pattern: List[Union[int, None]],
+    min_throw: int,
+    max_throw: int,
+    exclude_throws: Optional[List[int]],
+    include_throws: Optional[List[int]],
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+) -> None:
+    """
+    Check the arguments of a siteswap query, as taken by `generate_siteswaps`.
+
+    Args:
+        period_length: Total length of the pattern.
+        num_of_objects: Number of objects in the pattern.
+        partial_pattern: A list representing the partial pattern (e.g., [None, None, 4, None, 6, None]).
+        min_throw: Minimum value for a throw.
+        max_throw: Maximum value for a throw.
+        exclude_throws: A list of throws to exclude from the patterns.
+        include_throws: A list of throws that must appear at least once in every pattern.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there (e.g. a set or a
+            range), or None for no restriction.
+
+    Raises:
+        ValueError: If the arguments do not describe a valid query.
+    """
+    if period_length <= 0:
+        raise ValueError("Period length must be a positive even number.")
+    if num_of_objects <= 0:
+        raise ValueError("Number of objects must be positive.")
+    if len(partial_pattern) != period_length:
+        raise ValueError("Partial pattern length must match the period length.")
+    if exclude_throws and include_throws and set(exclude_throws) & set(include_throws):
+        raise ValueError("A throw cannot be both excluded and included.")
+    if not all(
+        (throw is None or (min_throw <= throw <= max_throw))
+        for throw in partial_pattern
+    ):
+        raise ValueError(
+            f"Throws in the partial pattern must be between {min_throw} and {max_throw}, or None."
+        )
+    if passing is not None:
+        validate_passing_constraints(period_length, partial_pattern, passing)
+    if slot_domains is not None:
+        if len(slot_domains) != period_length:
+            raise ValueError("Slot domains must be given for every index of the pattern.")
+        for i, (throw, throws) in enumerate(zip(partial_pattern, slot_domains)):
+            if throw not in (None, "_") and throws is not None and throw not in throws:
+                raise ValueError(f"Throw {throw} at index {i} is outside its slot domain.")
+
+
+def validate_passing_constraints(
+    period_length: int,
+    partial_pattern: List[Union[int, None]],
+    passing: PassingConstraints,
+) -> None:
+    """
+    Check passing constraints against the period and the partial pattern of a query.
+
+    Args:
+        period_length: Total length of the pattern.
+        partial_pattern: A list representing the partial pattern (e.g., [None, None, 4, None, 6, None]).
+        passing: Passing constraints the patterns must meet.
+
+    Raises:
+        ValueError: If the constraints do not fit the query.
+    """
+    num_jugglers = passing.num_jugglers
+    if num_jugglers <= 0:
+        raise ValueError("Number of jugglers must be positive.")
+    if period_length % num_jugglers:
+        raise ValueError("Period length must be a multiple of the number of jugglers.")
+    if passing.juggler_throws is not None:
+        if len(passing.juggler_throws) != num_jugglers:
+            raise ValueError("Juggler throws must be given for every juggler.")
+        for i, throw in enumerate(partial_pattern):
+            throws = passing.juggler_throws[i % num_jugglers]
+            if throw not in (None, "_") and throws is not None and throw not in throws:
+                raise ValueError(
+                    f"Throw {throw} at index {i} is not allowed for juggler {i % num_jugglers}."
+                )
+    for name in ("min_passes", "max_passes", "num_selfs"):
+        value = getattr(passing, name)
+        if value is not None and not 0 <= value <= period_length:
+            raise ValueError(f"{name} must be between 0 and the period length.")
+
+
+def split_siteswap_search(
+    period_length: int,
+    num_of_objects: int,
+    partial_pattern: List[Union[int, None]],
+    min_throw: int = 2,
+    max_throw: int = 14,
+    exclude_throws: Optional[List[int]] = [1, 3],
+    include_throws: Optional[List[int]] = None,
+    num_subtrees: int = 1,
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+    prime_only: bool = False,
+    ground_only: bool = False,
+    excited_only: bool = False,
+) -> List[Callable[[], List[List[int]]]]:
+    """
+    Split a `generate_siteswaps` query into independent subtree searches.
+
+    Each task is a picklable callable returning the canonical patterns of its subtree, so it can be
+    submitted to a process pool. Concatenating the results of the tasks in order gives the result
+    of `generate_siteswaps`.
+
+    Args:
+        period_length: Total length of the pattern.
+        num_of_objects: Number of objects in the pattern.
+        partial_pattern: A list representing the partial pattern (e.g., [None, None, 4, None, 6, None]).
+        min_throw: Minimum value for a throw.
+        max_throw: Maximum value for a throw.
+        exclude_throws: A list of throws to exclude from the patterns.
+        include_throws: A list of throws that must appear at least once in every pattern.
+        num_subtrees: The search is split until there are at least this many subtrees, when the
+            partial pattern has enough open slots.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there (e.g. a set or a
+            range), or None for no restriction.
+        prime_only: Only keep prime patterns, which never revisit a juggling state.
+        ground_only: Only keep patterns that pass through the ground state.
+        excited_only: Only keep patterns that never pass through the ground state.
+
+    Returns:
+        The subtree search tasks, in search order.
+    """
+    validate_siteswap_arguments(
+        period_length,
+        num_of_objects,
+        partial_pattern,
+        min_throw,
+        max_throw,
+        exclude_throws,
+        include_throws,
+        passing,
+        slot_domains,
+    )
+    pattern = [None if throw in (None, "_") else throw for throw in partial_pattern]
+    generator_indices = [i for i, throw in enumerate(pattern) if throw is None]
+    return _split_search(
+        pattern,
+        num_of_objects,
+        min_throw,
+        max_throw,
+        set(exclude_throws or []),
+        set(include_throws or []),
+        generator_indices,
+        num_subtrees,
+        passing,
+        slot_domains,
+        _make_state_filter(prime_only, ground_only, excited_only),
+    )
+
+
+def _split_search(
+    pattern: List[int | None],
+    num_of_objects: int,
+    min_throw: int,
+    max_throw: int,
+    exclude_throws: set,
+    include_throws: set,
+    generator_indices: List[int],
+    num_subtrees: int,
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+    state_filter: Optional[_StateFilter] = None,
+) -> List[Callable[[], List[List[int]]]]:
+    """
+    Split the canonical search into the subtrees of its search prefixes.
+
+    The prefix depth is increased until there are at least `num_subtrees` prefixes.
+
+    Args:
+        pattern: The partial pattern, with None for the open slots.
+        num_of_objects: The number of objects to balance in the pattern.
+        min_throw: Minimum throw value.
+        max_throw: Maximum throw value.
+        exclude_throws: A set of throws to exclude from the patterns.
+        include_throws: A set of throws that must appear at least once in every pattern.
+        generator_indices: Indices in the pattern that are filled by the generator.
+        num_subtrees: The number of subtrees to aim for.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there, or None for no
+            restriction.
+        state_filter: Filters on the juggling states of the patterns.
+
+    Returns:
+        The subtree search tasks, in search order.
+    """
+    prefixes = [()]
+    for depth in range(1, len(generator_indices)):
+        if len(prefixes) >= num_subtrees:
+            break
+        prefixes = list(
+            iter_search_prefixes(
+                pattern,
+                num_of_objects,
+                min_throw,
+                max_throw,
+                exclude_throws,
+                depth,
+                canonical_only=True,
+                passing=passing,
+                slot_domains=slot_domains,
+                state_filter=state_filter,
+                include_throws=include_throws,
+                generator_indices=generator_indices,
+            )
+        )
+    return [
+        partial(
+            _search_prefix,
+            pattern,
+            num_of_objects,
+            min_throw,
+            max_throw,
+            exclude_throws,
+            include_throws,
+            generator_indices,
+            prefix,
+            passing,
+            slot_domains,
+            state_filter,
+        )
+        for prefix in prefixes
+    ]
+
+
+def _iter_parallel_siteswaps(
+    pattern: List[int | None],
+    num_of_objects: int,
+    min_throw: int,
+    max_throw: int,
+    exclude_throws: set,
+    include_throws: set,
+    generator_indices: List[int],
+    workers: int,
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+    state_filter: Optional[_StateFilter] = None,
+) -> Iterator[List[int]]:
+    """
+    Search the subtrees of every search prefix in a process pool and yield their results in order.
+
+    The search is split into `PREFIXES_PER_WORKER` subtrees per worker, so a few heavy subtrees
+    cannot keep the other workers idle: the pool hands the next subtree to whichever worker
+    finishes first.
+
+    Args:
+        pattern: The partial pattern, with None for the open slots.
+        num_of_objects: The number of objects to balance in the pattern.
+        min_throw: Minimum throw value.
+        max_throw: Maximum throw value.
+        exclude_throws: A set of throws to exclude from the patterns.
+        include_throws: A set of throws that must appear at least once in every pattern.
+        generator_indices: Indices in the pattern that are filled by the generator.
+        workers: Number of processes to search with.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there, or None for no
+            restriction.
+        state_filter: Filters on the juggling states of the patterns.
+
+    Returns:
+        An iterator over the canonical patterns, in the same order as the serial search.
+    """
+    tasks = _split_search(
+        pattern,
+        num_of_objects,
+        min_throw,
+        max_throw,
+        exclude_throws,
+        include_throws,
+        generator_indices,
+        workers * PREFIXES_PER_WORKER,
+        passing,
+        slot_domains,
+        state_filter,
+    )
+    if len(tasks) <= 1:
+        for task in tasks:
+            yield from task()
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [executor.submit(task) for task in tasks]
+        for future in futures:
+            yield from future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _search_prefix(
+    pattern: List[int | None],
+    num_of_objects: int,
+    min_throw: int,
+    max_throw: int,
+    exclude_throws: set,
+    include_throws: set,
+    generator_indices: List[int],
+    prefix: Tuple[int, ...],
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+    state_filter: Optional[_StateFilter] = None,
+) -> List[List[int]]:
+    """
+    Search the subtree below a single prefix; this is the unit of work of the process pool.
+
+    Args:
+        pattern: The partial pattern, with None for the open slots.
+        num_of_objects: The number of objects to balance in the pattern.
+        min_throw: Minimum throw value.
+        max_throw: Maximum throw value.
+        exclude_throws: A set of throws to exclude from the patterns.
+        include_throws: A set of throws that must appear at least once in every pattern.
+        generator_indices: Indices in the pattern that are filled by the generator.
+        prefix: Throws for the first open slots.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there, or None for no
+            restriction.
+        state_filter: Filters on the juggling states of the patterns.
+
+    Returns:
+        The canonical patterns found below the prefix, in search order.
+    """
+    return [
+        canonical_rotation(filled_pattern)
+        for filled_pattern in iter_filled_patterns(
+            pattern,
+            num_of_objects,
+            min_throw,
+            max_throw,
+            exclude_throws,
+            include_throws,
+            generator_indices,
+            canonical_only=True,
+            prefix=prefix,
+            passing=passing,
+            slot_domains=slot_domains,
+            state_filter=state_filter,
+        )
+    ]
+
+
+def deduplicate_patterns(patterns: List[List[int]]) -> List[List[int]]:
+    """
+    Remove duplicate patterns by considering rotations as identical and keeping the canonical rotation.
+
+    Args:
+        patterns: A list of generated siteswap patterns.
+
+    Returns:
+        A deduplicated list of patterns.
+    """
+    return list(iter_unique_patterns(patterns))
+
+
+def iter_unique_patterns(patterns: Iterator[List[int]]) -> Iterator[List[int]]:
+    """
+    Lazily yield the canonical rotation of every pattern whose rotation class was not seen yet.
+
+    Args:
+        patterns: An iterable of siteswap patterns.
+
+    Returns:
+        An iterator over the deduplicated canonical patterns.
+    """
+    unique_patterns = set()
+
+    for pattern in patterns:
+        # Keep the rotation that starts with the largest number
+        canonical_pattern = canonical_rotation(pattern)
+        if tuple(canonical_pattern) not in unique_patterns:
+            unique_patterns.add(tuple(canonical_pattern))
+            yield canonical_pattern
+
+
+def validate_symmetry(
+    symmetry: SymmetryGroup,
+    partial_pattern: List[Union[int, None]],
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+    prime_only: bool = False,
+) -> None:
+    """
+    Check that a query is closed under the symmetries of a group, so its classes are well defined.
+
+    Args:
+        symmetry: The symmetry group.
+        partial_pattern: A list representing the partial pattern.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there, or None for no
+            restriction.
+        prime_only: Whether only prime patterns are kept.
+
+    Raises:
+        ValueError: If the query is not closed under the symmetries.
+    """
+    if symmetry.num_jugglers <= 0:
+        raise ValueError("Number of jugglers must be positive.")
+    if passing is not None and passing.num_jugglers != symmetry.num_jugglers:
+        raise ValueError("The symmetry group and the passing constraints need the same jugglers.")
+    if any(throw not in (None, "_") for throw in partial_pattern) or slot_domains is not None:
+        raise ValueError("Symmetry reduction needs a fully open pattern without slot domains.")
+    if passing is not None and passing.juggler_throws is not None:
+        raise ValueError("Symmetry reduction does not support per-juggler throws.")
+    if symmetry.reversal and prime_only:
+        raise ValueError("Time reversal does not keep patterns prime.")
+
+
+def _reduces_symmetry(symmetry: Optional[SymmetryGroup]) -> bool:
+    """Whether a symmetry group differs from the plain rotations every search reduces by."""
+    return symmetry is not None and (
+        symmetry.reversal or (not symmetry.juggler_relabeling and symmetry.num_jugglers != 1)
+    )
+
+
+def _iter_symmetry_representatives(
+    patterns: Iterable[List[int]], symmetry: SymmetryGroup
+) -> Iterator[List[int]]:
+    """
+    Turn the canonical patterns of rotation classes into one pattern per class of a symmetry group.
+
+    Args:
+        patterns: One pattern of every rotation class, each class once.
+        symmetry: The symmetry group.
+
+    Returns:
+        An iterator over the largest pattern of every class, under the rotations of the group.
+    """
+    for pattern in patterns:
+        step = 1 if symmetry.juggler_relabeling else gcd(symmetry.num_jugglers, len(pattern))
+        representatives = []
+        for shift in range(step):
+            representative = _largest_rotation(pattern[shift:] + pattern[:shift], step)
+            if representative in representatives:
+                continue  # The pattern repeats after fewer beats than the jugglers take
+            representatives.append(representative)
+            if not symmetry.reversal or representative >= _largest_rotation(
+                time_reversal(representative), step
+            ):
+                yield representative
+
+
+def _largest_rotation(pattern: List[int], step: int) -> List[int]:
+    """
+    Find the lexicographically largest rotation of a pattern by a multiple of `step` beats.
+
+    Args:
+        pattern: The pattern to rotate.
+        step: The beats every rotation moves by; must divide the period.
+
+    Returns:
+        The largest rotation.
+    """
+    if step == 1:
+        return canonical_rotation(pattern)
+    return max(pattern[shift:] + pattern[:shift] for shift in range(0, len(pattern), step))
+
+
+def fill_pattern(
+    pattern: List[int | None],
+    index: int,
+    valid_patterns: List[List[int]],
+    num_of_objects: int,
+    min_throw: int,
+    max_throw: int,
+    exclude_throws: set,
+    include_throws: set,
+    generator_indices: List[int],
+) -> None:
+    """
+    Generate all valid siteswap patterns by filling in the missing throws from `index` onwards.
+
+    Args:
+        pattern: The current state of the pattern being generated.
+        index: The current index being processed.
+        valid_patterns: A list to collect valid patterns.
+        num_of_objects: The number of objects to balance in the pattern.
+        min_throw: Minimum throw value.
+        max_throw: Maximum throw value.
+        exclude_throws: A set of throws to exclude from the patterns.
+        include_throws: A set of throws that must appear at least once in every pattern.
+        generator_indices: Indices in the pattern that are filled by the generator.
+    """
+    valid_patterns.extend(
+        iter_filled_patterns(
+            pattern,
+            num_of_objects,
+            min_throw,
+            max_throw,
+            exclude_throws,
+            include_throws,
+            generator_indices,
+            index,
+        )
+    )
+
+
+def iter_filled_patterns(
+    pattern: List[int | None],
+    num_of_objects: int,
+    min_throw: int,
+    max_throw: int,
+    exclude_throws: set,
+    include_throws: set,
+    generator_indices: List[int],
+    index: int = 0,
+    canonical_only: bool = False,
+    prefix: Sequence[int] = (),
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+    state_filter: Optional[_StateFilter] = None,
+    stats: Optional[SearchStats] = None,
+) -> Iterator[List[int]]:
+    """
+    Lazily yield every valid siteswap pattern obtained by filling in the missing throws.
+
+    Landing slots `(index + throw) % period` are marked as throws are placed, and the remaining
+    sum budget `num_of_objects * period - sum(placed throws)` is tracked, so a branch is cut as
+    soon as a throw collides or the remaining open slots can no longer reach the target sum.
+    Passing constraints are tracked the same way, by the number of passes still allowed and
+    still needed, and so are the required throws that have not been placed yet: a branch is cut
+    once the remaining open slots cannot hold all of them. With a state filter, every juggling
+    state the pattern may start in is walked along with the throws, and a branch is cut once none
+    of them passes the filter.
+
+    With `canonical_only`, only the first pattern of every rotation class is yielded. When no slot
+    is prefilled or restricted the search only walks necklaces (patterns that are their own
+    smallest rotation); otherwise every hit is checked against the rotations that also fit the
+    partial pattern and the slot restrictions.
+
+    Args:
+        pattern: The partial pattern, with None for the open slots.
+        num_of_objects: The number of objects to balance in the pattern.
+        min_throw: Minimum throw value.
+        max_throw: Maximum throw value.
+        exclude_throws: A set of throws to exclude from the patterns.
+        include_throws: A set of throws that must appear at least once in every pattern.
+        generator_indices: Indices in the pattern that are filled by the generator.
+        index: Open slots before this index are left untouched.
+        canonical_only: Skip patterns that are rotations of an earlier yielded pattern.
+        prefix: Throws for the first open slots, as returned by `iter_search_prefixes`; only the
+            subtree below them is searched.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there, or None for no
+            restriction.
+        state_filter: Filters on the juggling states of the patterns.
+        stats: If given, run the instrumented search and count its work into these statistics.
+
+    Returns:
+        An iterator over copies of the valid completed patterns, in lexicographic order.
+    """
+    start = perf_counter() if stats is not None else 0.0
+    slot_domains = _merge_slot_domains(len(pattern), slot_domains, passing)
+    search = _start_search(
+        pattern,
+        num_of_objects,
+        min_throw,
+        max_throw,
+        exclude_throws,
+        include_throws,
+        generator_indices,
+        index,
+        prefix,
+        passing,
+        slot_domains,
+        state_filter,
+    )
+    if stats is not None:
+        stats.timings["setup"] += perf_counter() - start
+    if search is None:
+        return
+    filled_pattern, open_indices, *search_state = search
+    walk_necklaces = (
+        canonical_only and len(open_indices) == len(pattern) and slot_domains is None
+    )
+    search_args = (
+        filled_pattern,
+        len(prefix),
+        open_indices,
+        *search_state,
+        include_throws,
+        generator_indices,
+        _lyndon_length(prefix) if walk_necklaces else None,
+    )
+    filled_patterns = _fill_open_slots(*search_args, stats=stats)
+    if canonical_only and not walk_necklaces:
+        shifts = _matching_shifts(pattern)
+        if stats is not None:
+            filled_patterns = _iter_first_rotations_counted(
+                filled_patterns,
+                pattern,
+                shifts,
+                include_throws,
+                generator_indices,
+                slot_domains,
+                stats,
+            )
+        else:
+            filled_patterns = (
+                filled_pattern
+                for filled_pattern in filled_patterns
+                if _is_first_rotation(
+                    filled_pattern,
+                    pattern,
+                    shifts,
+                    include_throws,
+                    generator_indices,
+                    slot_domains,
+                )
+            )
+    yield from filled_patterns
+
+
+def iter_search_prefixes(
+    pattern: List[int | None],
+    num_of_objects: int,
+    min_throw: int,
+    max_throw: int,
+    exclude_throws: set,
+    depth: int,
+    canonical_only: bool = False,
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[Optional[Iterable[int]]]] = None,
+    state_filter: Optional[_StateFilter] = None,
+    include_throws: set = frozenset(),
+    generator_indices: Sequence[int] = (),
+    prefix: Sequence[int] = (),
+) -> Iterator[Tuple[int, ...]]:
+    """
+    Lazily yield the throws of the first `depth` open slots for every branch the search keeps.
+
+    Every subtree of `iter_filled_patterns` is rooted at exactly one of these prefixes, and they are
+    yielded in the order the search visits them, so they can be searched independently and their
+    results concatenated.
+
+    Args:
+        pattern: The partial pattern, with None for the open slots.
+        num_of_objects: The number of objects to balance in the pattern.
+        min_throw: Minimum throw value.
+        max_throw: Maximum throw value.
+        exclude_throws: A set of throws to exclude from the patterns.
+        depth: Number of open slots in every prefix; must be smaller than the number of open slots.
+        canonical_only: Only yield prefixes the canonical search would expand.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: For every index of the pattern the throws allowed there, or None for no
+            restriction.
+        state_filter: Filters on the juggling states of the patterns.
+        include_throws: A set of throws that must appear at least once in every pattern; prefixes
+            that leave too little room for them are skipped.
+        generator_indices: Indices in the pattern that are filled by the generator.
+        prefix: Throws for the first open slots; only the prefixes extending it are yielded.
+
+    Returns:
+        An iterator over the prefixes, as tuples of throws.
+    """
+    slot_domains = _merge_slot_domains(len(pattern), slot_domains, passing)
+    search = _start_search(
+        pattern,
+        num_of_objects,
+        min_throw,
+        max_throw,
+        exclude_throws,
+        include_throws,
+        generator_indices,
+        0,
+        prefix,
+        passing,
+        slot_domains,
+        state_filter,
+    )
+    if search is None:
+        return
+    filled_pattern, open_indices, *search_state = search
+    walk_necklaces = (
+        canonical_only and len(open_indices) == len(pattern) and slot_domains is None
+    )
+    for partial_fill in _fill_open_slots(
+        filled_pattern,
+        len(prefix),
+        open_indices,
+        *search_state,
+        set(),
+        [],
+        _lyndon_length(prefix) if walk_necklaces else None,
+        depth,
+    ):
+        yield tuple(partial_fill[i] for i in open_indices[:depth])
+
+
+def _make_state_filter(
+    prime_only: bool, ground_only: bool, excited_only: bool
+) -> Optional[_StateFilter]:
+    """
+    Build the state filter of a query.
+
+    Args:
+        prime_only: Only keep prime patterns.
+        ground_only: Only keep patterns that pass through the ground state.
+        excited_only: Only keep patterns that never pass through the ground state.
+
+    Returns:
+        The state filter, or None if no filter is set.
+
+    Raises:
+        ValueError: If both `ground_only` and `excited_only` are set.
+    """
+    if ground_only and excited_only:
+        raise ValueError("A pattern cannot be both ground-state and excited.")
+    if not (prime_only or ground_only or excited_only):
+        return None
+    return _StateFilter(prime_only, ground_only, excited_only)
+
+
+def _merge_slot_domains(
+    period: int,
+    slot_domains: Optional[List[Optional[Iterable[int]]]],
+    passing: Optional[PassingConstraints],
+) -> List[set | None] | None:
+    """
+    Collect the throws allowed at every index of the pattern by the slot domains and the jugglers.
+
+    Args:
+        period: The period of the pattern.
+        slot_domains: For every index of the pattern the throws allowed there, or None for no
+            restriction.
+        passing: Passing constraints the patterns must meet.
+
+    Returns:
+        The set of allowed throws for every index, with None for an unrestricted index, or None
+        if no index is restricted.
+    """
+    domains = [None] * period
+    if slot_domains is not None:
+        domains = [None if throws is None else set(throws) for throws in slot_domains]
+    if passing is not None and passing.juggler_throws is not None:
+        for i in range(period):
+            throws = passing.juggler_throws[i % passing.num_jugglers]
+            if throws is not None:
+                domains[i] = set(throws) if domains[i] is None else domains[i] & set(throws)
+    if all(throws is None for throws in domains):
+        return None
+    return domains
+
+
+def _start_search(
+    pattern: List[int | None],
+    num_of_objects: int,
+    min_throw: int,
+    max_throw: int,
+    exclude_throws: set,
+    include_throws: set,
+    generator_indices: Sequence[int],
+    index: int,
+    prefix: Sequence[int],
+    passing: Optional[PassingConstraints] = None,
+    slot_domains: Optional[List[set | None]] = None,
+    state_filter: Optional[_StateFilter] = None,
+) -> Tuple | None:
+    """
+    Place the prefilled throws and the prefix, and set up the bookkeeping of the search.
+
+    Args:
+        pattern: The partial pattern, with None for the open slots.
+        num_of_objects: The number of objects to balance in the pattern.
+        min_throw: Minimum throw value.
+        max_throw: Maximum throw value.
+        exclude_throws: A set of throws to exclude from the patterns.
+        include_throws: A set of throws that must appear at least once in every pattern.
+        generator_indices: Indices in the pattern that are filled by the generator.
+        index: Open slots before this index are left untouched.
+        prefix: Throws for the first open slots.
+        passing: Passing constraints the patterns must meet.
+        slot_domains: The throws allowed at every index, as returned by `_merge_slot_domains`.
+        state_filter: Filters on the juggling states of the patterns.
+
+    Returns:
+        The pattern being filled, the open indices, the allowed throws of every open slot, the
+        lowest and highest sums the open slots after every slot can contribute, the throws the
+        open slots from every slot on can take, the taken landing slots, the remaining sum budget,
+        the number of jugglers, the number of passes still allowed and still needed, the
+        required throws not placed yet, and the state walk with its candidate states, in the
+        argument order of `_fill_open_slots`; or None if the placed throws already collide or the
+        constraints cannot be met.
+    """
+    pattern = pattern[:]
+    period = len(pattern)
+    open_indices = [i for i in range(index, period) if pattern[i] is None]
+    for i, throw in zip(open_indices, prefix):
+        pattern[i] = throw
+
+    num_jugglers = passing.num_jugglers if passing else 1
+    min_passes, max_passes = _pass_bounds(period, passing)
+    landed = [False] * period
+    remaining_sum = num_of_objects * period
+    for i, throw in enumerate(pattern):
+        if throw is None:
+            continue
+        position = (i + throw) % period
+        if landed[position]:  # Collision between prefilled throws
+            return None
+        landed[position] = True
+        remaining_sum -= throw
+        if throw % num_jugglers:
+            min_passes -= 1
+            max_passes -= 1
+
+    num_open = len(open_indices) - len(prefix)
+    if max_passes < 0 or min_passes > min(num_open, max_passes):
+        return None
+
+    throws = [
+        throw for throw in range(min_throw, max_throw + 1) if throw not in exclude_throws
+    ]
+    slot_throws = [
+        (
+            throws
+            if slot_domains is None or slot_domains[i] is None
+            else [throw for throw in throws if throw in slot_domains[i]]
+        )
+        for i in open_indices
+    ]
+    if not all(slot_throws[len(prefix) :]):
+        return None
+
+    # Bounds on the sum the open slots after every slot can still contribute, and the throws
+    # the open slots from every slot on can still take
+    lowest_sums = [0] * len(open_indices)
+    highest_sums = [0] * len(open_indices)
+    reachable_throws = [set() for _ in open_indices]
+    for slot in range(len(open_indices) - 1, len(prefix) - 1, -1):
+        if slot + 1 < len(open_indices):
+            lowest_sums[slot] = lowest_sums[slot + 1] + slot_throws[slot + 1][0]
+            highest_sums[slot] = highest_sums[slot + 1] + slot_throws[slot + 1][-1]
+            reachable_throws[slot].update(reachable_throws[slot + 1])
+        reachable_throws[slot].update(slot_throws[slot])
+
+    missing_throws = set(include_throws) - {pattern[i] for i in generator_indices}
+    if missing_throws and (
+        len(missing_throws) > num_open
+        or not missing_throws <= reachable_throws[len(prefix)]
+    ):
+        return None
+
+    state_walk = candidates = None
+    if state_filter is not None:
+        next_open = open_indices[1:] + [period]
+        state_walk = _StateWalk(
+            state_filter,
+            num_of_objects,
+            period,
+            [range(i, next_i) for i, next_i in zip(open_indices, next_open)],
+        )
+        first_open = (
+            open_indices[len(prefix)] if len(prefix) < len(open_indices) else period
+        )
+        candidates = _advance_candidates(
+            _start_candidates(state_walk, max_throw), pattern, range(first_open), state_walk
+        )
+        if not candidates:
+            return None
+    return (
+        pattern,
+        open_indices,
+        slot_throws,
+        lowest_sums,
+        highest_sums,
+        reachable_throws,
+        landed,
+        remaining_sum,
+        num_jugglers,
+        max_passes,
+        min_passes,
+        missing_throws,
+        state_walk,
+        candidates,
+    )
+
+
+def _pass_bounds(
+    period: int, passing: Optional[PassingConstraints]
+) -> Tuple[int, int]:
+    """
+    Combine the pass and self counts of passing constraints into bounds on the number of passes.
+
+    Args:
+        period: The period of the pattern.
+        passing: Passing constraints the patterns must meet.
+
+    Returns:
+        The minimum and maximum number of passes per period.
+    """
+    min_passes, max_passes = 0, period
+    if passing is None:
+        return min_passes, max_passes
+    if passing.min_passes is not None:
+        min_passes = max(min_passes, passing.min_passes)
+    if passing.max_passes is not None:
+        max_passes = min(max_passes, passing.max_passes)
+    if passing.num_selfs is not None:
+        min_passes = max(min_passes, period - passing.num_selfs)
+        max_passes = min(max_passes, period - passing.num_selfs)
+    return min_passes, max_passes
+
+
+def _start_candidates(state_walk: _StateWalk, max_throw: int) -> List[Tuple]:
+    """
+    List every state a pattern may start in, as candidates for the state walk of the search.
+
+    The state before the first beat is only known once the pattern is complete, so the search
+    walks every possible start state along and drops the ones the throws rule out.
+
+    Args:
+        state_walk: The state tracking of the search.
+        max_throw: Maximum throw value.
+
+    Returns:
+        The candidates, as tuples of the start state, the current state, the states visited so
+        far (only tracked for `prime_only`) and whether the ground state was visited.
+    """
+    state_filter = state_walk.state_filter
+    num_balls = state_walk.num_balls
+    ground_state = (1 << num_balls) - 1
+    candidates = []
+    for heights in combinations(range(max_throw), num_balls):
+        state = sum(1 << height for height in heights)
+        grounded = state == ground_state
+        if state_filter.excited_only and grounded:
+            continue
+        if (
+            state_filter.ground_only
+            and state.bit_length() - num_balls > state_walk.period - 1
+        ):
+            continue  # Too high to come down to the ground state within the period
+        visited = (state,) if state_filter.prime_only else None
+        candidates.append((state, state, visited, grounded))
+    return candidates
+
+
+def _advance_candidates(
+    candidates: List[Tuple],
+    pattern: List[int | None],
+    beats: Sequence[int],
+    state_walk: _StateWalk,
+) -> List[Tuple]:
+    """
+    Walk the candidate start states of the search through the throws of some beats.
+
+    A candidate is dropped when a throw is impossible from its state, when it repeats a state
+    with `prime_only`, when it reaches the ground state with `excited_only`, when it can no longer
+    reach the ground state with `ground_only`, and after the last beat of the period unless it is
+    back in its start state.
+
+    Args:
+        candidates: The candidates, as returned by `_start_candidates`.
+        pattern: The pattern being filled; the throws of `beats` must be placed.
+        beats: Consecutive beats to walk, in order.
+        state_walk: The state tracking of the search.
+
+    Returns:
+        The candidates that survive the beats.
+    """
+    state_filter = state_walk.state_filter
+    num_balls = state_walk.num_balls
+    period = state_walk.period
+    ground_state = (1 << num_balls) - 1
+    for beat in beats:
+        throw = pattern[beat]
+        landing = 1 << (throw - 1) if throw else 0
+        is_last = beat == period - 1
+        advanced = []
+        for start, state, visited, grounded in candidates:
+            next_state = state >> 1
+            if state & 1:  # A ball comes down and has to be thrown
+                if not landing or next_state & landing:
+                    continue
+                next_state |= landing
+            elif throw:  # Nothing to throw
+                continue
+            if is_last:
+                if next_state != start or (state_filter.ground_only and not grounded):
+                    continue
+            else:
+                if state_filter.prime_only:
+                    if next_state in visited:
+                        continue
+                    visited = visited + (next_state,)
+                if next_state == ground_state:
+                    if state_filter.excited_only:
+                        continue
+                    grounded = True
+                elif (
+                    state_filter.ground_only
+                    and not grounded
+                    and next_state.bit_length() - num_balls > period - beat - 2
+                ):
+                    continue  # Too high to come down to the ground state within the period
+            advanced.append((start, next_state, visited, grounded))
+        candidates = advanced
+        if not candidates:
+            break
+    return candidates
+
+
+def _lyndon_length(prefix: Sequence[int]) -> int:
+    """
+    Compute the length of the longest Lyndon prefix of a prenecklace, as tracked by the search.
+
+    Args:
+        prefix: Throws placed so far, in order.
+
+    Returns:
+        The length of the longest Lyndon prefix, or 0 for an empty prefix.
+    """
+    lyndon_length = 0
+    for slot, throw in enumerate(prefix):
+        if not lyndon_length or throw != prefix[slot - lyndon_length]:
+            lyndon_length = slot + 1
+    return lyndon_length
+
+
+def _fill_open_slots(
+    pattern: List[int | None],
+    slot: int,
+    open_indices: List[int],
+    slot_throws: List[List[int]],
+    lowest_sums: List[int],
+    highest_sums: List[int],
+    reachable_throws: List[set],
+    landed: List[bool],
+    remaining_sum: int,
+    num_jugglers: int,
+    passes_left: int,
+    passes_needed: int,
+    missing_throws: set,
+    state_walk: Optional[_StateWalk],
+    candidates: Optional[List[Tuple]],
+    include_throws: set,
+    generator_indices: List[int],
+    lyndon_length: int | None = None,
+    stop_slot: int | None = None,
+    stats: Optional[SearchStats] = None,
+) -> Iterator[List[int]]:
+    """
+    Fill `open_indices[slot:]` with allowed throws, pruning collisions, the sum budget, passes and
+    required throws that no longer fit.
+
+    When `lyndon_length` is given every slot is open and filled in order, and the search is
+    restricted to necklaces the way the FKM algorithm does it: the throw at `slot` may not be
+    smaller than the one `lyndon_length` slots before it, and a full pattern is only kept when
+    its longest Lyndon prefix divides the period.
+
+    With `stats` the search also counts its nodes, prunes and rejected leaves; every counter is
+    behind a check of `stats`, so the uninstrumented search only pays for the checks.
+
+    Args:
+        pattern: The current state of the pattern being generated.
+        slot: Position in `open_indices` of the next slot to fill.
+        open_indices: Pattern indices that are still open, in filling order.
+        slot_throws: Allowed throw values of every open slot, in ascending order.
+        lowest_sums: Lowest sum the open slots after every slot can contribute.
+        highest_sums: Highest sum the open slots after every slot can contribute.
+        reachable_throws: Throws the open slots from every slot on can take.
+        landed: Landing slots already taken by placed throws.
+        remaining_sum: Sum the open slots still have to contribute.
+        num_jugglers: Number of jugglers; throws that are not a multiple of it are passes.
+        passes_left: Number of passes the open slots may still contain.
+        passes_needed: Number of passes the open slots must still contain.
+        missing_throws: Required throws that are not placed yet; updated in place.
+        state_walk: The state tracking of the search, or None if states are not filtered.
+        candidates: The start states still possible, walked up to this slot.
+        include_throws: A set of throws that must appear at least once in every pattern.
+        generator_indices: Indices in the pattern that are filled by the generator.
+        lyndon_length: Length of the longest Lyndon prefix placed so far, or None to allow
+            every rotation.
+        stop_slot: If given, yield the partially filled pattern once this slot is reached
+            instead of completing it.
+        stats: If given, the statistics to count into.
+
+    Returns:
+        An iterator over copies of the valid completed patterns.
+    """
+    period = len(pattern)
+    if slot == stop_slot:
+        yield pattern[:]
+        return
+    if slot == len(open_indices):  # Every landing is distinct, so only the sum is left
+        filled_values = {pattern[i] for i in generator_indices}
+        rejection = None
+        if remaining_sum != 0:
+            rejection = "sum"
+        elif not include_throws.issubset(filled_values):
+            rejection = "include_throws"
+        elif len(Counter(pattern)) <= 1:
+            rejection = "constant"
+        elif lyndon_length is not None and period % lyndon_length != 0:
+            rejection = "prenecklace"
+        if stats is not None:
+            stats.leaves += 1
+            if rejection is not None:
+                stats.rejections[rejection] += 1
+        if rejection is None:
+            yield pattern[:]  # Yield a copy of the valid pattern
+        return
+
+    index = open_indices[slot]
+    slots_left = len(open_indices) - slot - 1
+    throws = slot_throws[slot]
+    if not passes_left:
+        throws = [throw for throw in throws if throw % num_jugglers == 0]
+    elif passes_needed > slots_left:  # Every slot left has to be a pass
+        throws = [throw for throw in throws if throw % num_jugglers]
+    if stats is not None:
+        stats.nodes += 1
+        stats.pass_prunes += len(slot_throws[slot]) - len(throws)
+    if missing_throws:
+        if len(missing_throws) > slots_left + 1 or not missing_throws <= reachable_throws[slot]:
+            if stats is not None:
+                stats.include_prunes += 1
+            return  # The required throws no longer fit in the open slots
+        if len(missing_throws) > slots_left:  # This slot has to take a required throw
+            num_throws = len(throws)
+            throws = [throw for throw in throws if throw in missing_throws]
+            if stats is not None:
+                stats.include_prunes += num_throws - len(throws)
+    lowest_sum = lowest_sums[slot]
+    highest_sum = highest_sums[slot]
+    smallest_throw = None
+    first_throw = 0
+    if lyndon_length:
+        smallest_throw = pattern[slot - lyndon_length]
+        first_throw = bisect_left(throws, smallest_throw)
+        if stats is not None:
+            stats.necklace_skips += first_throw
+    for throw in throws[first_throw:]:
+        if stats is not None:
+            stats.throws_tried += 1
+        budget = remaining_sum - throw
+        if budget < lowest_sum:
+            if stats is not None:
+                stats.sum_prunes += 1
+            break  # Larger throws only overshoot further
+        if budget > highest_sum:
+            if stats is not None:
+                stats.sum_prunes += 1
+            continue  # Too small for the remaining slots to make up the difference
+        position = (index + throw) % period
+        if landed[position]:
+            if stats is not None:
+                stats.collision_prunes += 1
+            continue  # Collision with an already placed throw
+        pattern[index] = throw
+        next_candidates = None
+        if candidates is not None:
+            next_candidates = _advance_candidates(
+                candidates, pattern, state_walk.runs[slot], state_walk
+            )
+            if not next_candidates:
+                if stats is not None:
+                    stats.state_prunes += 1
+                pattern[index] = None
+                continue  # No start state allows the throw
+        landed[position] = True
+        is_pass = throw % num_jugglers > 0
+        is_missing = throw in missing_throws
+        if is_missing:
+            missing_throws.remove(throw)
+        yield from _fill_open_slots(
+            pattern,
+            slot + 1,
+            open_indices,
+            slot_throws,
+            lowest_sums,
+            highest_sums,
+            reachable_throws,
+            landed,
+            budget,
+            num_jugglers,
+            passes_left - is_pass,
+            passes_needed - is_pass,
+            missing_throws,
+            state_walk,
+            next_candidates,
+            include_throws,
+            generator_indices,
+            (
+                None
+                if lyndon_length is None
+                else lyndon_length if throw == smallest_throw else slot + 1
+            ),
+            stop_slot,
+            stats,
+        )
+        if is_missing:
+            missing_throws.add(throw)
+        pattern[index] = None
+        landed[position] = False
+
+
+def _iter_first_rotations_counted(
+    filled_patterns: Iterator[List[int]],
+    partial_pattern: List[int | None],
+    shifts: List[int],
+    include_throws: set,
+    generator_indices: List[int],
+    slot_domains: Optional[List[set | None]],
+    stats: SearchStats,
+) -> Iterator[List[int]]:
+    """
+    Keep the patterns `_is_first_rotation` accepts, counting and timing the rejected rotations.
+
+    Args:
+        filled_patterns: Completed patterns found by the search.
+        partial_pattern: The partial pattern, with None for the open slots.
+        shifts: The shifts returned by `_matching_shifts` for the partial pattern.
+        include_throws: A set of throws that must appear at least once in every pattern.
+        generator_indices: Indices in the pattern that are filled by the generator.
+        slot_domains: The throws allowed at every index, as returned by `_merge_slot_domains`.
+        stats: The statistics to count into.
+
+    Returns:
+        An iterator over the first patterns of their rotation classes.
+    """
+    for filled_pattern in filled_patterns:
+        start = perf_counter()
+        is_first = _is_first_rotation(
+            filled_pattern,
+            partial_pattern,
+            shifts,
+            include_throws,
+            generator_indices,
+            slot_domains,
+        )
+        stats.timings["rotation_check"] += perf_counter() - start
+        if is_first:
+            yield filled_pattern
+        else:
+            stats.rejections["rotation"] += 1
+
+
+def _matching_shifts(partial_pattern: List[int | None]) -> List[int]:
+    """
+    List the rotations of a partial pattern that agree with it on every pair of prefilled slots.
+
+    Args:
+        partial_pattern: The partial pattern, with None for the open slots.
+
+    Returns:
+        The shifts `s` for which a rotation by `s` of a completed pattern can still match the
+        partial pattern.
+    """
+    period = len(partial_pattern)
+    return [
+        shift
+        for shift in range(1, period)
+        if all(
+            throw is None
+            or partial_pattern[(i + shift) % period] in (None, throw)
+            for i, throw in enumerate(partial_pattern)
+        )
+    ]
+
+
+def _is_first_rotation(
+    pattern: List[int],
+    partial_pattern: List[int | None],
+    shifts: List[int],
+    include_throws: set,
+    generator_indices: List[int],
+    slot_domains: Optional[List[set | None]] = None,
+) -> bool:
+    """
+    Check that no smaller rotation of a completed pattern is also a completion of the partial pattern.
+
+    Args:
+        pattern: A completed pattern found by the search.
+        partial_pattern: The partial pattern, with None for the open slots.
+        shifts: The shifts returned by `_matching_shifts` for the partial pattern.
+        include_throws: A set of throws that must appear at least once in every pattern.
+        generator_indices: Indices in the pattern that are filled by the generator.
+        slot_domains: The throws allowed at every index, as returned by `_merge_slot_domains`.
+
+    Returns:
+        `True` if the search reaches this pattern before any other member of its rotation class.
+    """
+    period = len(pattern)
+    for shift in shifts:
+        rotation = pattern[shift:] + pattern[:shift]
+        if rotation >= pattern:
+            continue
+        if any(
+            throw is not None and rotation[i] != throw
+            for i, throw in enumerate(partial_pattern)
+        ):
+            continue
+        if slot_domains is not None and any(
+            slot_domains[i] is not None and rotation[i] not in slot_domains[i]
+            for i in generator_indices
+        ):
+            continue
+        if include_throws.issubset({rotation[i] for i in generator_indices}):
+            return False
+    return True
+
+
+def parse_arguments():
+    # Imported here since the ranking module builds on this one
+    from .siteswap_ranking import SCORE_NAMES
+
+    parser = argparse.ArgumentParser(description="Generate valid siteswap patterns.")
+
+    # Add arguments
+    parser.add_argument(
+        "--period-length",
+        type=int,
+        required=True,
+        help="Length of the siteswap period.",
+    )
+    parser.add_argument(
+        "--num-objects",
+        type=int,
+        required=True,
+        help="Number of objects in the siteswap.",
+    )
+    parser.add_argument("--min-throw", type=int, default=2, help="Minimum throw value.")
+    parser.add_argument(
+        "--max_throw", type=int, default=14, help="Maximum throw value."
+    )
+    parser.add_argument(
+        "--exclude-throws",
+        type=int,
+        nargs="*",
+        default=[1, 3],
+        help="Throws to exclude.",
+    )
+    parser.add_argument(
+        "--include-throws",
+        type=int,
+        nargs="*",
+        default=None,
+        help="Throws that must appear at least once.",
+    )
+    parser.add_argument(
+        "--partial-pattern",
+        type=int,
+        nargs="*",
+        default=None,
+        help="Partial pattern (use None for placeholders).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes to search with (0 uses every CPU).",
+    )
+    parser.add_argument(
+        "--catalog",
+        type=str,
+        default=None,
+        help="Serve the query from this catalog file when it covers it.",
+    )
+    parser.add_argument(
+        "--count-only",
+        action="store_true",
+        help="Print the number of patterns, without generating them.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default=None,
+        help="Output format (default: color on a terminal, plain otherwise); binary writes a "
+        "packed pattern file and needs --output.",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Write the patterns to this file instead of the standard output.",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Stop after printing this many patterns.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Run an instrumented serial search and print its statistics.",
+    )
+    parser.add_argument(
+        "--jugglers",
+        type=int,
+        default=None,
+        help="Number of jugglers passing the pattern (enables the passing constraints).",
+    )
+    parser.add_argument(
+        "--juggler-throws",
+        type=str,
+        nargs="*",
+        default=None,
+        help="Allowed throws of every juggler as comma separated lists, e.g. 6,7,8 7,8,9.",
+    )
+    parser.add_argument(
+        "--min-passes", type=int, default=None, help="Minimum number of passes."
+    )
+    parser.add_argument(
+        "--max-passes", type=int, default=None, help="Maximum number of passes."
+    )
+    parser.add_argument(
+        "--num-selfs", type=int, default=None, help="Required number of selfs."
+    )
+    parser.add_argument(
+        "--slot-domains",
+        type=str,
+        nargs="*",
+        default=None,
+        help="Allowed throws of single slots as INDEX:THROWS, e.g. 3:7,8,9 or 5:6-10.",
+    )
+    parser.add_argument(
+        "--prime-only",
+        action="store_true",
+        help="Only generate prime patterns, which never revisit a juggling state.",
+    )
+    state_group = parser.add_mutually_exclusive_group()
+    state_group.add_argument(
+        "--ground-only",
+        action="store_true",
+        help="Only generate patterns that pass through the ground state.",
+    )
+    state_group.add_argument(
+        "--excited-only",
+        action="store_true",
+        help="Only generate patterns that never pass through the ground state.",
+    )
+    parser.add_argument(
+        "--reversal",
+        action="store_true",
+        help="Generate a single pattern of every pattern and its time reversal.",
+    )
+    parser.add_argument(
+        "--keep-juggler-labels",
+        action="store_true",
+        help="Tell apart the rotations of a pattern that give every juggler a different part.",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=None,
+        help="Only generate this many patterns with the lowest --score, from the lowest up.",
+    )
+    parser.add_argument(
+        "--score",
+        choices=SCORE_NAMES,
+        default="max-throw",
+        help="Difficulty score --top-k ranks by; high throws are throws above the number of "
+        "objects.",
+    )
+    parser.add_argument(
+        "--shard",
+        type=str,
+        default=None,
+        help="Only search shard i of N of the search space, given as i/N with i from 1 to N.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Flush the patterns to --output as the search goes and checkpoint its progress to "
+        "OUTPUT.checkpoint.",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume a checkpointed search from OUTPUT.checkpoint (implies --checkpoint).",
+    )
+
+    return parser.parse_args()
+
+
+def parse_slot_domains(
+    slot_domains: Optional[List[str]], period_length: int
+) -> Optional[List[Optional[List[int]]]]:
+    """
+    Parse slot domains given on the command line as INDEX:THROWS.
+
+    THROWS is a comma separated list of throws and inclusive ranges, e.g. "7,8,9" or "6-8,10".
+
+    Args:
+        slot_domains: The slot domain arguments.
+        period_length: Total length of the pattern.
+
+    Returns:
+        The allowed throws of every index, with None for unrestricted indices, or None if no slot
+        domain was given.
+    """
+    if not slot_domains:
+        return None
+    domains = [None] * period_length
+    for slot_domain in slot_domains:
+        index, throws = slot_domain.split(":")
+        domain = []
+        for part in throws.split(","):
+            low, _, high = part.partition("-")
+            domain.extend(range(int(low), int(high or low) + 1))
+        domains[int(index)] = domain
+    return domains
+
+
+def parse_passing_constraints(args) -> Optional[PassingConstraints]:
+    """
+    Build the passing constraints requested on the command line.
+
+    Args:
+        args: The parsed command line arguments.
+
+    Returns:
+        The passing constraints, or None if no passing option was given.
+    """
+    options = (
+        args.jugglers,
+        args.juggler_throws,
+        args.min_passes,
+        args.max_passes,
+        args.num_selfs,
+    )
+    if all(option is None for option in options):
+        return None
+    juggler_throws = None
+    if args.juggler_throws is not None:
+        juggler_throws = [
+            [int(throw) for throw in throws.split(",")] for throws in args.juggler_throws
+        ]
+    return PassingConstraints(
+        num_jugglers=args.jugglers or 2,
+        juggler_throws=juggler_throws,
+        min_passes=args.min_passes,
+        max_passes=args.max_passes,
+        num_selfs=args.num_selfs,
+    )
+
+
+def parse_symmetry_group(
+    args, passing: Optional[PassingConstraints]
+) -> Optional[SymmetryGroup]:
+    """
+    Build the symmetry group requested on the command line.
+
+    Args:
+        args: The parsed command line arguments.
+        passing: The passing constraints requested on the command line.
+
+    Returns:
+        The symmetry group, or None if no symmetry option was given.
+    """
+    if not args.reversal and not args.keep_juggler_labels:
+        return None
+    num_jugglers = passing.num_jugglers if passing is not None else args.jugglers or 1
+    return SymmetryGroup(
+        num_jugglers=num_jugglers,
+        juggler_relabeling=not args.keep_juggler_labels,
+        reversal=args.reversal,
+    )
+
+
+def main():
+    args = parse_arguments()
+    output_format = args.format
+    if output_format is None:
+        output_format = "plain" if args.output is not None else default_format(sys.stdout)
+    if output_format == "binary" and args.output is None:
+        exit("--format binary needs --output")
+    if args.stats and (args.count_only or args.catalog or args.jobs != 1):
+        exit("--stats cannot be combined with --count-only, --catalog or --jobs")
+    passing = parse_passing_constraints(args)
+    symmetry = parse_symmetry_group(args, passing)
+    slot_domains = parse_slot_domains(args.slot_domains, args.period_length)
+    state_filters = args.prime_only or args.ground_only or args.excited_only
+    if (passing is not None or slot_domains is not None or state_filters) and args.count_only:
+        exit("--count-only does not support passing constraints, slot domains or state filters")
+
+    partial_pattern = (
+        [None if x == -1 else x for x in args.partial_pattern]
+        if args.partial_pattern
+        else [None] * args.period_length
+    )
+    search_args = dict(
+        period_length=args.period_length,
+        num_of_objects=args.num_objects,
+        partial_pattern=partial_pattern,
+        min_throw=args.min_throw,
+        max_throw=args.max_throw,
+        exclude_throws=args.exclude_throws,
+        include_throws=args.include_throws,
+        passing=passing,
+        slot_domains=slot_domains,
+        prime_only=args.prime_only,
+        ground_only=args.ground_only,
+        excited_only=args.excited_only,
+    )
+    checkpoint = args.checkpoint or args.resume
+    if args.top_k is not None and (
+        args.stats or args.count_only or args.catalog or args.shard or checkpoint
+    ):
+        exit("--top-k cannot be combined with --stats, --count-only, --catalog or --shard")
+    if (args.shard or checkpoint) and (args.stats or args.count_only or args.catalog):
+        exit("--shard and --checkpoint cannot be combined with --stats, --count-only or --catalog")
+    if symmetry is not None and (args.stats or args.shard or checkpoint):
+        exit("--reversal and --keep-juggler-labels cannot be combined with --stats or --shard")
+    if checkpoint and (args.output is None or output_format == "binary" or args.limit):
+        exit("--checkpoint needs --output in a text format and cannot be combined with --limit")
+    if args.shard or checkpoint:
+        # Imported here since the resumable search module builds on this one
+        from .resumable_search import (
+            iter_task_results,
+            parse_shard,
+            run_checkpointed_search,
+            shard_tasks,
+        )
+
+        try:
+            shard = parse_shard(args.shard) if args.shard else (0, 1)
+        except ValueError as error:
+            exit(str(error))
+        workers = args.jobs or os.cpu_count() or 1
+        if checkpoint:
+            num_found = run_checkpointed_search(
+                args.output,
+                args.output + ".checkpoint",
+                shard=shard,
+                workers=workers,
+                output_format=output_format,
+                resume=args.resume,
+                **search_args,
+            )
+            print(f"{num_found} siteswaps were written to {args.output}")
+            return
+
+    if args.count_only:
+        # Imported here since the counting module builds on this one
+        from .calc_valid_siteswaps import count_siteswaps
+
+        num_found = count_siteswaps(
+            period_length=args.period_length,
+            num_of_objects=args.num_objects,
+            partial_pattern=partial_pattern,
+            min_throw=args.min_throw,
+            max_throw=args.max_throw,
+            exclude_throws=args.exclude_throws,
+            include_throws=args.include_throws,
+            symmetry=symmetry,
+        )
+        print(f"{num_found} siteswaps were found")
+        return
+
+    catalog = None
+    if args.catalog:
+        # Imported here since the catalog module builds on this one
+        from .siteswap_catalog import SiteswapCatalog
+
+        catalog = SiteswapCatalog(args.catalog)
+
+    stats = None
+    if args.top_k is not None:
+        # Imported here since the ranking module builds on this one
+        from .siteswap_ranking import iter_ranked_siteswaps, named_score
+
+        num_jugglers = passing.num_jugglers if passing is not None else 2
+        score = named_score(args.score, args.num_objects, num_jugglers)
+        if _reduces_symmetry(symmetry):
+            validate_symmetry(symmetry, partial_pattern, passing, slot_domains, args.prime_only)
+            # Branches cannot be cut by the limit, since some of their patterns may be dropped
+            result = _iter_symmetry_representatives(
+                iter_ranked_siteswaps(score=score, **search_args), symmetry
+            )
+        else:
+            result = iter_ranked_siteswaps(score=score, limit=args.top_k, **search_args)
+        result = islice(result, args.top_k)
+    elif args.shard:
+        tasks = shard_tasks(shard=shard, **search_args)
+        result = chain.from_iterable(iter_task_results(tasks, workers))
+    elif args.stats:
+        result, stats = iter_siteswaps_with_stats(**search_args)
+    else:
+        result = iter_siteswaps(
+            workers=args.jobs or None, catalog=catalog, symmetry=symmetry, **search_args
+        )
+    if args.limit is not None:
+        result = islice(result, args.limit)
+
+    if args.output is not None:
+        num_found = write_pattern_output(
+            result,
+            output_format,
+            args.output,
+            args.period_length,
+            args.num_objects,
+            args.min_throw,
+            args.max_throw,
+        )
+        print(f"{num_found} siteswaps were written to {args.output}")
+        if stats is not None:
+            print(stats.report())
+        return
+
+    # Only colored output is meant for reading; otherwise keep the summary out of the patterns
+    summary_stream = sys.stdout if output_format == "color" else sys.stderr
+    if output_format == "color":
+        print("Generated Patterns:", flush=True)
+    try:
+        num_found = write_pattern_output(result, output_format)
+    except BrokenPipeError:
+        # The reader stopped early; send the output still buffered at exit to /dev/null
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    if not num_found:
+        print("no siteswaps found", file=summary_stream)
+    else:
+        print(f"{num_found} siteswaps were found", file=summary_stream)
+    if stats is not None:
+        print(stats.report(), file=summary_stream)
+
+
+# Example usage
+if __name__ == "__main__":
+    exit(main())
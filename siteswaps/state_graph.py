@@ -0,0 +1,202 @@
+import json
+from itertools import combinations
+from pathlib import Path
+from typing import Iterator
+
+from .cache import get_cache_dir
+from .tools import canonical_rotation, canonical_rotation_index
+
+
+class StateGraph:
+    """
+    The juggling state graph of a ball count and a maximal throw.
+
+    States are bitmasks (see `tools.state_to_bits`) of `num_balls` balls landing within the next
+    `max_throw` beats. Every state is numbered once, and the edges are stored as integer arrays:
+    `targets[i][k]` is the state reached from state `i` with the throw `throws[i][k]`.
+
+    Siteswaps of period `p` are exactly the closed walks of length `p` in this graph, and prime
+    siteswaps are exactly its simple cycles, so walking the graph never produces a colliding
+    candidate.
+    """
+
+    def __init__(self, num_balls: int, max_throw: int):
+        if num_balls < 0 or max_throw < num_balls:
+            raise ValueError("The maximal throw must be at least the number of balls.")
+        self.num_balls = num_balls
+        self.max_throw = max_throw
+        self.states = sorted(
+            sum(1 << position for position in positions)
+            for positions in combinations(range(max_throw), num_balls)
+        )
+        self.state_index = {state: i for i, state in enumerate(self.states)}
+        self.targets: list[list[int]] = []
+        self.throws: list[list[int]] = []
+        for state in self.states:
+            state_targets = []
+            state_throws = []
+            shifted = state >> 1
+            if not state & 1:
+                state_targets.append(self.state_index[shifted])
+                state_throws.append(0)
+            else:
+                for throw in range(1, max_throw + 1):
+                    landing = 1 << (throw - 1)
+                    if not shifted & landing:
+                        state_targets.append(self.state_index[shifted | landing])
+                        state_throws.append(throw)
+            self.targets.append(state_targets)
+            self.throws.append(state_throws)
+
+    @property
+    def ground_state(self) -> int:
+        """The index of the ground state, where the balls land on the next beats."""
+        return self.state_index[(1 << self.num_balls) - 1]
+
+    @staticmethod
+    def cache_path(num_balls: int, max_throw: int, cache_dir: Path | None = None) -> Path:
+        """
+        Return the file a graph with the given parameters is cached in.
+
+        Args:
+            num_balls (int): Number of balls.
+            max_throw (int): Maximal throw.
+            cache_dir (Path | None): Directory of the cache; defaults to `cache.get_cache_dir()`.
+
+        Returns:
+            Path: The cache file path.
+        """
+        cache_dir = cache_dir if cache_dir is not None else get_cache_dir()
+        return Path(cache_dir) / f"state_graph_{num_balls}_{max_throw}.json"
+
+    @classmethod
+    def load(
+        cls, num_balls: int, max_throw: int, cache_dir: Path | None = None
+    ) -> "StateGraph":
+        """
+        Load the graph from the cache, building and caching it the first time.
+
+        Args:
+            num_balls (int): Number of balls.
+            max_throw (int): Maximal throw.
+            cache_dir (Path | None): Directory of the cache; defaults to `cache.get_cache_dir()`.
+
+        Returns:
+            StateGraph: The state graph.
+        """
+        path = cls.cache_path(num_balls, max_throw, cache_dir)
+        if path.exists():
+            with open(path) as cache_file:
+                data = json.load(cache_file)
+            if (data["num_balls"], data["max_throw"]) == (num_balls, max_throw):
+                graph = cls.__new__(cls)
+                graph.num_balls = num_balls
+                graph.max_throw = max_throw
+                graph.states = data["states"]
+                graph.state_index = {state: i for i, state in enumerate(graph.states)}
+                graph.targets = data["targets"]
+                graph.throws = data["throws"]
+                return graph
+
+        graph = cls(num_balls, max_throw)
+        graph.save(path)
+        return graph
+
+    def save(self, path: Path) -> None:
+        """
+        Write the graph to a cache file.
+
+        Args:
+            path (Path): The file to write.
+        """
+        temporary_path = Path(path).with_suffix(".tmp")
+        with open(temporary_path, "w") as cache_file:
+            json.dump(
+                {
+                    "num_balls": self.num_balls,
+                    "max_throw": self.max_throw,
+                    "states": self.states,
+                    "targets": self.targets,
+                    "throws": self.throws,
+                },
+                cache_file,
+            )
+        temporary_path.replace(path)
+
+    def iter_siteswaps(self, period: int) -> Iterator[list[int]]:
+        """
+        Lazily yield every siteswap of the given period, as closed walks in the graph.
+
+        Each pattern is yielded once, in its canonical rotation (see `tools.canonical_rotation`).
+        A walk is only extended while the balls already in the air still fit its first state when
+        the walk ends, and throws larger than the first one are skipped since the canonical
+        rotation starts with the largest throw.
+
+        Args:
+            period (int): The period of the siteswaps.
+
+        Returns:
+            Iterator[list[int]]: The canonical patterns of the given period.
+        """
+        for start in range(len(self.states)):
+            yield from self._iter_closed_walks(start, start, period, [])
+
+    def _iter_closed_walks(
+        self, start: int, state: int, steps_left: int, pattern: list[int]
+    ) -> Iterator[list[int]]:
+        if not steps_left:
+            if state == start and canonical_rotation_index(pattern) == 0:
+                yield pattern[:]
+            return
+        free_positions = ~self.states[start]
+        for target, throw in zip(self.targets[state], self.throws[state]):
+            if pattern and throw > pattern[0]:
+                continue
+            if self.states[target] >> (steps_left - 1) & free_positions:
+                continue  # A ball in the air lands where the start state has none
+            pattern.append(throw)
+            yield from self._iter_closed_walks(start, target, steps_left - 1, pattern)
+            pattern.pop()
+
+    def iter_prime_siteswaps(self, max_period: int | None = None) -> Iterator[list[int]]:
+        """
+        Lazily yield every prime siteswap, as simple cycles in the graph.
+
+        Every cycle is found once, from its smallest numbered state, and yielded in its canonical
+        rotation.
+
+        Args:
+            max_period (int | None): If given, only cycles up to this length are yielded.
+
+        Returns:
+            Iterator[list[int]]: The canonical prime patterns.
+        """
+        max_period = max_period or len(self.states)
+        for start in range(len(self.states)):
+            on_path = [False] * len(self.states)
+            on_path[start] = True
+            yield from self._iter_simple_cycles(start, start, max_period, on_path, [])
+
+    def _iter_simple_cycles(
+        self,
+        start: int,
+        state: int,
+        max_period: int,
+        on_path: list[bool],
+        pattern: list[int],
+    ) -> Iterator[list[int]]:
+        if len(pattern) == max_period:
+            return
+        for target, throw in zip(self.targets[state], self.throws[state]):
+            if target == start:
+                pattern.append(throw)
+                yield canonical_rotation(pattern)
+                pattern.pop()
+            elif target > start and not on_path[target]:
+                on_path[target] = True
+                pattern.append(throw)
+                yield from self._iter_simple_cycles(
+                    start, target, max_period, on_path, pattern
+                )
+                pattern.pop()
+                on_path[target] = False
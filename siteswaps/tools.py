@@ -0,0 +1,675 @@
+from collections import Counter
+
+from .exceptions import ExcitedSiteswapError, NotValidSiteswapError
+
+
+def is_valid(
+    pattern: list[int] | tuple[int, ...], num_of_object: int | None = None
+) -> bool:
+    """
+    Check if a pattern is valid based on collision and object count.
+
+    Args:
+        pattern (list[int] | tuple[int,...]): The pattern to validate.
+
+    Returns:
+        bool: `True` if the pattern is valid, `False` otherwise.
+    """
+    period = len(pattern)
+
+    # Check if the number of objects (balls) is an integer
+    if sum(pattern) / period != int(sum(pattern) / period):
+        return False
+
+    if num_of_object and sum(pattern) / period != num_of_object:
+        return False
+
+    landing = [False] * period  # Tracks where throws land
+
+    for index, throw in enumerate(pattern):
+        position = (throw + index) % period
+        if landing[position]:  # Collision detected
+            return False
+        landing[position] = True
+    return True
+
+
+def calculate_num_balls(pattern: list[int]) -> int | None:
+    """
+    Calculate the number of balls in the given siteswap pattern.
+
+    The number of balls is determined by dividing the sum of the throws by the number of beats (throws in the pattern).
+
+    Args:
+        pattern (list[int]): A list representing the throws in a siteswap pattern.
+
+    Returns:
+        int: The number of balls in the pattern.
+    """
+    return sum(pattern) // len(pattern) if len(pattern) > 0 else None
+
+
+def canonical_rotation_index(pattern: list[int] | tuple[int, ...]) -> int:
+    """
+    Find where the lexicographically largest rotation of a pattern starts, in linear time.
+
+    Two candidate starts are compared until they differ; the losing candidate and every start
+    inside the compared run are skipped, so each index is discarded at most once.
+
+    Args:
+        pattern (list[int] | tuple[int, ...]): The pattern to rotate.
+
+    Returns:
+        int: The index the canonical rotation starts at (the smallest one for periodic patterns).
+    """
+    period = len(pattern)
+    i, j, k = 0, 1, 0
+    while i < period and j < period and k < period:
+        a = pattern[(i + k) % period]
+        b = pattern[(j + k) % period]
+        if a == b:
+            k += 1
+            continue
+        if a < b:
+            i += k + 1
+        else:
+            j += k + 1
+        if i == j:
+            j += 1
+        k = 0
+    return min(i, j)
+
+
+def canonical_rotation(pattern: list[int] | tuple[int, ...]) -> list[int]:
+    """
+    Return the rotation of a pattern that starts with the largest throw (its canonical form).
+
+    Args:
+        pattern (list[int] | tuple[int, ...]): The pattern to rotate.
+
+    Returns:
+        list[int]: The lexicographically largest rotation of the pattern.
+    """
+    if not pattern:
+        return []
+    start = canonical_rotation_index(pattern)
+    return list(pattern[start:]) + list(pattern[:start])
+
+
+def time_reversal(pattern: list[int] | tuple[int, ...]) -> list[int]:
+    """
+    Return the pattern played backwards in time.
+
+    A throw of height `t` from beat `i` lands at beat `i + t`; played backwards, it is thrown from
+    beat `-(i + t)` and lands at beat `-i`, so the result is again a valid pattern with the same
+    throws. In passing patterns every catcher becomes the thrower of the reversed throw.
+
+    Args:
+        pattern (list[int] | tuple[int, ...]): A valid siteswap pattern.
+
+    Returns:
+        list[int]: The time-reversed pattern.
+    """
+    period = len(pattern)
+    reversed_pattern = [0] * period
+    for index, throw in enumerate(pattern):
+        reversed_pattern[-(index + throw) % period] = throw
+    return reversed_pattern
+
+
+def compute_initial_state_of_pattern(pattern: list[int]) -> list[str]:
+    """
+    Initialize the juggling state array based on the number of balls and throws in the pattern.
+
+    Args:
+        pattern (list[int]): A list representing the throws in a siteswap pattern.
+
+    Returns:
+        list[str]: The initial state of the juggling pattern, with "x" representing ball positions and "_" representing empty positions.
+    """
+    num_balls = calculate_num_balls(pattern)
+    assert num_balls is not None
+    state_size = max(pattern) + 1
+    state = ["_"] * state_size
+
+    # Fill first `num_balls` positions with 'x'
+    for i in range(num_balls):
+        state[i] = "x"
+
+    return state
+
+
+def shift_left(state: list[str]) -> list[str]:
+    return state[1:] + ["_"]
+
+
+def shift_state(state: list[str], throw: int) -> list[str]:
+    """
+    Shift the juggling state to the next step based on the current throw.
+
+    The state is shifted left, and a ball is thrown to the position indicated by the throw value.
+    This is the list form of `shift_state_bits`; the resulting state keeps the length of `state`.
+
+    Args:
+        state (list[str]): The current state of the juggling pattern.
+        throw (int): The throw value indicating where the ball lands.
+
+    Returns:
+        list[str]: The new state after applying the shift.
+
+    Raises:
+        ValueError: If there is a ball collision (i.e., trying to throw a ball to an already occupied position).
+    """
+    if state[0] == "x" and throw > len(state):
+        raise IndexError("The throw lands outside of the state.")
+    return bits_to_state(shift_state_bits(state_to_bits(state), throw), len(state))
+
+
+def state_to_bits(state: list[str] | tuple[str, ...]) -> int:
+    """
+    Convert a juggling state of "x"/"_" positions into its bitmask form.
+
+    Bit `i` of the bitmask is set when a ball lands `i` beats from now, so shifting the state is
+    `state >> 1` and a throw `t` lands on `1 << (t - 1)`.
+
+    Args:
+        state (list[str] | tuple[str, ...]): The state, with "x" representing ball positions.
+
+    Returns:
+        int: The state as a bitmask.
+    """
+    bits = 0
+    for i, position in enumerate(state):
+        if position == "x":
+            bits |= 1 << i
+    return bits
+
+
+def bits_to_state(bits: int, state_size: int = 0) -> list[str]:
+    """
+    Convert a bitmask state back into a list of "x"/"_" positions.
+
+    Args:
+        bits (int): The state as a bitmask.
+        state_size (int): Minimal length of the returned state; it is padded with "_".
+
+    Returns:
+        list[str]: The state, with "x" representing ball positions and "_" representing empty positions.
+    """
+    return [
+        "x" if bits >> i & 1 else "_"
+        for i in range(max(state_size, bits.bit_length()))
+    ]
+
+
+def compute_initial_state_bits(pattern: list[int]) -> int:
+    """
+    Initialize the bitmask juggling state of a pattern: one ball on each of the first beats.
+
+    Args:
+        pattern (list[int]): A list representing the throws in a siteswap pattern.
+
+    Returns:
+        int: The ground state of the pattern's ball count, as a bitmask.
+    """
+    num_balls = calculate_num_balls(pattern)
+    assert num_balls is not None
+    return (1 << num_balls) - 1
+
+
+def shift_state_bits(state: int, throw: int) -> int:
+    """
+    Shift a bitmask juggling state to the next step based on the current throw.
+
+    Args:
+        state (int): The current state as a bitmask.
+        throw (int): The throw value indicating where the ball lands.
+
+    Returns:
+        int: The new state after applying the shift.
+
+    Raises:
+        ExcitedSiteswapError: If a ball has to be thrown as a 0 or lands on an occupied position.
+    """
+    new_state = state >> 1
+    if state & 1:  # A ball comes down, we must throw it
+        landing = 1 << (throw - 1) if throw > 0 else 0
+        if not landing or new_state & landing:
+            raise ExcitedSiteswapError(
+                f"The siteswap pattern is excited: the next state cann't be calculated for throw {throw}."
+            )
+        new_state |= landing
+    return new_state
+
+
+def calculate_pattern_orbit(pattern: list[int]) -> list[tuple[int]]:
+    """
+    Split a pattern into its orbits, the sets of throws a single group of balls cycles through.
+
+    Every index is visited once, so this runs in linear time plus the size of the result.
+
+    Args:
+        pattern (list[int]): A list representing the throws in a siteswap pattern.
+
+    Returns:
+        list[tuple[int]]: One copy of the pattern per orbit, with the throws of other orbits set
+        to 0, in the order of the first index of every orbit.
+    """
+    assert is_valid(pattern)
+    period = len(pattern)
+    visited = [False] * period
+    res = []
+    for i in range(period):
+        if visited[i]:
+            continue
+        orbit = [0] * period
+        next_index = i
+        while not visited[next_index]:
+            visited[next_index] = True
+            orbit[next_index] = pattern[next_index]
+            next_index = (next_index + pattern[next_index]) % period
+        res.append(tuple(orbit))
+    return res
+
+
+def find_all_states(pattern: list[int]) -> set[tuple[str]]:
+    state_size = max(pattern) + 1
+    return {
+        tuple(bits_to_state(state, state_size)) for state in find_all_state_bits(pattern)
+    }
+
+
+def pattern_state_bits(pattern: list[int]) -> int:
+    """
+    Read the state before the first throw off a pattern.
+
+    When the pattern repeats forever, a ball is in the air at beat `k` if a throw made `j` beats
+    earlier lands `k` beats from now. Excited patterns therefore need no entry throws.
+
+    Args:
+        pattern (list[int]): A list representing the throws in a siteswap pattern.
+
+    Returns:
+        int: The state, as a bitmask.
+    """
+    period = len(pattern)
+    state = 0
+    for beats_ago in range(1, max(pattern) + 1):
+        landing = pattern[-beats_ago % period] - beats_ago
+        if landing >= 0:
+            state |= 1 << landing
+    return state
+
+
+def find_all_state_bits(pattern: list[int]) -> set[int]:
+    """
+    Find every state a pattern passes through, starting from `pattern_state_bits`.
+
+    Args:
+        pattern (list[int]): A list representing the throws in a siteswap pattern.
+
+    Returns:
+        set[int]: The states of the pattern, as bitmasks.
+    """
+    state = pattern_state_bits(pattern)
+    states = {state}
+    for throw in pattern:
+        state = shift_state_bits(state, throw)
+        states.add(state)
+
+    return states
+
+
+def find_transition_of_certain_length(
+    state1: list[str], state2: list[str], transitions_length: int
+) -> list[int] | None:
+    if transitions_length == 0 and state1 == state2:
+        return []
+    # Positions past the end of the shorter list are not compared
+    state_size = min(len(state1) - transitions_length, len(state2))
+    mask = (1 << max(state_size, 0)) - 1
+    return find_transition_of_certain_length_bits(
+        state_to_bits(state1) & (mask << transitions_length),
+        state_to_bits(state2) & mask,
+        transitions_length,
+    )
+
+
+def find_transition_of_certain_length_bits(
+    state1: int, state2: int, transitions_length: int
+) -> list[int] | None:
+    """
+    Find the throws that lead from one bitmask state to another in exactly `transitions_length` beats.
+
+    Args:
+        state1 (int): The state to start from.
+        state2 (int): The state to reach.
+        transitions_length (int): Number of beats the transition takes.
+
+    Returns:
+        list[int] | None: The transition throws, or None if there is no such transition.
+    """
+    if transitions_length == 0 and state1 == state2:
+        return []
+    shifted = state1 >> transitions_length
+    if shifted & ~state2:
+        return None
+
+    missing = state2 & ~shifted
+    extra_count = missing.bit_count()
+    result = []
+    while missing:
+        lowest = missing & -missing
+        result.append(lowest.bit_length() - 1 + extra_count)
+        extra_count -= 1
+        missing ^= lowest
+    return result if result else None
+
+
+def find_minimal_transition_between_two_states(
+    state1: tuple[str], state2: tuple[str]
+) -> list[int] | None:
+    res = []
+    for i in range(len(state1)):
+        res = find_transition_of_certain_length(list(state1), list(state2), i)
+        if res is not None:
+            break
+    return res
+
+
+def find_transition(
+    patternA: list[int],
+    patternB: list[int],
+    min_throw: int = 0,
+    max_throw: int | None = None,
+    exclude_throws: list[int] | None = None,
+) -> list[int] | None:
+    """
+    Determine the throws needed to safely transition from one pattern to another.
+
+    Args:
+        patternA (list[int]): The pattern you're currently juggling.
+        patternB (list[int]): The pattern you want to transition into.
+        min_throw (int): Minimum value for a transition throw.
+        max_throw (int | None): Maximum value for a transition throw; defaults to the largest
+            throw of both patterns.
+        exclude_throws (list[int] | None): Throws that may not be used in the transition.
+
+    Returns:
+        list[int] | None: A list of throws to insert between them (transition throws), or None if
+        no transition fits the constraints.
+    """
+    transitions = find_minimal_transitions(
+        patternA, patternB, min_throw, max_throw, exclude_throws
+    )
+    return transitions[0] if transitions else None
+
+
+def find_minimal_transitions(
+    patternA: list[int],
+    patternB: list[int],
+    min_throw: int = 0,
+    max_throw: int | None = None,
+    exclude_throws: list[int] | None = None,
+) -> list[list[int]]:
+    """
+    Find every shortest sequence of throws that leads from one pattern into another.
+
+    A breadth-first search runs from all the states of `patternA` at once over the bitmask state
+    graph, using only the allowed throws, until a layer reaches a state of `patternB`. Every walk
+    from the first layer to the reached states is then read back from the recorded parents.
+
+    Args:
+        patternA (list[int]): The pattern you're currently juggling.
+        patternB (list[int]): The pattern you want to transition into.
+        min_throw (int): Minimum value for a transition throw.
+        max_throw (int | None): Maximum value for a transition throw; defaults to the largest
+            throw of both patterns.
+        exclude_throws (list[int] | None): Throws that may not be used in the transition.
+
+    Returns:
+        list[list[int]]: The minimal transitions in lexicographic order; they all have the same
+        length, and the list is empty if no transition fits the constraints.
+    """
+    num_balls = calculate_num_balls(patternA)
+    assert num_balls is not None
+    assert num_balls == calculate_num_balls(
+        patternB
+    ), "Patterns must have same ball count"
+
+    if max_throw is None:
+        max_throw = max(max(patternA), max(patternB))
+    excluded = set(exclude_throws or [])
+    throws = [
+        throw for throw in range(max(min_throw, 1), max_throw + 1) if throw not in excluded
+    ]
+    allow_zero = min_throw <= 0 and 0 not in excluded
+
+    B_states = find_all_state_bits(patternB)
+    parents: dict[int, list[tuple[int, int]]] = {
+        state: [] for state in find_all_state_bits(patternA)
+    }
+    frontier = sorted(parents)
+    while not any(state in B_states for state in frontier):
+        next_parents: dict[int, list[tuple[int, int]]] = {}
+        for state in frontier:
+            shifted = state >> 1
+            if not state & 1:
+                if allow_zero and shifted not in parents:
+                    next_parents.setdefault(shifted, []).append((state, 0))
+                continue
+            for throw in throws:
+                landing = 1 << (throw - 1)
+                if shifted & landing:
+                    continue
+                next_state = shifted | landing
+                if next_state not in parents:
+                    next_parents.setdefault(next_state, []).append((state, throw))
+        if not next_parents:
+            return []
+        parents.update(next_parents)
+        frontier = sorted(next_parents)
+
+    transitions: set[tuple[int, ...]] = set()
+
+    def collect(state: int, suffix: tuple[int, ...]) -> None:
+        if not parents[state]:
+            transitions.add(suffix)
+        for parent, throw in parents[state]:
+            collect(parent, (throw,) + suffix)
+
+    for state in frontier:
+        if state in B_states:
+            collect(state, ())
+    return [list(transition) for transition in sorted(transitions)]
+
+
+def find_excited_entry(pattern: list[int]) -> list[int]:
+    """
+    Determine the shortest throws leading from the ground state into a pattern.
+
+    The entry leads into the state the pattern starts in as written (see `pattern_state_bits`).
+
+    Args:
+        pattern (list[int]): The siteswap pattern to analyze.
+
+    Returns:
+        list[int]: The entry throws; empty for a pattern that starts in the ground state.
+    """
+    num_balls = calculate_num_balls(pattern)
+    assert num_balls is not None
+    return ground_state_entry(pattern_state_bits(pattern), num_balls)
+
+
+def ground_state_entry(state: int, num_balls: int) -> list[int]:
+    """
+    Find the shortest throws leading from the ground state into a state.
+
+    After `k` throws the balls of the ground state above height `k` are still in the air, so the
+    shortest entry has the smallest `k` for which they all fit the target state. The `k` balls
+    thrown meanwhile fill the remaining heights of the target state, highest first.
+
+    Args:
+        state (int): The target state, as a bitmask.
+        num_balls (int): The number of balls in the state.
+
+    Returns:
+        list[int]: The entry throws; empty if the state is the ground state.
+    """
+    length = 0
+    while ((1 << num_balls) - 1) >> length & ~state:
+        length += 1
+    remaining = state & ~(((1 << num_balls) - 1) >> length)
+    heights = [height for height in range(remaining.bit_length()) if remaining >> height & 1]
+    return [length + height - i for i, height in enumerate(reversed(heights))]
+
+
+def is_excited_pattern(pattern: list[int]) -> bool:
+    num_balls = calculate_num_balls(pattern)
+    assert num_balls is not None
+    for i, throw in enumerate(pattern):
+        if throw + i < num_balls:
+            return True
+    return False
+
+
+def is_prime_siteswap(pattern: list[int]) -> bool | None:
+    """
+    Check if a given siteswap pattern is prime.
+
+    A prime siteswap cannot be decomposed into smaller patterns. This function checks for repeated states
+    during the juggling process to determine if the pattern is prime or composite.
+
+    Args:
+        pattern (list[int]): A list representing the throws in a siteswap pattern.
+
+    Returns:
+        bool: `True` if the pattern is prime, `False` if it is composite.
+    """
+    if not is_valid(pattern):
+        raise NotValidSiteswapError
+    state = compute_initial_state_bits(pattern)
+    seen_states = set()
+
+    for throw in pattern:
+        if state in seen_states:
+            return False  # Repeated state before completing cycle => Composite
+
+        seen_states.add(state)
+        state = shift_state_bits(state, throw)
+
+    return True  # No repeated state before completing full cycle => Prime
+
+
+def decompose_siteswap_recursive(
+    pattern: list[int],
+    current_state: int | list[str],
+    res: list[tuple[int, ...]],
+    is_seen: bool = False,
+    seen_states: dict[int, int] | None = None,
+    pattern_prefix_pre_cycle: list[int] | None = None,
+) -> None:
+    """
+    Recursively decompose a siteswap pattern into smaller subpatterns.
+
+    The function looks for repeating states during the juggling process, which indicate where the pattern
+    can be split into smaller cycles.
+
+    Args:
+        pattern (list[int]): A list representing the throws in a siteswap pattern.
+        current_state (int | list[str]): The state before the first throw, as a bitmask.
+        res (list[tuple[int]]): The list to accumulate the decomposed subpatterns.
+    """
+    if not isinstance(current_state, int):
+        current_state = state_to_bits(current_state)
+    if seen_states is None:
+        seen_states = {}
+    if pattern_prefix_pre_cycle is None:
+        pattern_prefix_pre_cycle = []
+
+    for local_index, throw in enumerate(pattern):
+        current_state = shift_state_bits(current_state, throw)
+        if current_state in seen_states:
+            seen_states = {current_state: seen_states[current_state]}
+            start_index = seen_states[current_state] + 1 if not is_seen else 0
+            res.append(tuple(pattern[start_index : local_index + 1]))
+            if not pattern_prefix_pre_cycle:
+                pattern_prefix_pre_cycle = pattern[:start_index]
+            decompose_siteswap_recursive(
+                pattern[local_index + 1 :],
+                current_state,
+                res,
+                True,
+                seen_states,
+                pattern_prefix_pre_cycle,
+            )
+            return
+        if not is_seen:
+            seen_states[current_state] = local_index
+
+    res.append(
+        tuple(pattern + pattern_prefix_pre_cycle)
+    )  # If no repeats, add the rest of the pattern
+
+
+def decompose_siteswap(
+    pattern: list[int],
+    entry: list[int] | None = None,
+) -> list[str]:
+    """
+    Decompose a siteswap pattern into its repeating subpatterns and their counts.
+
+    This function first recursively decomposes the pattern and then counts the number of occurrences
+    of each subpattern. The result is formatted to display the count of each subpattern.
+
+    Args:
+        pattern (list[int]): A list representing the throws in a siteswap pattern.
+
+    Returns:
+        list[str]: A list of strings representing the decomposed patterns with their counts.
+    """
+    state = compute_initial_state_bits(pattern)
+    if entry:
+        for throw in entry:
+            state = shift_state_bits(state, throw)
+
+    res = []
+    decompose_siteswap_recursive(pattern, state, res)
+
+    # Format the results
+    formatted_result = []
+    for pattern, count in count_subpatterns(res):
+        if len(pattern) == 1:
+            formatted_result.append(
+                "(" + str(pattern[0]) + ")" + f"^{count}"
+                if count > 1
+                else "(" + str(pattern[0]) + ")"
+            )  # For single elements, repeat as string
+        else:
+            formatted_result.append(
+                f"({' '.join(map(str, pattern))})^{count}"
+            )  # Decomposed patterns with count
+
+    return formatted_result
+
+
+def count_subpatterns(
+    subpatterns: list[tuple[int, ...]],
+) -> list[tuple[tuple[int, ...], int]]:
+    """
+    Count the repetitions of the subpatterns of a decomposition.
+
+    The subpatterns are ordered by their count and then by their first throw, largest first; ties
+    keep the order in which the subpatterns were found.
+
+    Args:
+        subpatterns (list[tuple[int, ...]]): The subpatterns, as collected by
+            `decompose_siteswap_recursive`.
+
+    Returns:
+        list[tuple[tuple[int, ...], int]]: Every distinct subpattern with its count.
+    """
+    counts = list(Counter(subpatterns).items())
+    counts.sort(reverse=True, key=lambda item: (item[1], item[0][0]))
+    return counts
+
@@ -0,0 +1,527 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .cache import get_cache_dir
+from .tools import calculate_num_balls, canonical_rotation, find_all_state_bits
+
+# Setlists up to this size are planned exactly, larger ones with a heuristic
+EXACT_PLAN_LIMIT = 10
+
+
+class TransitionMatrix:
+    """
+    The shortest transitions between every ordered pair of a set of patterns.
+
+    The patterns are stored in their canonical rotation and sorted, so the matrix only depends on
+    the set of patterns. `transitions[i][j]` is the transition `tools.find_transition` returns from
+    `patterns[i]` to `patterns[j]` with the same throw bounds, or None if there is none (e.g. the
+    ball counts differ).
+
+    The states of every pattern are computed once, and every row is a single breadth-first search
+    from the states of its pattern that stops once it reached every pattern with the same ball
+    count, so a row costs about as much as one `find_transition` call.
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[Sequence[int]],
+        min_throw: int = 0,
+        max_throw: Optional[int] = None,
+        exclude_throws: Optional[Iterable[int]] = None,
+        workers: Optional[int] = 1,
+    ):
+        """
+        Compute the matrix.
+
+        Args:
+            patterns: The valid siteswap patterns.
+            min_throw: Minimum value for a transition throw.
+            max_throw: Maximum value for a transition throw; defaults to the largest throw of all
+                the patterns.
+            exclude_throws: Throws that may not be used in the transitions.
+            workers: Number of processes to compute the rows with; None uses every CPU.
+        """
+        if workers is not None and workers <= 0:
+            raise ValueError("Number of workers must be positive.")
+        self.patterns = _normalize_patterns(patterns)
+        self.min_throw = min_throw
+        self.max_throw = (
+            max_throw
+            if max_throw is not None
+            else max((max(pattern) for pattern in self.patterns), default=0)
+        )
+        self.exclude_throws = sorted(set(exclude_throws or []))
+        self.index = {tuple(pattern): i for i, pattern in enumerate(self.patterns)}
+
+        pattern_states = [sorted(find_all_state_bits(pattern)) for pattern in self.patterns]
+        ball_counts = [calculate_num_balls(pattern) for pattern in self.patterns]
+        excluded = set(self.exclude_throws)
+        throws = [
+            throw
+            for throw in range(max(min_throw, 1), self.max_throw + 1)
+            if throw not in excluded
+        ]
+        allow_zero = min_throw <= 0 and 0 not in excluded
+        find_row = partial(_find_transition_row, pattern_states, ball_counts, throws, allow_zero)
+        rows = range(len(self.patterns))
+        if workers == 1 or len(self.patterns) <= 1:
+            self.transitions = list(map(find_row, rows))
+        else:
+            workers = workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunk_size = max(1, len(self.patterns) // (workers * 4))
+                self.transitions = list(executor.map(find_row, rows, chunksize=chunk_size))
+
+    @property
+    def lengths(self) -> List[List[Optional[int]]]:
+        """The length of every transition, with None where there is no transition."""
+        return [
+            [None if transition is None else len(transition) for transition in row]
+            for row in self.transitions
+        ]
+
+    def transition(
+        self, pattern_a: Sequence[int], pattern_b: Sequence[int]
+    ) -> Optional[List[int]]:
+        """
+        Look up the transition between two patterns of the matrix, in any rotation.
+
+        Args:
+            pattern_a: The pattern you're currently juggling.
+            pattern_b: The pattern you want to transition into.
+
+        Returns:
+            The transition throws, or None if there is no transition.
+
+        Raises:
+            KeyError: If a pattern is not in the matrix.
+        """
+        return self.transitions[self.index_of(pattern_a)][self.index_of(pattern_b)]
+
+    def index_of(self, pattern: Sequence[int]) -> int:
+        """
+        Find the index of a pattern of the matrix, in any rotation.
+
+        Args:
+            pattern: The pattern to look up.
+
+        Returns:
+            The row and column of the pattern.
+
+        Raises:
+            KeyError: If the pattern is not in the matrix.
+        """
+        return self.index[tuple(canonical_rotation(pattern))]
+
+    @staticmethod
+    def cache_path(
+        patterns: Iterable[Sequence[int]],
+        min_throw: int = 0,
+        max_throw: Optional[int] = None,
+        exclude_throws: Optional[Iterable[int]] = None,
+        cache_dir: Optional[Path] = None,
+    ) -> Path:
+        """
+        Return the file the matrix of a set of patterns and throw bounds is cached in.
+
+        Args:
+            patterns: The valid siteswap patterns.
+            min_throw: Minimum value for a transition throw.
+            max_throw: Maximum value for a transition throw.
+            exclude_throws: Throws that may not be used in the transitions.
+            cache_dir: Directory of the cache; defaults to `cache.get_cache_dir()`.
+
+        Returns:
+            The cache file path.
+        """
+        key = json.dumps(
+            [
+                _normalize_patterns(patterns),
+                min_throw,
+                max_throw,
+                sorted(set(exclude_throws or [])),
+            ]
+        )
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        cache_dir = cache_dir if cache_dir is not None else get_cache_dir()
+        return Path(cache_dir) / f"transition_matrix_{digest}.json"
+
+    @classmethod
+    def load(
+        cls,
+        patterns: Iterable[Sequence[int]],
+        min_throw: int = 0,
+        max_throw: Optional[int] = None,
+        exclude_throws: Optional[Iterable[int]] = None,
+        workers: Optional[int] = 1,
+        cache_dir: Optional[Path] = None,
+    ) -> "TransitionMatrix":
+        """
+        Load the matrix of a set of patterns from the cache, computing and caching it on a miss.
+
+        Args:
+            patterns: The valid siteswap patterns.
+            min_throw: Minimum value for a transition throw.
+            max_throw: Maximum value for a transition throw; defaults to the largest throw of all
+                the patterns.
+            exclude_throws: Throws that may not be used in the transitions.
+            workers: Number of processes to compute the rows with; None uses every CPU.
+            cache_dir: Directory of the cache; defaults to `cache.get_cache_dir()`.
+
+        Returns:
+            The transition matrix.
+        """
+        patterns = _normalize_patterns(patterns)
+        exclude_throws = sorted(set(exclude_throws or []))
+        path = cls.cache_path(patterns, min_throw, max_throw, exclude_throws, cache_dir)
+        if path.exists():
+            with open(path) as cache_file:
+                data = json.load(cache_file)
+            if data["patterns"] == patterns and (
+                data["min_throw"],
+                data["exclude_throws"],
+            ) == (min_throw, exclude_throws):
+                matrix = cls.__new__(cls)
+                matrix.patterns = patterns
+                matrix.min_throw = min_throw
+                matrix.max_throw = data["max_throw"]
+                matrix.exclude_throws = exclude_throws
+                matrix.index = {tuple(pattern): i for i, pattern in enumerate(patterns)}
+                matrix.transitions = data["transitions"]
+                return matrix
+
+        matrix = cls(patterns, min_throw, max_throw, exclude_throws, workers)
+        matrix.save(path)
+        return matrix
+
+    def save(self, path: Path) -> None:
+        """
+        Write the matrix to a cache file.
+
+        Args:
+            path: The file to write.
+        """
+        temporary_path = Path(path).with_suffix(".tmp")
+        with open(temporary_path, "w") as cache_file:
+            json.dump(
+                {
+                    "patterns": self.patterns,
+                    "min_throw": self.min_throw,
+                    "max_throw": self.max_throw,
+                    "exclude_throws": self.exclude_throws,
+                    "transitions": self.transitions,
+                },
+                cache_file,
+            )
+        temporary_path.replace(path)
+
+
+class SetlistPlan(NamedTuple):
+    """
+    An ordering of a setlist, as returned by `plan_setlist`.
+
+    Attributes:
+        patterns: The patterns in the order to juggle them.
+        transitions: The transition from every pattern into the next one.
+        total_length: The total number of transition throws, or None if some transition is
+            impossible.
+    """
+
+    patterns: List[List[int]]
+    transitions: List[Optional[List[int]]]
+    total_length: Optional[int]
+
+
+def plan_setlist(
+    matrix: TransitionMatrix, setlist: Optional[Iterable[Sequence[int]]] = None
+) -> SetlistPlan:
+    """
+    Order a setlist so the transitions between consecutive patterns are as short as possible.
+
+    Every pattern is juggled once, starting from any of them. Setlists of up to
+    `EXACT_PLAN_LIMIT` patterns are ordered optimally with the Held-Karp dynamic program over
+    subsets; larger ones start from the best nearest-neighbour ordering and move single patterns
+    to other positions while that shortens the total. Impossible transitions count as longer
+    than any ordering without them.
+
+    Args:
+        matrix: A transition matrix holding every pattern of the setlist.
+        setlist: The patterns to order, in any rotation; defaults to every pattern of the matrix.
+
+    Returns:
+        The ordered setlist with its transitions.
+
+    Raises:
+        KeyError: If a pattern of the setlist is not in the matrix.
+    """
+    if setlist is None:
+        indices = list(range(len(matrix.patterns)))
+    else:
+        indices = list(dict.fromkeys(matrix.index_of(pattern) for pattern in setlist))
+    # An impossible transition costs more than every possible transition of the setlist together
+    lengths = [
+        [
+            None if matrix.transitions[i][j] is None else len(matrix.transitions[i][j])
+            for j in indices
+        ]
+        for i in indices
+    ]
+    impossible = 1 + sum(length for row in lengths for length in row if length is not None)
+    costs = [[impossible if length is None else length for length in row] for row in lengths]
+    if len(indices) <= EXACT_PLAN_LIMIT:
+        order = _exact_order(costs)
+    else:
+        order = _heuristic_order(costs)
+
+    ordered = [indices[position] for position in order]
+    transitions = [matrix.transitions[i][j] for i, j in zip(ordered, ordered[1:])]
+    total_length = (
+        None
+        if any(transition is None for transition in transitions)
+        else sum(map(len, transitions))
+    )
+    return SetlistPlan(
+        patterns=[list(matrix.patterns[i]) for i in ordered],
+        transitions=transitions,
+        total_length=total_length,
+    )
+
+
+def _normalize_patterns(patterns: Iterable[Sequence[int]]) -> List[List[int]]:
+    """Return the distinct canonical rotations of some patterns, sorted."""
+    canonical_patterns = {tuple(canonical_rotation(pattern)) for pattern in patterns}
+    return [list(pattern) for pattern in sorted(canonical_patterns)]
+
+
+def _find_transition_row(
+    pattern_states: List[List[int]],
+    ball_counts: List[int],
+    throws: List[int],
+    allow_zero: bool,
+    source: int,
+) -> List[Optional[List[int]]]:
+    """
+    Find the shortest transitions from one pattern into every pattern of the matrix.
+
+    A breadth-first search runs from all the states of the source pattern at once, like in
+    `tools.find_minimal_transitions`, and keeps the lexicographically smallest walk into every
+    state it reaches. A pattern is reached at the first layer holding one of its states, and its
+    transition is the smallest walk into those states.
+
+    Args:
+        pattern_states: The states of every pattern of the matrix, as bitmasks.
+        ball_counts: The ball count of every pattern of the matrix.
+        throws: The allowed transition throws, without 0.
+        allow_zero: Whether 0 is an allowed transition throw.
+        source: The index of the pattern to start from.
+
+    Returns:
+        The transition into every pattern, or None where there is no transition.
+    """
+    row: List[Optional[List[int]]] = [None] * len(pattern_states)
+    state_owners: Dict[int, List[int]] = {}
+    for target, states in enumerate(pattern_states):
+        if ball_counts[target] == ball_counts[source]:
+            for state in states:
+                state_owners.setdefault(state, []).append(target)
+    num_left = len({target for owners in state_owners.values() for target in owners})
+
+    walks: Dict[int, Tuple[int, ...]] = {state: () for state in pattern_states[source]}
+    layer = walks
+    while True:
+        reached: Dict[int, Tuple[int, ...]] = {}
+        for state, walk in layer.items():
+            for target in state_owners.get(state, ()):
+                if row[target] is None and (target not in reached or walk < reached[target]):
+                    reached[target] = walk
+        for target, walk in reached.items():
+            row[target] = list(walk)
+        num_left -= len(reached)
+        if not num_left:
+            return row
+
+        next_layer: Dict[int, Tuple[int, ...]] = {}
+        for state, walk in layer.items():
+            shifted = state >> 1
+            if not state & 1:
+                moves = [(shifted, 0)] if allow_zero else []
+            else:
+                moves = [
+                    (shifted | 1 << (throw - 1), throw)
+                    for throw in throws
+                    if not shifted & 1 << (throw - 1)
+                ]
+            for next_state, throw in moves:
+                if next_state in walks:
+                    continue
+                next_walk = walk + (throw,)
+                if next_state not in next_layer or next_walk < next_layer[next_state]:
+                    next_layer[next_state] = next_walk
+        if not next_layer:
+            return row
+        walks.update(next_layer)
+        layer = next_layer
+
+
+def _exact_order(costs: List[List[int]]) -> List[int]:
+    """
+    Find the cheapest path visiting every position once, with the Held-Karp dynamic program.
+
+    Args:
+        costs: The cost of going from every position to every other position.
+
+    Returns:
+        The positions in the order of the cheapest path.
+    """
+    size = len(costs)
+    if size <= 1:
+        return list(range(size))
+    # best[(visited, last)] is the cheapest path through the visited set ending at `last`
+    best = {(1 << i, i): (0, None) for i in range(size)}
+    for visited in range(1, 1 << size):
+        for last in range(size):
+            if (visited, last) not in best:
+                continue
+            cost = best[(visited, last)][0]
+            for following in range(size):
+                if visited >> following & 1:
+                    continue
+                key = (visited | 1 << following, following)
+                new_cost = cost + costs[last][following]
+                if key not in best or new_cost < best[key][0]:
+                    best[key] = (new_cost, last)
+
+    full = (1 << size) - 1
+    last = min(range(size), key=lambda i: best[(full, i)][0])
+    order = []
+    visited = full
+    while last is not None:
+        order.append(last)
+        previous = best[(visited, last)][1]
+        visited &= ~(1 << last)
+        last = previous
+    return order[::-1]
+
+
+def _heuristic_order(costs: List[List[int]]) -> List[int]:
+    """
+    Find a cheap path visiting every position once, for setlists too large to plan exactly.
+
+    Args:
+        costs: The cost of going from every position to every other position.
+
+    Returns:
+        The positions in the order of the path found.
+    """
+    size = len(costs)
+
+    def path_cost(order: List[int]) -> int:
+        return sum(costs[i][j] for i, j in zip(order, order[1:]))
+
+    order = min(
+        (_nearest_neighbour_order(costs, start) for start in range(size)), key=path_cost
+    )
+    cost = path_cost(order)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(size):
+            rest = order[:i] + order[i + 1 :]
+            for j in range(size):
+                if j == i:
+                    continue
+                candidate = rest[:j] + [order[i]] + rest[j:]
+                candidate_cost = path_cost(candidate)
+                if candidate_cost < cost:
+                    order, cost, improved = candidate, candidate_cost, True
+                    break
+    return order
+
+
+def _nearest_neighbour_order(costs: List[List[int]], start: int) -> List[int]:
+    """Build a path by always going to the cheapest position not visited yet."""
+    order = [start]
+    left = set(range(len(costs))) - {start}
+    while left:
+        following = min(left, key=lambda i: (costs[order[-1]][i], i))
+        order.append(following)
+        left.remove(following)
+    return order
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Compute the transitions between a set of patterns and plan a setlist."
+    )
+    parser.add_argument(
+        "patterns",
+        type=str,
+        nargs="+",
+        help="The patterns as comma separated throws, e.g. 9,7,5 8,8,5.",
+    )
+    parser.add_argument(
+        "--min-throw", type=int, default=0, help="Minimum transition throw."
+    )
+    parser.add_argument(
+        "--max-throw",
+        type=int,
+        default=None,
+        help="Maximum transition throw (defaults to the largest throw of the patterns).",
+    )
+    parser.add_argument(
+        "--exclude-throws",
+        type=int,
+        nargs="*",
+        default=None,
+        help="Throws that may not be used in the transitions.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes to compute with (0 uses every CPU).",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Print the order of the patterns with the shortest transitions.",
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_arguments()
+    patterns = [[int(throw) for throw in pattern.split(",")] for pattern in args.patterns]
+    matrix = TransitionMatrix.load(
+        patterns,
+        args.min_throw,
+        args.max_throw,
+        args.exclude_throws,
+        args.jobs or None,
+    )
+
+    if args.plan:
+        plan = plan_setlist(matrix, patterns)
+        for pattern, transition in zip(plan.patterns, plan.transitions + [None]):
+            print(" ".join(map(str, pattern)))
+            if transition:
+                print("  -> " + " ".join(map(str, transition)))
+        print(f"Total transition length: {plan.total_length}")
+        return
+
+    for pattern, row in zip(matrix.patterns, matrix.transitions):
+        for target, transition in zip(matrix.patterns, row):
+            if pattern != target:
+                throws = "none" if transition is None else " ".join(map(str, transition)) or "-"
+                print(f"{' '.join(map(str, pattern))} -> {' '.join(map(str, target))}: {throws}")
+
+
+if __name__ == "__main__":
+    exit(main())
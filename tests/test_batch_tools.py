@@ -0,0 +1,23 @@
+from itertools import product
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from siteswaps.batch_tools import analyze_patterns_batch, is_valid_batch  # noqa: E402
+from siteswaps.tools import calculate_num_balls, is_excited_pattern, is_valid  # noqa: E402
+
+
+@pytest.mark.parametrize("period", [1, 2, 3, 4])
+def test_analyze_patterns_batch_matches_tools(period):
+    patterns = np.array(list(product(range(8), repeat=period)), dtype=np.uint8)
+    analysis = analyze_patterns_batch(patterns)
+    rows = patterns.tolist()
+    assert analysis.valid.tolist() == [is_valid(row) for row in rows]
+    assert analysis.num_balls.tolist() == [calculate_num_balls(row) for row in rows]
+    assert analysis.excited.tolist() == [is_excited_pattern(row) for row in rows]
+
+
+def test_is_valid_batch_num_of_object():
+    patterns = np.array([[5, 3, 1], [4, 4, 1], [7, 1, 4]], dtype=np.uint8)
+    assert is_valid_batch(patterns, 3).tolist() == [True, True, False]
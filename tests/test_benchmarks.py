@@ -0,0 +1,30 @@
+import pytest
+
+from siteswaps.benchmarks import compare, digest, run_case
+
+BASELINE = {"case": {"seconds": 0.1, "peak_bytes": 0, "count": 2, "digest": digest([1, 2])}}
+
+
+@pytest.mark.parametrize(
+    "result, num_problems",
+    [
+        ({"seconds": 0.11, "count": 2, "digest": digest([1, 2])}, 0),
+        ({"seconds": 0.2, "count": 2, "digest": digest([1, 2])}, 1),
+        ({"seconds": 0.1, "count": 2, "digest": digest([2, 1])}, 1),
+        ({"seconds": 0.2, "count": 3, "digest": digest([1, 2, 3])}, 2),
+    ],
+)
+def test_compare(result, num_problems):
+    assert len(compare({"case": result}, BASELINE, 1.25)) == num_problems
+
+
+def test_compare_reports_cases_missing_from_baseline():
+    problems = compare({"other": {"seconds": 1.0, "count": 0, "digest": ""}}, BASELINE, 1.25)
+    assert problems == ["other: missing from the baseline"]
+
+
+def test_run_case():
+    result = run_case(lambda: [[3], [4, 2]], repeat=2)
+    assert result["count"] == 2
+    assert result["digest"] == digest([[3], [4, 2]])
+    assert result["seconds"] >= 0 and result["peak_bytes"] >= 0
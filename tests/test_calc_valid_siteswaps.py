@@ -0,0 +1,99 @@
+from itertools import product
+
+import pytest
+
+from siteswaps.calc_valid_siteswaps import (
+    count_siteswap_sequences,
+    count_reversal_fixed_sequences,
+    count_siteswaps,
+    count_valid_siteswaps,
+)
+from siteswaps.siteswaps_generator import SymmetryGroup, generate_siteswaps
+from siteswaps.tools import is_valid, time_reversal
+
+
+@pytest.mark.parametrize("period", [1, 2, 3, 4])
+def test_count_valid_siteswaps_matches_brute_force(period):
+    assert count_valid_siteswaps(period) == sum(
+        1 for pattern in product(range(10), repeat=period) if is_valid(pattern)
+    )
+
+
+@pytest.mark.parametrize(
+    "period, num_balls, expected",
+    [
+        pytest.param(3, 2, 3**3 - 2**3),
+        pytest.param(4, 3, 4**4 - 3**4),
+        pytest.param(5, 1, 2**5 - 1),
+    ],
+)
+def test_count_siteswap_sequences_unbounded_throws(period, num_balls, expected):
+    # With throws up to period * num_balls, there are (b + 1)^n - b^n sequences
+    assert (
+        count_siteswap_sequences(period, num_balls, 0, period * num_balls) == expected
+    )
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        pytest.param((6, 7, [8, None, 10, None, 9, None])),
+        pytest.param((6, 7, [None] * 6)),
+        pytest.param((5, 5, [None] * 5, 2, 9, [1, 3], [9])),
+        pytest.param((4, 5, [None, 6, None, None], 2, 10, [3], [7])),
+        pytest.param((6, 4, [None] * 6, 0, 8, [1], [0, 8])),
+    ],
+)
+def test_count_siteswaps_matches_generate_siteswaps(arguments):
+    assert count_siteswaps(*arguments) == len(generate_siteswaps(*arguments))
+
+
+@pytest.mark.parametrize(
+    "period, shift, num_balls",
+    [
+        pytest.param(4, 0, 3),
+        pytest.param(4, 1, 3),
+        pytest.param(5, 2, 2),
+        pytest.param(6, 3, 2),
+    ],
+)
+def test_count_reversal_fixed_sequences_matches_brute_force(period, shift, num_balls):
+    throws = list(range(8))
+    assert count_reversal_fixed_sequences(period, shift, throws, num_balls) == sum(
+        1
+        for pattern in product(throws, repeat=period)
+        if is_valid(pattern, num_balls)
+        and list(pattern) == time_reversal(list(pattern[-shift:] + pattern[:-shift]))
+    )
+
+
+@pytest.mark.parametrize(
+    "arguments, symmetry",
+    [
+        pytest.param((6, 7, [None] * 6), SymmetryGroup(reversal=True)),
+        pytest.param((6, 5, [None] * 6, 2, 9), SymmetryGroup(2, False)),
+        pytest.param((6, 5, [None] * 6, 2, 9, [1, 3], [9]), SymmetryGroup(2, False, True)),
+        pytest.param((5, 4, [None] * 5, 0, 8, [1], [0, 8]), SymmetryGroup(3, False, True)),
+        pytest.param((6, 4, [None] * 6, 0, 8, [1]), SymmetryGroup(4, False, True)),
+    ],
+)
+def test_count_siteswaps_symmetry_matches_generate_siteswaps(arguments, symmetry):
+    assert count_siteswaps(*arguments, symmetry=symmetry) == len(
+        generate_siteswaps(*arguments, symmetry=symmetry)
+    )
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        pytest.param((6, 7, [None, None, 4, None, 6, None])),
+        pytest.param((8, 5, [8] + [None] * 7, 2, 10)),
+        pytest.param((6, 5, [7, None, None, 7, None, None], 2, 9)),
+        pytest.param((6, 4, [2, None, None, 2, None, None], 2, 9, [3], [2])),
+        pytest.param((6, 5, [None, 4, None, None, 4, None], 2, 9, [3], [4, 7])),
+        pytest.param((4, 3, [4, None, 4, None], 0, 6, [], [4, 0])),
+    ],
+)
+def test_count_siteswaps_partial_pattern_matching_rotations(arguments):
+    # Completions of these partial patterns can share a rotation class
+    assert count_siteswaps(*arguments) == len(generate_siteswaps(*arguments))
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+# Generous enough for slow CI machines, far below any import-time computation
+MAX_IMPORT_SECONDS = 1.0
+HEAVY_MODULES = {"colorama", "flask", "numpy"}
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "siteswaps.calc_valid_siteswaps",
+        "siteswaps.pattern_analysis",
+        "siteswaps.pattern_file",
+        "siteswaps.pattern_output",
+        "siteswaps.resumable_search",
+        "siteswaps.siteswap_catalog",
+        "siteswaps.siteswap_ranking",
+        "siteswaps.siteswap_sampler",
+        "siteswaps.siteswaps_generator",
+        "siteswaps.state_graph",
+        "siteswaps.tools",
+        "siteswaps.transition_matrix",
+    ],
+)
+def test_import_is_fast_and_silent(module):
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(time.perf_counter() - start)\n"
+        f"print(sorted({HEAVY_MODULES!r} & set(sys.modules)))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    elapsed, heavy_modules = result.stdout.splitlines()
+    assert float(elapsed) < MAX_IMPORT_SECONDS
+    assert heavy_modules == "[]"
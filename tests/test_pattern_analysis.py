@@ -0,0 +1,124 @@
+import pytest
+
+from siteswaps.pattern_analysis import PatternAnalysis, analyze_pattern, analyze_patterns
+from siteswaps.siteswaps_generator import generate_siteswaps
+from siteswaps.tools import (
+    calculate_num_balls,
+    calculate_pattern_orbit,
+    decompose_siteswap,
+    find_all_state_bits,
+    find_excited_entry,
+    is_excited_pattern,
+    is_prime_siteswap,
+    pattern_state_bits,
+    shift_state_bits,
+)
+
+
+def format_decomposition(decomposition):
+    return [
+        f"({' '.join(map(str, pattern))})^{count}"
+        if len(pattern) > 1
+        else f"({pattern[0]})^{count}" if count > 1 else f"({pattern[0]})"
+        for pattern, count in decomposition
+    ]
+
+
+@pytest.mark.parametrize(
+    "period_length, num_of_objects, max_throw",
+    [
+        pytest.param(4, 3, 7),
+        pytest.param(5, 4, 8),
+        pytest.param(6, 3, 6),
+    ],
+)
+def test_analyze_pattern_matches_tools(period_length, num_of_objects, max_throw):
+    for pattern in generate_siteswaps(
+        period_length, num_of_objects, [None] * period_length, 0, max_throw, None
+    ):
+        analysis = analyze_pattern(pattern)
+        assert analysis.num_balls == calculate_num_balls(pattern)
+        assert analysis.excited == is_excited_pattern(pattern)
+        assert analysis.orbits == tuple(calculate_pattern_orbit(pattern))
+        assert analysis.prime == (len(find_all_state_bits(pattern)) == period_length)
+        if not analysis.excited:
+            assert analysis.entry == ()
+            assert analysis.prime == is_prime_siteswap(pattern)
+        assert format_decomposition(analysis.decomposition) == decompose_siteswap(
+            pattern, list(analysis.entry)
+        )
+
+
+@pytest.mark.parametrize(
+    "period_length, num_of_objects, max_throw",
+    [
+        pytest.param(5, 3, 9),
+        pytest.param(4, 5, 10),
+    ],
+)
+def test_analyze_pattern_entry_matches_find_excited_entry(
+    period_length, num_of_objects, max_throw
+):
+    for canonical_pattern in generate_siteswaps(
+        period_length, num_of_objects, [None] * period_length, 0, max_throw, None
+    ):
+        for shift in range(period_length):
+            pattern = canonical_pattern[shift:] + canonical_pattern[:shift]
+            entry = find_excited_entry(pattern)
+            assert analyze_pattern(pattern).entry == tuple(entry)
+            state = (1 << num_of_objects) - 1
+            for throw in entry:
+                state = shift_state_bits(state, throw)
+            assert state == pattern_state_bits(pattern)
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        pytest.param(
+            [5, 3, 1],
+            PatternAnalysis(
+                (5, 3, 1), 3, False, (), True, (((5, 3, 1), 1),), ((5, 0, 1), (0, 3, 0))
+            ),
+        ),
+        pytest.param(
+            [8, 9, 5, 9, 5, 9, 5, 6],
+            PatternAnalysis(
+                (8, 9, 5, 9, 5, 9, 5, 6),
+                7,
+                False,
+                (),
+                False,
+                (((9, 5), 3), ((6, 8), 1)),
+                ((8, 0, 0, 0, 0, 0, 0, 0), (0, 9, 5, 9, 5, 9, 5, 6)),
+            ),
+        ),
+        pytest.param(
+            [9, 4, 5, 8, 4],
+            PatternAnalysis(
+                (9, 4, 5, 8, 4),
+                6,
+                True,
+                (7,),
+                False,
+                (((9, 4, 5), 1), ((8, 4), 1)),
+                ((9, 4, 0, 8, 4), (0, 0, 5, 0, 0)),
+            ),
+        ),
+    ],
+)
+def test_analyze_pattern(pattern, expected):
+    assert analyze_pattern(pattern) == expected
+
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, 1000), (2, 7), (None, 50)])
+def test_analyze_patterns_streams_in_order(workers, chunk_size):
+    patterns = generate_siteswaps(5, 5, [None] * 5, 2, 10)
+    analyses = list(analyze_patterns(iter(patterns), workers, chunk_size))
+    assert analyses == [analyze_pattern(pattern) for pattern in patterns]
+
+
+@pytest.mark.parametrize("workers, chunk_size", [(0, 10), (2, 0)])
+def test_analyze_patterns_rejects_invalid_arguments(workers, chunk_size):
+    with pytest.raises(ValueError):
+        analyze_patterns([[5, 3, 1]], workers, chunk_size)
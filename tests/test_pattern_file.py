@@ -0,0 +1,46 @@
+import pytest
+
+from siteswaps.pattern_file import PatternFile, PatternFileHeader, PatternWriter, write_patterns
+from siteswaps.siteswaps_generator import generate_siteswaps, iter_siteswaps
+
+
+def test_pattern_file_round_trip(tmp_path):
+    path = tmp_path / "patterns.sswp"
+    count = write_patterns(path, iter_siteswaps(5, 5, [None] * 5), 5, 5, 2, 14)
+    expected = generate_siteswaps(5, 5, [None] * 5)
+    with PatternFile(path) as pattern_file:
+        assert pattern_file.header == PatternFileHeader(5, 5, 2, 14, count)
+        assert len(pattern_file) == len(expected) == count
+        assert list(pattern_file) == expected
+        assert pattern_file[-1] == expected[-1]
+        assert pattern_file[2:5] == expected[2:5]
+
+
+def test_pattern_file_as_array(tmp_path):
+    np = pytest.importorskip("numpy")
+    path = tmp_path / "patterns.sswp"
+    write_patterns(path, [[5, 3, 1], [4, 4, 1]], 3, 3)
+    with PatternFile(path) as pattern_file:
+        array = pattern_file.as_array()
+        assert array.dtype == np.uint8
+        assert array.tolist() == [[5, 3, 1], [4, 4, 1]]
+        del array
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        pytest.param([3, 3]),
+        pytest.param([3, 3, 3, 3]),
+        pytest.param([5, 3, 1]),
+        pytest.param([6, 3, 0]),
+        pytest.param([256, 1, 2]),
+    ],
+)
+def test_pattern_writer_rejects_patterns_outside_header(tmp_path, pattern):
+    with PatternWriter(tmp_path / "patterns.sswp", 3, 3, 2, 5) as writer:
+        with pytest.raises(ValueError):
+            writer.write_many([[3, 3, 3], pattern])
+        assert writer.count == 1
+    with PatternFile(tmp_path / "patterns.sswp") as pattern_file:
+        assert list(pattern_file) == [[3, 3, 3]]
@@ -0,0 +1,70 @@
+import io
+
+import pytest
+
+from siteswaps.pattern_file import PatternFile
+from siteswaps.pattern_output import format_patterns, write_pattern_output, write_text_patterns
+from siteswaps.siteswaps_generator import generate_siteswaps, iter_siteswaps
+
+
+@pytest.mark.parametrize(
+    "output_format, expected",
+    [
+        pytest.param("plain", "5 3 1\n4 4 1\n"),
+        pytest.param("csv", "5,3,1\n4,4,1\n"),
+        pytest.param("jsonl", "[5, 3, 1]\n[4, 4, 1]\n"),
+        pytest.param(
+            "color", "\x1b[31m5 \x1b[32m3 \x1b[31m1 \x1b[0m\n\x1b[31m4 \x1b[32m4 \x1b[31m1 \x1b[0m\n"
+        ),
+    ],
+)
+def test_write_text_patterns(output_format, expected):
+    stream = io.StringIO()
+    assert write_text_patterns([[5, 3, 1], [4, 4, 1]], stream, output_format) == 2
+    assert stream.getvalue() == expected
+
+
+def test_format_patterns_mixed_periods():
+    assert format_patterns([[3], [5, 1], [4, 4, 1]], "plain") == "3\n5 1\n4 4 1\n"
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_write_text_patterns_chunks(chunk_size):
+    stream = io.StringIO()
+    count = write_text_patterns(iter_siteswaps(5, 5, [None] * 5), stream, chunk_size=chunk_size)
+    lines = stream.getvalue().splitlines()
+    assert count == len(lines)
+    assert [list(map(int, line.split())) for line in lines] == generate_siteswaps(5, 5, [None] * 5)
+
+
+def test_write_pattern_output_binary(tmp_path):
+    path = tmp_path / "patterns.sswp"
+    count = write_pattern_output(iter_siteswaps(5, 5, [None] * 5), "binary", path, 5, 5, 0, 14)
+    with PatternFile(path) as pattern_file:
+        assert len(pattern_file) == count
+        assert list(pattern_file) == generate_siteswaps(5, 5, [None] * 5)
+
+
+def test_write_pattern_output_text_file(tmp_path):
+    path = tmp_path / "patterns.csv"
+    assert write_pattern_output([[5, 3, 1]], "csv", path) == 1
+    assert path.read_text() == "5,3,1\n"
+
+
+@pytest.mark.parametrize(
+    "output_format, output",
+    [pytest.param("binary", None), pytest.param("xml", None), pytest.param("xml", "out.xml")],
+)
+def test_write_pattern_output_rejects(tmp_path, output_format, output):
+    with pytest.raises(ValueError):
+        write_pattern_output([[3]], output_format, output and tmp_path / output)
+
+
+class _FailingStream(io.StringIO):
+    def write(self, text):
+        raise BrokenPipeError
+
+
+def test_write_text_patterns_raises_stream_errors():
+    with pytest.raises(BrokenPipeError):
+        write_text_patterns(iter_siteswaps(5, 5, [None] * 5), _FailingStream(), chunk_size=1)
@@ -0,0 +1,95 @@
+import pytest
+
+from siteswaps import resumable_search
+from siteswaps.resumable_search import (
+    SearchCheckpoint,
+    iter_task_results,
+    merge_shard_outputs,
+    parse_shard,
+    read_text_patterns,
+    run_checkpointed_search,
+    shard_tasks,
+)
+from siteswaps.siteswaps_generator import generate_siteswaps
+
+QUERY = (6, 4, [None] * 6, 0, 9, None)
+
+
+@pytest.mark.parametrize("num_shards, workers", [(1, 1), (3, 1), (4, 2)])
+def test_shards_cover_the_search(num_shards, workers):
+    found = []
+    for index in range(num_shards):
+        tasks = shard_tasks(*QUERY, shard=(index, num_shards))
+        for patterns in iter_task_results(tasks, workers):
+            found.extend(patterns)
+    expected = generate_siteswaps(*QUERY)
+    assert len(found) == len(expected)
+    assert sorted(found) == sorted(expected)
+    if num_shards == 1:
+        assert found == expected
+
+
+@pytest.mark.parametrize(
+    "shard, expected",
+    [pytest.param("1/1", (0, 1)), pytest.param("3/4", (2, 4))],
+)
+def test_parse_shard(shard, expected):
+    assert parse_shard(shard) == expected
+
+
+@pytest.mark.parametrize("shard", ["0/4", "5/4", "2", "a/b"])
+def test_parse_shard_rejects(shard):
+    with pytest.raises(ValueError):
+        parse_shard(shard)
+
+
+def test_checkpointed_search_resumes(tmp_path, monkeypatch):
+    output, checkpoint = tmp_path / "patterns.txt", tmp_path / "patterns.checkpoint"
+    expected = tmp_path / "expected.txt"
+    num_expected = run_checkpointed_search(expected, tmp_path / "expected.checkpoint", *QUERY)
+
+    def crash_after(tasks, workers=1):
+        results = iter_task_results(tasks, workers)
+        for _ in range(10):
+            yield next(results)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(resumable_search, "iter_task_results", crash_after)
+    with pytest.raises(KeyboardInterrupt):
+        run_checkpointed_search(output, checkpoint, *QUERY)
+    state = SearchCheckpoint.load(checkpoint)
+    assert state.next_task == 10
+    assert list(read_text_patterns(output)) == generate_siteswaps(*QUERY)[: state.num_written]
+    monkeypatch.undo()
+
+    # Patterns written after the last checkpoint are dropped on resume
+    with open(output, "a") as output_file:
+        output_file.write("9 9 9 9 9 9\n")
+    assert run_checkpointed_search(output, checkpoint, *QUERY, resume=True) == num_expected
+    assert output.read_text() == expected.read_text()
+    assert SearchCheckpoint.load(checkpoint).next_task == state.num_tasks
+
+
+def test_checkpointed_search_rejects_other_checkpoints(tmp_path):
+    output, checkpoint = tmp_path / "patterns.txt", tmp_path / "patterns.checkpoint"
+    run_checkpointed_search(output, checkpoint, *QUERY)
+    with pytest.raises(ValueError):
+        run_checkpointed_search(output, checkpoint, *QUERY, shard=(1, 2), resume=True)
+    with pytest.raises(ValueError):
+        run_checkpointed_search(output, checkpoint, *QUERY, output_format="binary")
+
+
+def test_merge_shard_outputs(tmp_path):
+    paths = []
+    for index, output_format in enumerate(["plain", "jsonl", "csv"]):
+        paths.append(tmp_path / f"shard{index}.txt")
+        run_checkpointed_search(
+            paths[-1],
+            tmp_path / f"shard{index}.checkpoint",
+            *QUERY,
+            shard=(index, 3),
+            output_format=output_format,
+        )
+    merged = tmp_path / "merged.txt"
+    assert merge_shard_outputs(paths + paths[:1], merged) == len(generate_siteswaps(*QUERY))
+    assert sorted(read_text_patterns(merged)) == sorted(generate_siteswaps(*QUERY))
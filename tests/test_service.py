@@ -0,0 +1,146 @@
+import json
+
+import pytest
+
+pytest.importorskip("flask")
+
+from siteswaps import service as service_module  # noqa: E402
+from siteswaps.service import GenerationService, LRUCache, create_app  # noqa: E402
+from siteswaps.siteswaps_generator import generate_siteswaps  # noqa: E402
+from siteswaps.tools import find_minimal_transitions  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def service():
+    service = GenerationService(workers=2, cache_size=4)
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def client(service):
+    return create_app(service).test_client()
+
+
+def read_patterns(response):
+    messages = [json.loads(line) for line in response.data.decode().splitlines()]
+    assert messages[-1]["done"]
+    return [pattern for message in messages for pattern in message.get("patterns", [])]
+
+
+def test_siteswaps_streams_generate_siteswaps(client, service):
+    query = {
+        "period_length": 6,
+        "num_of_objects": 7,
+        "partial_pattern": [8, None, 10, None, 9, None],
+        "exclude_throws": [3, 1],
+    }
+    expected = generate_siteswaps(6, 7, [8, None, 10, None, 9, None])
+    assert read_patterns(client.post("/siteswaps", json=query)) == expected
+    # Served from the cache the second time
+    assert read_patterns(client.post("/siteswaps", json=query)) == expected
+
+
+def test_identical_searches_are_coalesced(service, monkeypatch):
+    jobs = []
+
+    class CountingSearchJob(service_module.SearchJob):
+        def __init__(self, *args):
+            jobs.append(self)
+            super().__init__(*args)
+
+    monkeypatch.setattr(service_module, "SearchJob", CountingSearchJob)
+    query = {"period_length": 7, "num_of_objects": 6, "max_throw": 10}
+    first = service.stream_siteswaps(query)
+    second = service.stream_siteswaps(dict(query, exclude_throws=[3, 1, 3]))
+    assert list(first)[-1] == list(second)[-1]
+    assert len(jobs) == 1
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        pytest.param({"period_length": 0, "num_of_objects": 3}),
+        pytest.param({"period_length": 5}),
+        pytest.param({"period_length": "five", "num_of_objects": 3}),
+        pytest.param({"period_length": 3, "num_of_objects": 3, "exclude_throws": 1}),
+        pytest.param([5, 3]),
+    ],
+)
+def test_invalid_query_is_rejected(client, query):
+    response = client.post("/siteswaps", json=query)
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        pytest.param({"patternA": [3]}),
+        pytest.param({"patternA": [], "patternB": [3]}),
+        pytest.param({"patternA": [5, 1, 3], "patternB": [3]}),
+        pytest.param({"patternA": [4], "patternB": [3]}),
+        pytest.param({"patternA": [3], "patternB": [5, 1], "max_throw": [5]}),
+    ],
+)
+def test_invalid_transition_query_is_rejected(client, query):
+    response = client.post("/transition", json=query)
+    assert response.status_code == 400
+
+
+def test_internal_errors_are_not_client_errors(service, monkeypatch):
+    def broken_query(query):
+        raise KeyError("internal")
+
+    monkeypatch.setattr(service_module, "normalize_transition_query", broken_query)
+    client = create_app(service).test_client()
+    response = client.post("/transition", json={"patternA": [3], "patternB": [5, 1]})
+    assert response.status_code == 500
+
+
+def test_identical_transitions_are_coalesced(service, monkeypatch):
+    jobs = []
+
+    class CountingSearchJob(service_module.SearchJob):
+        def __init__(self, *args):
+            jobs.append(self)
+            super().__init__(*args)
+
+    monkeypatch.setattr(service_module, "SearchJob", CountingSearchJob)
+    query = {"patternA": [4, 4, 1], "patternB": [5, 3, 1], "max_throw": 7}
+    assert service.find_transitions(query) == service.find_transitions(query)
+    assert len(jobs) == 1
+
+
+def test_transition(client):
+    response = client.post("/transition", json={"patternA": [3], "patternB": [5, 1]})
+    assert response.get_json() == {
+        "transitions": find_minimal_transitions([3], [5, 1]),
+        "length": 1,
+    }
+
+
+def test_tasks_are_built_outside_the_lock(service, monkeypatch):
+    split = service_module.split_siteswap_search
+
+    def checked_split(*args, **kwargs):
+        assert not service._lock.locked()
+        return split(*args, **kwargs)
+
+    monkeypatch.setattr(service_module, "split_siteswap_search", checked_split)
+    query = {"period_length": 5, "num_of_objects": 5, "max_throw": 9}
+    messages = list(service.stream_siteswaps(query))
+    assert messages[-1]["done"]
+
+
+def test_lru_cache_bounds_stored_patterns():
+    cache = LRUCache(maxsize=3, max_items=5)
+    cache.put("a", [[3]] * 2)
+    cache.put("b", [[3]] * 2)
+    cache.get("a")
+    cache.put("c", [[3]] * 2)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    cache.put("d", [[3]] * 6)
+    assert cache.get("d") is None
+    assert len(cache) == 2 and cache.num_items == 4
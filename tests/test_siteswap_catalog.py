@@ -0,0 +1,34 @@
+import pytest
+
+from siteswaps.siteswap_catalog import SiteswapCatalog
+from siteswaps.siteswaps_generator import generate_siteswaps
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    with SiteswapCatalog(tmp_path / "catalog.sqlite") as catalog:
+        catalog.add_family(6, 7, 0, 12)
+        yield catalog
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        pytest.param((6, 7, [None] * 6, 2, 12)),
+        pytest.param((6, 7, [None] * 6, 2, 10, [1, 3], [9])),
+        pytest.param((6, 7, [8, None, 10, None, 9, None], 2, 12)),
+        pytest.param((6, 7, [None, 7, None, None, 7, None], 0, 11, [2], [10])),
+    ],
+)
+def test_catalog_matches_search(catalog, arguments):
+    assert catalog.iter_query(*arguments) is not None
+    assert generate_siteswaps(*arguments, catalog=catalog) == generate_siteswaps(
+        *arguments
+    )
+
+
+def test_catalog_falls_back_to_search(catalog):
+    assert catalog.iter_query(6, 7, [None] * 6, 2, 14) is None
+    assert generate_siteswaps(6, 7, [None] * 6, catalog=catalog) == (
+        generate_siteswaps(6, 7, [None] * 6)
+    )
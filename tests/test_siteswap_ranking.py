@@ -0,0 +1,57 @@
+import pytest
+
+from siteswaps.siteswap_ranking import (
+    MAX_THROW_SCORE,
+    ORBIT_SCORE,
+    PatternScore,
+    high_throw_score,
+    iter_ranked_siteswaps,
+    pass_score,
+    top_siteswaps,
+)
+from siteswaps.siteswaps_generator import generate_siteswaps
+
+SCORES = [
+    pytest.param(MAX_THROW_SCORE, id="max throw"),
+    pytest.param(high_throw_score(6), id="high throws"),
+    pytest.param(pass_score(2), id="passes"),
+    pytest.param(ORBIT_SCORE, id="orbits"),
+    pytest.param(lambda pattern: pattern[0] - pattern[-1], id="plain function"),
+]
+
+
+def _score_of(score):
+    return score.score if isinstance(score, PatternScore) else score
+
+
+@pytest.mark.parametrize("score", SCORES)
+@pytest.mark.parametrize(
+    "args, kwargs",
+    [
+        pytest.param((6, 4, [None] * 6, 0, 8, None), {}),
+        pytest.param((5, 5, [None] * 5, 2, 10, [1, 3]), {"include_throws": [7]}),
+        pytest.param((6, 3, [None, 5, None, None, None, None], 0, 7, [6]), {}),
+        pytest.param((6, 4, [None] * 6, 2, 9, None), {"prime_only": True}),
+    ],
+)
+def test_ranked_siteswaps_match_generate_siteswaps(args, kwargs, score):
+    expected = generate_siteswaps(*args, **kwargs)
+    ranked = list(iter_ranked_siteswaps(*args, score=score, **kwargs))
+    scores = [_score_of(score)(pattern) for pattern in ranked]
+    assert sorted(ranked) == sorted(expected)
+    assert scores == sorted(scores)
+    for k in [1, 7, len(expected) + 3]:
+        top = top_siteswaps(k, *args, score=score, **kwargs)
+        assert [_score_of(score)(pattern) for pattern in top] == scores[:k]
+        assert generate_siteswaps(*args, top_k=k, score=score, **kwargs) == top
+
+
+def test_top_siteswaps_default_score():
+    top = top_siteswaps(3, 5, 7, [None] * 5)
+    assert generate_siteswaps(5, 7, [None] * 5, top_k=3) == top
+    assert [max(pattern) for pattern in top] == [8, 8, 8]
+
+
+def test_top_siteswaps_rejects_bad_k():
+    with pytest.raises(ValueError):
+        top_siteswaps(0, 5, 5, [None] * 5)
@@ -0,0 +1,61 @@
+import random
+from collections import Counter
+
+import pytest
+
+from siteswaps.calc_valid_siteswaps import count_sequences_by_balls, count_siteswap_sequences
+from siteswaps.siteswap_sampler import SiteswapSampler
+from siteswaps.siteswaps_generator import generate_siteswaps
+
+SAMPLES_PER_PATTERN = 100
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        pytest.param((4, 3, [None] * 4, 0, 6, None), id="periodic classes"),
+        pytest.param((5, 4, [None] * 5, 2, 9, [1, 3]), id="excluded throws"),
+        pytest.param((4, 3, [None, 4, None, 4], 0, 7, None), id="self-matching partial"),
+        pytest.param((6, 3, [None, 5, None, None, None, None], 0, 7, [6]), id="partial"),
+    ],
+)
+def test_sampler_is_uniform(args, tmp_path):
+    sampler = SiteswapSampler(*args, cache_dir=tmp_path)
+    expected = [tuple(pattern) for pattern in generate_siteswaps(*args)]
+    rng = random.Random(0)
+    num_samples = SAMPLES_PER_PATTERN * len(expected)
+    counts = Counter(tuple(sampler.sample(rng)) for _ in range(num_samples))
+    assert set(counts) == set(expected)
+    chi_square = sum(
+        (counts[pattern] - SAMPLES_PER_PATTERN) ** 2 / SAMPLES_PER_PATTERN for pattern in expected
+    )
+    # Far above the expected value len(expected) - 1 for a uniform sampler
+    assert chi_square < 2 * len(expected) + 20
+
+
+def test_sampler_counts_sequences(tmp_path):
+    sampler = SiteswapSampler(7, 4, None, 0, 9, [3], cache_dir=tmp_path)
+    assert sampler.num_sequences == count_siteswap_sequences(7, 4, 0, 9, [3])
+    sampler = SiteswapSampler(5, 4, [None, 7, None, None, 2], 1, 8, None, cache_dir=tmp_path)
+    throws = list(range(1, 9))
+    assert sampler.num_sequences == count_sequences_by_balls(
+        [throws, [7], throws, throws, [2]], 4
+    )[4]
+
+
+def test_sampler_load_uses_cache(tmp_path):
+    args = (6, 5, [None] * 6, 2, 10, [1, 3])
+    sampler = SiteswapSampler.load(*args, cache_dir=tmp_path)
+    assert SiteswapSampler.cache_path(*args, cache_dir=tmp_path).exists()
+    cached = SiteswapSampler.load(*args, cache_dir=tmp_path)
+    assert cached.start_weights == sampler.start_weights
+    assert cached.sample(random.Random(3)) == sampler.sample(random.Random(3))
+
+
+@pytest.mark.parametrize(
+    "args",
+    [pytest.param((4, 3, [None] * 4, 3, 3, None)), pytest.param((4, 5, [None] * 4, 0, 4, None))],
+)
+def test_sampler_without_patterns(args, tmp_path):
+    with pytest.raises(ValueError):
+        SiteswapSampler(*args, cache_dir=tmp_path).sample()
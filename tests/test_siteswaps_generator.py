@@ -0,0 +1,403 @@
+from itertools import islice, product
+
+import pytest
+
+from siteswaps.siteswaps_generator import (
+    PassingConstraints,
+    SymmetryGroup,
+    deduplicate_patterns,
+    generate_siteswaps,
+    generate_siteswaps_with_stats,
+    iter_siteswaps,
+)
+from siteswaps.tools import find_all_state_bits, is_valid, time_reversal
+
+
+def brute_force_siteswaps(period_length, num_of_objects, min_throw, max_throw):
+    patterns = [
+        list(pattern)
+        for pattern in product(range(min_throw, max_throw + 1), repeat=period_length)
+        if is_valid(pattern, num_of_objects) and len(set(pattern)) > 1
+    ]
+    return deduplicate_patterns(patterns)
+
+
+@pytest.mark.parametrize(
+    "period_length, num_of_objects, min_throw, max_throw",
+    [
+        pytest.param(3, 3, 0, 6),
+        pytest.param(4, 4, 1, 8),
+        pytest.param(5, 3, 0, 7),
+    ],
+)
+def test_generate_siteswaps_matches_brute_force(
+    period_length, num_of_objects, min_throw, max_throw
+):
+    result = generate_siteswaps(
+        period_length,
+        num_of_objects,
+        [None] * period_length,
+        min_throw,
+        max_throw,
+        exclude_throws=None,
+    )
+    assert result == brute_force_siteswaps(
+        period_length, num_of_objects, min_throw, max_throw
+    )
+
+
+@pytest.mark.parametrize(
+    "partial_pattern, expected",
+    [
+        pytest.param([8, None, 10, None, 9, None], 7),
+        pytest.param([8, 8, 8, 8, 8, 8], 0),
+        pytest.param([9, 9, None, 9, 9, None], 0),
+        pytest.param([None, 6, None, 6, None, 6], 9),
+    ],
+)
+def test_generate_siteswaps_partial_pattern(partial_pattern, expected):
+    assert len(generate_siteswaps(6, 7, partial_pattern)) == expected
+
+
+def test_iter_siteswaps_streams_generate_siteswaps_order():
+    partial_pattern = [None] * 6
+    expected = generate_siteswaps(6, 4, partial_pattern, 0, 8, [1])
+    assert list(islice(iter_siteswaps(6, 4, partial_pattern, 0, 8, [1]), 10)) == (
+        expected[:10]
+    )
+
+
+def test_iter_siteswaps_validates_eagerly():
+    with pytest.raises(ValueError):
+        iter_siteswaps(6, 7, [None] * 5)
+
+
+@pytest.mark.parametrize(
+    "partial_pattern",
+    [
+        pytest.param([None] * 6),
+        pytest.param([8, None, 10, None, 9, None]),
+    ],
+)
+def test_generate_siteswaps_workers_keep_order(partial_pattern):
+    assert generate_siteswaps(6, 7, partial_pattern, workers=2) == (
+        generate_siteswaps(6, 7, partial_pattern)
+    )
+
+
+@pytest.mark.parametrize(
+    "args, kwargs",
+    [
+        pytest.param((6, 7, [None] * 6, 2, 12), {}),
+        pytest.param((5, 7, [None] * 5, 2, 10, [1, 3], [4]), {}),
+        pytest.param((6, 7, [8, None, 10, None, None, None]), {}),
+        pytest.param((4, 5, [6, None, 6, None]), {}),
+        pytest.param((6, 7, [None] * 6, 2, 12), {"prime_only": True, "ground_only": True}),
+        pytest.param((5, 7, [None, 9, None, None, None]), {"excited_only": True}),
+    ],
+)
+def test_generate_siteswaps_with_stats(args, kwargs):
+    patterns, stats = generate_siteswaps_with_stats(*args, **kwargs)
+    assert patterns == generate_siteswaps(*args, **kwargs)
+    assert stats.patterns == len(patterns)
+    assert stats.leaves == len(patterns) + sum(stats.rejections.values())
+    assert stats.throws_tried == (
+        stats.sum_prunes
+        + stats.collision_prunes
+        + stats.state_prunes
+        + stats.nodes
+        + stats.leaves
+        - 1
+    )
+    assert stats.as_dict()["patterns"] == len(patterns)
+
+
+def brute_force_passing_siteswaps(period_length, num_of_objects, max_throw, passing):
+    num_jugglers = passing.num_jugglers
+    patterns = []
+    for pattern in brute_force_siteswaps(period_length, num_of_objects, 2, max_throw):
+        rotations = [pattern[shift:] + pattern[:shift] for shift in range(period_length)]
+        passes = sum(throw % num_jugglers != 0 for throw in pattern)
+        if passing.min_passes is not None and passes < passing.min_passes:
+            continue
+        if passing.max_passes is not None and passes > passing.max_passes:
+            continue
+        if passing.num_selfs is not None and period_length - passes != passing.num_selfs:
+            continue
+        if passing.juggler_throws is not None and not any(
+            all(
+                throw in passing.juggler_throws[i % num_jugglers]
+                for i, throw in enumerate(rotation)
+            )
+            for rotation in rotations
+        ):
+            continue
+        patterns.append(pattern)
+    return sorted(patterns)
+
+
+@pytest.mark.parametrize(
+    "period_length, num_of_objects, max_throw, passing",
+    [
+        pytest.param(4, 7, 10, PassingConstraints(num_selfs=2)),
+        pytest.param(6, 6, 9, PassingConstraints(min_passes=2, max_passes=3)),
+        pytest.param(4, 7, 10, PassingConstraints(juggler_throws=[[7, 8, 9], [6, 7, 8]])),
+        pytest.param(6, 5, 8, PassingConstraints(num_jugglers=3, max_passes=2)),
+        pytest.param(
+            6,
+            7,
+            10,
+            PassingConstraints(juggler_throws=[[7, 9, 10], [5, 6, 7, 8]], min_passes=4),
+        ),
+    ],
+)
+def test_generate_siteswaps_passing_constraints(
+    period_length, num_of_objects, max_throw, passing
+):
+    patterns = generate_siteswaps(
+        period_length, num_of_objects, [None] * period_length, 2, max_throw, [], passing=passing
+    )
+    assert len(patterns) == len({tuple(pattern) for pattern in patterns})
+    assert sorted(patterns) == brute_force_passing_siteswaps(
+        period_length, num_of_objects, max_throw, passing
+    )
+
+
+@pytest.mark.parametrize(
+    "partial_pattern, passing",
+    [
+        pytest.param([None] * 5, PassingConstraints()),
+        pytest.param([None] * 4, PassingConstraints(juggler_throws=[[7, 8]])),
+        pytest.param([6, None, None, None], PassingConstraints(juggler_throws=[[7, 8], None])),
+        pytest.param([None] * 4, PassingConstraints(min_passes=5)),
+    ],
+)
+def test_generate_siteswaps_rejects_invalid_passing_constraints(partial_pattern, passing):
+    with pytest.raises(ValueError):
+        generate_siteswaps(len(partial_pattern), 7, partial_pattern, passing=passing)
+
+
+@pytest.mark.parametrize(
+    "partial_pattern, slot_domains, include_throws",
+    [
+        pytest.param([None] * 4, [None, None, None, {7, 8, 9}], None),
+        pytest.param([None] * 5, [range(8, 11), None, {4, 5}, None, None], None),
+        pytest.param([None] * 5, [None, {2, 6, 10}, None, None, None], [2, 4, 10]),
+        pytest.param([9, None, None, None, None], [None, None, range(5, 8), None, None], [4]),
+        pytest.param([None] * 4, [{8}, {6}, {8}, {6}], None),
+    ],
+)
+def test_generate_siteswaps_slot_domains(partial_pattern, slot_domains, include_throws):
+    period_length = len(partial_pattern)
+    open_indices = [i for i, throw in enumerate(partial_pattern) if throw is None]
+    expected = []
+    for pattern in brute_force_siteswaps(period_length, 7, 2, 10):
+        rotations = [pattern[shift:] + pattern[:shift] for shift in range(period_length)]
+        if any(
+            all(
+                partial is None or rotation[i] == partial
+                for i, partial in enumerate(partial_pattern)
+            )
+            and all(
+                domain is None or rotation[i] in domain
+                for i, domain in enumerate(slot_domains)
+            )
+            and set(include_throws or []) <= {rotation[i] for i in open_indices}
+            for rotation in rotations
+        ):
+            expected.append(pattern)
+
+    patterns = generate_siteswaps(
+        period_length,
+        7,
+        partial_pattern,
+        2,
+        10,
+        [1, 3],
+        include_throws,
+        slot_domains=slot_domains,
+    )
+    expected = [pattern for pattern in expected if not {1, 3} & set(pattern)]
+    assert sorted(patterns) == sorted(expected)
+
+
+@pytest.mark.parametrize(
+    "args, expected",
+    [
+        pytest.param((5, 7, [None] * 5, 2, 12, [1, 3], [2, 4, 12]), None),
+        pytest.param((6, 7, [None] * 6, 2, 10, [1, 3], [2, 4, 6, 8, 10]), None),
+        pytest.param((4, 7, [None] * 4, 2, 10, [1, 3], [2, 4, 6, 8, 10]), []),
+    ],
+)
+def test_generate_siteswaps_include_throws_pruning(args, expected):
+    patterns, stats = generate_siteswaps_with_stats(*args)
+    assert stats.rejections["include_throws"] == 0
+    if expected is None:
+        expected = [
+            pattern
+            for pattern in generate_siteswaps(*args[:6])
+            if set(args[6]) <= set(pattern)
+        ]
+    assert patterns == expected
+
+
+@pytest.mark.parametrize(
+    "partial_pattern, slot_domains",
+    [
+        pytest.param([None] * 4, [None] * 3),
+        pytest.param([8, None, None, None], [{9, 10}, None, None, None]),
+    ],
+)
+def test_generate_siteswaps_rejects_invalid_slot_domains(partial_pattern, slot_domains):
+    with pytest.raises(ValueError):
+        generate_siteswaps(4, 7, partial_pattern, slot_domains=slot_domains)
+
+
+@pytest.mark.parametrize(
+    "period_length, num_of_objects, partial_pattern, max_throw",
+    [
+        pytest.param(5, 3, [None] * 5, 7),
+        pytest.param(4, 4, [None, 2, None, None], 8),
+        pytest.param(6, 3, [None] * 6, 6),
+    ],
+)
+@pytest.mark.parametrize(
+    "prime_only, ground_only, excited_only",
+    [
+        pytest.param(True, False, False),
+        pytest.param(False, True, False),
+        pytest.param(False, False, True),
+        pytest.param(True, True, False),
+        pytest.param(True, False, True),
+    ],
+)
+def test_generate_siteswaps_state_filters(
+    period_length,
+    num_of_objects,
+    partial_pattern,
+    max_throw,
+    prime_only,
+    ground_only,
+    excited_only,
+):
+    ground_state = (1 << num_of_objects) - 1
+    expected = []
+    for pattern in generate_siteswaps(
+        period_length, num_of_objects, partial_pattern, 0, max_throw, None
+    ):
+        states = find_all_state_bits(pattern)
+        if prime_only and len(states) < period_length:
+            continue
+        if ground_only and ground_state not in states:
+            continue
+        if excited_only and ground_state in states:
+            continue
+        expected.append(pattern)
+
+    for workers in (1, 2):
+        patterns = generate_siteswaps(
+            period_length,
+            num_of_objects,
+            partial_pattern,
+            0,
+            max_throw,
+            None,
+            workers=workers,
+            prime_only=prime_only,
+            ground_only=ground_only,
+            excited_only=excited_only,
+        )
+        assert patterns == expected
+
+
+def test_generate_siteswaps_rejects_ground_and_excited():
+    with pytest.raises(ValueError):
+        generate_siteswaps(5, 7, [None] * 5, ground_only=True, excited_only=True)
+
+
+def brute_force_symmetry_classes(period_length, num_of_objects, max_throw, symmetry, ground_only):
+    step = 1 if symmetry.juggler_relabeling else symmetry.num_jugglers
+    classes = set()
+    for pattern in product(range(max_throw + 1), repeat=period_length):
+        pattern = list(pattern)
+        if not is_valid(pattern, num_of_objects) or len(set(pattern)) == 1:
+            continue
+        if ground_only and (1 << num_of_objects) - 1 not in find_all_state_bits(pattern):
+            continue
+        members = [pattern, time_reversal(pattern)] if symmetry.reversal else [pattern]
+        classes.add(
+            frozenset(
+                tuple(member[shift % period_length :] + member[: shift % period_length])
+                for member in members
+                for shift in range(0, period_length * step, step)
+            )
+        )
+    return classes
+
+
+@pytest.mark.parametrize(
+    "period_length, num_of_objects, max_throw, symmetry, ground_only",
+    [
+        pytest.param(5, 3, 7, SymmetryGroup(reversal=True), False),
+        pytest.param(6, 3, 6, SymmetryGroup(reversal=True), True),
+        pytest.param(6, 3, 6, SymmetryGroup(num_jugglers=2, juggler_relabeling=False), False),
+        pytest.param(
+            6, 3, 6, SymmetryGroup(num_jugglers=2, juggler_relabeling=False, reversal=True), True
+        ),
+        pytest.param(
+            6, 2, 5, SymmetryGroup(num_jugglers=4, juggler_relabeling=False, reversal=True), False
+        ),
+        pytest.param(5, 3, 7, SymmetryGroup(num_jugglers=2, juggler_relabeling=False), False),
+    ],
+)
+def test_generate_siteswaps_symmetry(
+    period_length, num_of_objects, max_throw, symmetry, ground_only
+):
+    patterns = generate_siteswaps(
+        period_length,
+        num_of_objects,
+        [None] * period_length,
+        0,
+        max_throw,
+        None,
+        ground_only=ground_only,
+        symmetry=symmetry,
+    )
+    classes = brute_force_symmetry_classes(
+        period_length, num_of_objects, max_throw, symmetry, ground_only
+    )
+    assert len(patterns) == len(classes)
+    assert {
+        next(members for members in classes if tuple(pattern) in members) for pattern in patterns
+    } == classes
+
+
+def test_generate_siteswaps_symmetry_top_k():
+    symmetry = SymmetryGroup(num_jugglers=2, juggler_relabeling=False, reversal=True)
+    patterns = generate_siteswaps(6, 4, [None] * 6, 0, 8, None, symmetry=symmetry)
+    top_patterns = generate_siteswaps(6, 4, [None] * 6, 0, 8, None, top_k=5, symmetry=symmetry)
+    assert sorted(max(pattern) for pattern in top_patterns) == sorted(
+        max(pattern) for pattern in patterns
+    )[:5]
+    assert all(pattern in patterns for pattern in top_patterns)
+
+
+@pytest.mark.parametrize(
+    "partial_pattern, symmetry, kwargs",
+    [
+        pytest.param([None] * 4, SymmetryGroup(num_jugglers=0, juggler_relabeling=False), {}),
+        pytest.param([6, None, None, None], SymmetryGroup(reversal=True), {}),
+        pytest.param(
+            [None] * 4, SymmetryGroup(reversal=True), dict(slot_domains=[{6}, None, None, None])
+        ),
+        pytest.param(
+            [None] * 4,
+            SymmetryGroup(num_jugglers=3, juggler_relabeling=False),
+            dict(passing=PassingConstraints(num_jugglers=2)),
+        ),
+        pytest.param([None] * 4, SymmetryGroup(reversal=True), dict(prime_only=True)),
+    ],
+)
+def test_generate_siteswaps_rejects_invalid_symmetry(partial_pattern, symmetry, kwargs):
+    with pytest.raises(ValueError):
+        generate_siteswaps(len(partial_pattern), 7, partial_pattern, symmetry=symmetry, **kwargs)
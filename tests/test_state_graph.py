@@ -0,0 +1,36 @@
+import pytest
+
+from siteswaps.siteswaps_generator import generate_siteswaps
+from siteswaps.state_graph import StateGraph
+
+
+@pytest.mark.parametrize(
+    "num_balls, max_throw, period",
+    [
+        pytest.param(3, 5, 3),
+        pytest.param(2, 6, 4),
+        pytest.param(4, 7, 5),
+    ],
+)
+def test_siteswaps_are_closed_walks(num_balls, max_throw, period):
+    graph = StateGraph(num_balls, max_throw)
+    expected = generate_siteswaps(
+        period, num_balls, [None] * period, 0, max_throw, None
+    ) + [[num_balls] * period]
+    assert sorted(graph.iter_siteswaps(period)) == sorted(expected)
+
+
+def test_prime_siteswaps_are_simple_cycles():
+    graph = StateGraph(2, 3)
+    assert sorted(graph.iter_prime_siteswaps()) == [[2], [3, 1], [3, 3, 0]]
+
+
+def test_load_uses_cache(tmp_path):
+    graph = StateGraph.load(3, 6, tmp_path)
+    assert StateGraph.cache_path(3, 6, tmp_path).exists()
+    cached = StateGraph.load(3, 6, tmp_path)
+    assert (cached.states, cached.targets, cached.throws) == (
+        graph.states,
+        graph.targets,
+        graph.throws,
+    )
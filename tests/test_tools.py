@@ -1,6 +1,22 @@
 import pytest
 
-from tools import calculate_num_balls, is_excited_pattern, is_valid
+from siteswaps.exceptions import ExcitedSiteswapError
+from siteswaps.tools import (
+    bits_to_state,
+    calculate_num_balls,
+    canonical_rotation,
+    find_all_states,
+    find_excited_entry,
+    find_minimal_transitions,
+    find_transition,
+    is_excited_pattern,
+    is_prime_siteswap,
+    is_valid,
+    shift_state,
+    shift_state_bits,
+    state_to_bits,
+    time_reversal,
+)
 
 
 @pytest.mark.parametrize(
@@ -37,3 +53,105 @@ def test_is_excited_pattern(pattern, is_excited):
 )
 def test_calculate_num_balls(pattern, num_of_balls):
     assert calculate_num_balls(pattern) == num_of_balls
+
+
+@pytest.mark.parametrize(
+    "pattern, rotation",
+    [
+        pytest.param([], []),
+        pytest.param([1, 5, 3], [5, 3, 1]),
+        pytest.param([2, 7, 7, 7, 7], [7, 7, 7, 7, 2]),
+        pytest.param([9, 5, 9, 6], [9, 6, 9, 5]),
+        pytest.param([4, 2, 4, 2], [4, 2, 4, 2]),
+    ],
+)
+def test_canonical_rotation(pattern, rotation):
+    assert canonical_rotation(pattern) == rotation
+
+
+@pytest.mark.parametrize(
+    "pattern, entry",
+    [
+        pytest.param([5, 3, 1], []),
+        pytest.param([6, 0, 0], [4]),
+        pytest.param([9, 9, 0, 0, 2], [7, 5]),
+    ],
+)
+def test_find_excited_entry(pattern, entry):
+    assert find_excited_entry(pattern) == entry
+
+
+@pytest.mark.parametrize(
+    "pattern, reversed_pattern",
+    [
+        pytest.param([5, 3, 1], [1, 5, 3]),
+        pytest.param([7, 7, 7, 7, 2], [7, 7, 7, 7, 2]),
+        pytest.param([7, 0, 1, 6, 6], [6, 6, 1, 7, 0]),
+    ],
+)
+def test_time_reversal(pattern, reversed_pattern):
+    assert time_reversal(pattern) == reversed_pattern
+    assert time_reversal(reversed_pattern) == pattern
+
+
+@pytest.mark.parametrize(
+    "state, throw, next_state",
+    [
+        pytest.param(0b111, 3, 0b111),
+        pytest.param(0b111, 5, 0b10011),
+        pytest.param(0b10110, 4, 0b1011),
+        pytest.param(0b1010, 0, 0b101),
+    ],
+)
+def test_shift_state_bits(state, throw, next_state):
+    assert shift_state_bits(state, throw) == next_state
+    assert shift_state(bits_to_state(state, 6), throw) == bits_to_state(next_state, 6)
+    assert state_to_bits(bits_to_state(next_state, 6)) == next_state
+
+
+@pytest.mark.parametrize("state, throw", [pytest.param(0b111, 2), pytest.param(0b1, 0)])
+def test_shift_state_bits_collision(state, throw):
+    with pytest.raises(ExcitedSiteswapError):
+        shift_state_bits(state, throw)
+
+
+@pytest.mark.parametrize(
+    "pattern, is_prime",
+    [
+        pytest.param([5, 3, 1], True),
+        pytest.param([5, 5, 2], True),
+        pytest.param([4, 2, 3], False),
+        pytest.param([5, 3, 1, 3, 3], False),
+    ],
+)
+def test_is_prime_siteswap(pattern, is_prime):
+    assert is_prime_siteswap(pattern) == is_prime
+
+
+@pytest.mark.parametrize(
+    "pattern, states",
+    [
+        pytest.param([3], {("x", "x", "x", "_")}),
+        pytest.param(
+            [6, 0], {("x", "_", "x", "_", "x", "_", "_"), ("_", "x", "_", "x", "_", "x", "_")}
+        ),
+    ],
+)
+def test_find_all_states(pattern, states):
+    assert find_all_states(pattern) == states
+
+
+@pytest.mark.parametrize(
+    "patternA, patternB, constraints, transitions",
+    [
+        pytest.param([5, 3, 1], [4, 4, 1], {}, [[]]),
+        pytest.param([3], [5, 1], {}, [[4]]),
+        pytest.param([3], [5, 1], {"exclude_throws": [4]}, [[5, 2]]),
+        pytest.param([3], [5, 1], {"min_throw": 5, "max_throw": 5}, []),
+    ],
+)
+def test_find_minimal_transitions(patternA, patternB, constraints, transitions):
+    assert find_minimal_transitions(patternA, patternB, **constraints) == transitions
+    assert find_transition(patternA, patternB, **constraints) == (
+        transitions[0] if transitions else None
+    )
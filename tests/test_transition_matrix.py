@@ -0,0 +1,81 @@
+from itertools import permutations
+
+import pytest
+
+from siteswaps import transition_matrix
+from siteswaps.siteswaps_generator import generate_siteswaps
+from siteswaps.tools import calculate_num_balls, canonical_rotation, find_transition
+from siteswaps.transition_matrix import TransitionMatrix, plan_setlist
+
+PATTERNS = generate_siteswaps(3, 4, [None] * 3, 0, 8, None) + [[4], [5], [5, 3, 1]]
+
+
+@pytest.mark.parametrize(
+    "constraints",
+    [
+        pytest.param({}),
+        pytest.param({"exclude_throws": [4]}),
+        pytest.param({"min_throw": 2, "max_throw": 9}),
+    ],
+)
+def test_transition_matrix_matches_find_transition(constraints):
+    matrix = TransitionMatrix(PATTERNS, **constraints)
+    assert matrix.patterns == sorted(canonical_rotation(pattern) for pattern in PATTERNS)
+    for pattern_a in PATTERNS:
+        for pattern_b in PATTERNS:
+            expected = None
+            if calculate_num_balls(pattern_a) == calculate_num_balls(pattern_b):
+                expected = find_transition(
+                    pattern_a,
+                    pattern_b,
+                    constraints.get("min_throw", 0),
+                    matrix.max_throw,
+                    constraints.get("exclude_throws"),
+                )
+            assert matrix.transition(pattern_a, pattern_b) == expected
+
+
+def test_transition_matrix_workers():
+    assert TransitionMatrix(PATTERNS, workers=2).transitions == (
+        TransitionMatrix(PATTERNS).transitions
+    )
+
+
+def test_transition_matrix_load_uses_cache(tmp_path):
+    matrix = TransitionMatrix.load(PATTERNS, cache_dir=tmp_path)
+    assert TransitionMatrix.cache_path(PATTERNS, cache_dir=tmp_path).exists()
+    cached = TransitionMatrix.load(reversed(PATTERNS), cache_dir=tmp_path)
+    assert (cached.patterns, cached.transitions) == (matrix.patterns, matrix.transitions)
+    assert cached.lengths == matrix.lengths
+
+
+@pytest.mark.parametrize("exact_plan_limit", [10, 0])
+def test_plan_setlist(monkeypatch, exact_plan_limit):
+    monkeypatch.setattr(transition_matrix, "EXACT_PLAN_LIMIT", exact_plan_limit)
+    setlist = generate_siteswaps(5, 7, [None] * 5, 2, 12)[::40]
+    matrix = TransitionMatrix(setlist)
+    plan = plan_setlist(matrix, setlist)
+
+    assert sorted(plan.patterns) == sorted(setlist)
+    assert plan.transitions == [
+        matrix.transition(pattern_a, pattern_b)
+        for pattern_a, pattern_b in zip(plan.patterns, plan.patterns[1:])
+    ]
+    assert plan.total_length == sum(map(len, plan.transitions))
+    best = min(
+        sum(len(matrix.transition(a, b)) for a, b in zip(order, order[1:]))
+        for order in permutations(setlist)
+    )
+    if exact_plan_limit:
+        assert plan.total_length == best
+    else:
+        assert plan.total_length <= best + 1
+
+
+def test_plan_setlist_impossible_transitions():
+    matrix = TransitionMatrix(PATTERNS)
+    plan = plan_setlist(matrix, [[4], [5], [4]])
+    assert len(plan.patterns) == 2
+    assert plan.total_length is None
+    with pytest.raises(KeyError):
+        plan_setlist(matrix, [[6]])